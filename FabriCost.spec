@@ -12,6 +12,11 @@ block_cipher = None
 # Project root directory (where this .spec file lives)
 PROJECT_DIR = os.path.abspath(SPECPATH)
 
+# Pre-scale the logo so the app does not decode/resize the full-size PNG at startup.
+sys.path.insert(0, PROJECT_DIR)
+from create_icon import SCALED_LOGO_SIZES, create_scaled_logos
+create_scaled_logos(PROJECT_DIR)
+
 a = Analysis(
     [os.path.join(PROJECT_DIR, 'main.py')],
     pathex=[PROJECT_DIR],
@@ -20,6 +25,8 @@ a = Analysis(
         # Bundle the logo PNG and icon ICO so get_asset_path() can find them
         (os.path.join(PROJECT_DIR, 'FabriCost_Logo.png'), '.'),
         (os.path.join(PROJECT_DIR, 'FabriCost_Icon.ico'), '.'),
+    ] + [
+        (os.path.join(PROJECT_DIR, f'FabriCost_Logo_{size}.png'), '.') for size in SCALED_LOGO_SIZES
     ],
     hiddenimports=[
         # PIL / Pillow
@@ -71,6 +78,11 @@ a = Analysis(
         'win32api',
         'win32con',
         'pywintypes',
+        # Headless sub-commands (`FabriCost.exe quote|serve|simulate|export ...`)
+        'quote_cli',
+        'quote_server',
+        'gcode_sim',
+        'batch_export',
         # Standard library
         'sqlite3',
         'json',
@@ -86,7 +98,6 @@ a = Analysis(
     runtime_hooks=[],
     excludes=[
         'matplotlib',
-        'numpy',
         'scipy',
         'pandas',
         'pytest',
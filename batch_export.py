@@ -0,0 +1,241 @@
+"""
+Batch PDF export of saved quotes: `python main.py export OUT_DIR [--ids 12 15 ...]`.
+
+Quotes come from the quote history database and are re-priced with their own
+rules snapshot, then rendered by `pdf_export` across a process pool, one PDF
+per quote. A manifest in the output directory remembers a fingerprint of each
+PDF's inputs (mode, rules, pieces, style, language), so re-running the export
+only renders quotes that changed since the last run. Pieces are read from
+the database cursor both when fingerprinting and when rendering, so a quote's
+pieces are never all held in memory (except by the Platypus layouts, which
+need the whole list). The same functions back the "Export PDFs" action of the
+GUI history window.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+from pdf_export import build_compact_pdf, build_detailed_pdf, build_simple_pdf, build_streamed_pdf
+from pricing import MODES, VECTOR_MIN_ROWS, iter_results, price_batch, price_piece
+from quote_history import QuoteHistory
+from settings_store import load_settings
+
+
+BUILDERS = {
+    "detailed": build_detailed_pdf,
+    "simple": build_simple_pdf,
+    "compact": build_compact_pdf,
+    "streamed": build_streamed_pdf,
+}
+
+# Styles whose builder takes any iterable of pieces (read once, never held in memory).
+STREAMING_STYLES = {"streamed"}
+
+# Pieces priced per batch when streaming.
+PRICE_CHUNK = 4096
+
+MANIFEST_NAME = ".fabricost_exports.json"
+
+# Bump when the PDF layout changes so existing exports are re-rendered.
+EXPORT_VERSION = 2
+
+# Quotes read per history page while collecting ids.
+ID_PAGE_SIZE = 500
+
+
+def iter_quote_ids(history, search="", mode=None):
+    """Ids of all quotes matching `search`/`mode`, newest first, read page by page."""
+    before = None
+    while True:
+        rows = history.page(before_id=before, limit=ID_PAGE_SIZE, search=search, mode=mode)
+        for row in rows:
+            yield row['id']
+        if len(rows) < ID_PAGE_SIZE:
+            return
+        before = rows[-1]['id']
+
+
+def quote_filename(quote_id, style):
+    return f"quote_{quote_id:06d}_{style}.pdf"
+
+
+def quote_fingerprint(mode, rules, pieces, style, lang):
+    """Hash of everything that shows up in the rendered PDF; `pieces` (grams, hours, minutes) is read once."""
+    digest = hashlib.sha256(json.dumps([EXPORT_VERSION, mode, rules.as_dict(), style, lang]).encode("utf-8"))
+    for piece in pieces:
+        digest.update(struct.pack("<3d", *piece))
+    return digest.hexdigest()
+
+
+def load_manifest(out_dir):
+    try:
+        return json.loads((Path(out_dir) / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def record_exports(out_dir, results):
+    """Store the fingerprints of the PDFs that rendered successfully."""
+    out_dir = Path(out_dir)
+    manifest = load_manifest(out_dir)
+    for path, fingerprint, error in results:
+        if error is None:
+            manifest[Path(path).name] = fingerprint
+    tmp = out_dir / (MANIFEST_NAME + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=0, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, out_dir / MANIFEST_NAME)
+
+
+def plan_exports(history, quote_ids, out_dir, style="detailed", lang="fr", force=False):
+    """
+    Return (tasks, skipped): `render_quote` argument tuples for the quotes
+    whose PDF is missing or out of date, and how many were left as they are.
+    """
+    out_dir = Path(out_dir)
+    manifest = {} if force else load_manifest(out_dir)
+    tasks = []
+    skipped = 0
+    for quote_id in quote_ids:
+        quote = history.load_quote(quote_id, pieces=False)
+        if quote is None:
+            continue
+        name = quote_filename(quote_id, style)
+        pieces = history.iter_pieces(quote_id)
+        fingerprint = quote_fingerprint(quote['mode'], quote['rules'], pieces, style, lang)
+        if manifest.get(name) == fingerprint and (out_dir / name).exists():
+            skipped += 1
+            continue
+        tasks.append((str(out_dir / name), style, lang, quote['mode'], quote['rules'], history.path, quote_id, fingerprint))
+    return tasks, skipped
+
+
+def plan_history_export(quote_ids, search, out_dir, style="detailed", lang="fr", force=False):
+    """`plan_exports` on a connection of its own (for a worker thread); no ids means every match of `search`."""
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    history = QuoteHistory()
+    try:
+        quote_ids = quote_ids or list(iter_quote_ids(history, search))
+        return plan_exports(history, quote_ids, out_dir, style, lang, force)
+    finally:
+        history.close()
+
+
+def iter_priced_pieces(rules, pieces):
+    """(grams, hours, minutes) tuples -> GUI-style piece dicts with their results, priced chunk by chunk."""
+    pieces = iter(pieces)
+    start = 0
+    while True:
+        chunk = list(islice(pieces, PRICE_CHUNK))
+        if not chunk:
+            return
+        if len(chunk) >= VECTOR_MIN_ROWS:
+            results = iter_results(price_batch(rules, *zip(*chunk)))
+        else:
+            results = (price_piece(rules, *piece) for piece in chunk)
+        for i, ((grams, hours, minutes), result) in enumerate(zip(chunk, results), start + 1):
+            yield {'id': i, 'grams': grams, 'hours': hours, 'minutes': minutes, 'result': result}
+        start += len(chunk)
+
+
+def render_quote(path, style, lang, mode, rules, db_path, quote_id, fingerprint):
+    """
+    Render one quote (runs in a worker process), reading its pieces from the
+    history database at `db_path`. Returns (path, fingerprint, error or None).
+    """
+    try:
+        history = QuoteHistory(db_path)
+        try:
+            priced = iter_priced_pieces(rules, history.iter_pieces(quote_id))
+            if style not in STREAMING_STYLES:
+                priced = list(priced)
+            BUILDERS[style](path, mode, lang, rules, priced)
+        finally:
+            history.close()
+        return path, fingerprint, None
+    except Exception as exc:
+        return path, fingerprint, f"{type(exc).__name__}: {exc}"
+
+
+def summarize(results, skipped, seconds):
+    """Throughput report of a batch run."""
+    exported = sum(1 for _, _, error in results if error is None)
+    return {
+        'exported': exported,
+        'skipped': skipped,
+        'failed': [(Path(path).name, error) for path, _, error in results if error is not None],
+        'seconds': seconds,
+        'rate': exported / seconds if seconds > 0 else 0.0,
+    }
+
+
+def format_report(report):
+    return (
+        f"{report['exported']} PDFs exported, {report['skipped']} unchanged skipped, "
+        f"{len(report['failed'])} failed in {report['seconds']:.2f}s ({report['rate']:.1f} PDFs/s)"
+    )
+
+
+def export_quotes(history, quote_ids, out_dir, style="detailed", lang="fr", workers=None, force=False):
+    """Render the PDFs of `quote_ids` into `out_dir` and return the throughput report."""
+    started = time.perf_counter()
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    tasks, skipped = plan_exports(history, quote_ids, out_dir, style, lang, force)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(tasks) <= 1:
+        results = [render_quote(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            # A few quotes per task amortizes the process round trip on large batches.
+            chunksize = max(1, len(tasks) // (workers * 8))
+            results = list(pool.map(render_quote, *zip(*tasks), chunksize=chunksize))
+    if results:
+        record_exports(out_dir, results)
+    return summarize(results, skipped, time.perf_counter() - started)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="fabricost export",
+        description="Render PDFs of saved quotes into a directory, skipping quotes unchanged since the last export.",
+    )
+    parser.add_argument("output_dir", help="Directory receiving the PDFs")
+    parser.add_argument("--ids", type=int, nargs="+", metavar="ID", help="Quote ids (default: all matching quotes)")
+    parser.add_argument("--search", default="", help="Only quotes whose customer/notes match this text")
+    parser.add_argument("--mode", choices=MODES, help="Only quotes of this calculator mode")
+    parser.add_argument("--style", choices=tuple(BUILDERS), default="detailed", help="PDF layout (default: detailed)")
+    parser.add_argument("--lang", choices=("fr", "en"), help="PDF language (default: the app's language)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--force", action="store_true", help="Re-render every PDF even if unchanged")
+    return parser
+
+
+def run(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    lang = args.lang or load_settings().get("language", "fr")
+
+    history = QuoteHistory()
+    try:
+        quote_ids = args.ids or list(iter_quote_ids(history, args.search, args.mode))
+        report = export_quotes(history, quote_ids, args.output_dir, args.style, lang, args.workers, args.force)
+    finally:
+        history.close()
+
+    for name, error in report['failed']:
+        print(f"[export] {name}: {error}", file=sys.stderr)
+    print(f"[export] {format_report(report)}", file=sys.stderr)
+    return 1 if report['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,75 @@
+"""
+Check that the G-code simulator times G2/G3 arcs the same way in both forms.
+
+Each case is written once with centre offsets (I/J) and once with a radius
+(R, negative for the long way round); both files must simulate to the same
+path length and time. An arc without a centre (no I/J, no R) must count as
+its chord, not as nothing. Mismatches are printed and the exit status is 1:
+
+    python benchmarks/gcode_arc_check.py
+"""
+
+import math
+import sys
+import tempfile
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from gcode_sim import simulate_gcode  # noqa: E402
+
+
+HEADER = "G90\nM82\nG1 X10 Y0 F3000\nG92 E0\n"
+
+# (name, I/J form, R form, expected arc length); every arc starts at X10 Y0.
+CASES = (
+    ("ccw_quarter", "G3 X0 Y10 I-10 J0 E1", "G3 X0 Y10 R10 E1", math.pi * 5),
+    ("cw_quarter", "G2 X0 Y10 I0 J10 E1", "G2 X0 Y10 R10 E1", math.pi * 5),
+    ("ccw_three_quarters", "G3 X0 Y10 I0 J10 E1", "G3 X0 Y10 R-10 E1", math.pi * 15),
+    ("cw_half", "G2 X-10 Y0 I-10 J0 E1", "G2 X-10 Y0 R10 E1", math.pi * 10),
+    ("helix_quarter", "G3 X0 Y10 Z2 I-10 J0 E1", "G3 X0 Y10 Z2 R10 E1", math.hypot(math.pi * 5, 2)),
+)
+
+# (name, move, expected length): no centre at all falls back to the chord.
+CHORD_CASES = (
+    ("no_centre", "G2 X0 Y10 E1", math.hypot(10, 10)),
+)
+
+
+def simulate(body, tmp):
+    path = Path(tmp) / "case.gcode"
+    path.write_text(HEADER + body + "\n", encoding="ascii")
+    return simulate_gcode(path)
+
+
+def main():
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        lead_in = simulate("", tmp)
+        for name, ij_move, r_move, expected in CASES:
+            ij, r = simulate(ij_move, tmp), simulate(r_move, tmp)
+            length = ij["print_distance"] - lead_in["print_distance"]
+            ok = (
+                math.isclose(length, expected, rel_tol=1e-9)
+                and math.isclose(r["print_distance"], ij["print_distance"], rel_tol=1e-9)
+                and math.isclose(r["seconds"], ij["seconds"], rel_tol=1e-9)
+            )
+            failures += not ok
+            print(f"{name:>20}: I/J {ij['print_distance']:.4f} mm {ij['seconds']:.4f} s  "
+                  f"R {r['print_distance']:.4f} mm {r['seconds']:.4f} s{'' if ok else '  <-- MISMATCH'}")
+        for name, move, expected in CHORD_CASES:
+            result = simulate(move, tmp)
+            length = result["print_distance"] - lead_in["print_distance"]
+            ok = math.isclose(length, expected, rel_tol=1e-9) and result["seconds"] > lead_in["seconds"]
+            failures += not ok
+            print(f"{name:>20}: {length:.4f} mm (chord {expected:.4f}) {result['seconds']:.4f} s"
+                  f"{'' if ok else '  <-- MISMATCH'}")
+
+    print(f"{len(CASES) + len(CHORD_CASES)} cases checked, {failures} mismatch(es).")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Render-time benchmark for the PDF quotes.
+
+Prices a synthetic order and times the per-piece detailed layout, the compact
+large-order layout, the streaming canvas writer and the simple layout.
+`--memory` also reports the peak Python allocation of each run (tracemalloc,
+which slows rendering down); the streamed run is fed by a generator, as the
+batch export does, so its peak should not grow with `--pieces`:
+
+    python benchmarks/pdf_render.py --pieces 10000
+    python benchmarks/pdf_render.py --pieces 2000 --mode laser --layouts detailed compact
+    python benchmarks/pdf_render.py --pieces 100000 --layouts streamed --memory
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from pdf_export import build_compact_pdf, build_detailed_pdf, build_simple_pdf, build_streamed_pdf  # noqa: E402
+from pricing import PricingRules, iter_results, price_batch  # noqa: E402
+
+
+LAYOUTS = {
+    # The per-piece layout, whatever the order size.
+    "detailed": lambda *args: build_detailed_pdf(*args, compact_min=float("inf")),
+    "compact": build_compact_pdf,
+    "streamed": build_streamed_pdf,
+    "simple": build_simple_pdf,
+}
+
+# Pieces priced per batch by the generator.
+CHUNK = 4096
+
+
+def _iter_pieces(rules, count):
+    """Synthetic priced pieces, generated and priced one chunk at a time."""
+    for start in range(0, count, CHUNK):
+        ids = range(start, min(count, start + CHUNK))
+        grams = [10 + i % 300 for i in ids]
+        hours = [i % 12 for i in ids]
+        minutes = [i % 60 for i in ids]
+        results = iter_results(price_batch(rules, grams, hours, minutes))
+        for i, g, h, m, r in zip(ids, grams, hours, minutes, results):
+            yield {'id': i + 1, 'grams': g, 'hours': h, 'minutes': m, 'result': r}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time FabriCost PDF rendering for a large order.")
+    parser.add_argument("--pieces", type=int, default=10000, help="Pieces in the order (default: 10000)")
+    parser.add_argument("--mode", choices=("3d", "laser"), default="3d")
+    parser.add_argument("--layouts", nargs="+", choices=tuple(LAYOUTS), default=["compact", "simple"],
+                        help="Layouts to time (default: compact simple; 'detailed' is slow on big orders)")
+    parser.add_argument("--memory", action="store_true", help="Also report peak traced memory per layout")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    rules = PricingRules.from_dict(args.mode, {})
+    report = {"pieces": args.pieces, "mode": args.mode}
+    with tempfile.TemporaryDirectory() as tmp:
+        for layout in args.layouts:
+            path = Path(tmp) / f"{layout}.pdf"
+            if args.memory:
+                tracemalloc.start()
+            started = time.perf_counter()
+            pieces = _iter_pieces(rules, args.pieces)
+            if layout != "streamed":
+                pieces = list(pieces)
+            LAYOUTS[layout](path, args.mode, "en", rules, pieces)
+            report[f"{layout}_seconds"] = round(time.perf_counter() - started, 3)
+            if args.memory:
+                report[f"{layout}_peak_mib"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+                tracemalloc.stop()
+            report[f"{layout}_kib"] = round(path.stat().st_size / 1024, 1)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for key, value in report.items():
+            print(f"{key:>20}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+Load test for the local quote server (`main.py serve`).
+
+By default a server is started on a free localhost port in a subprocess, hit
+with concurrent keep-alive connections, then stopped. Reports throughput and
+p50/p90/p99 latency:
+
+    python benchmarks/quote_server_load.py --requests 20000 --concurrency 64
+    python benchmarks/quote_server_load.py --url http://127.0.0.1:8765 --batch 100
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _payload(mode, batch, index):
+    piece = {"grams": 50 + index % 400, "hours": index % 14, "minutes": index % 60}
+    if batch <= 1:
+        return {"mode": mode, **piece}
+    pieces = [{"id": i, "grams": 10 + i % 300, "hours": i % 12, "minutes": i % 60} for i in range(batch)]
+    return {"mode": mode, "pieces": pieces}
+
+
+async def _client(host, port, path, bodies, counter, latencies, errors, total):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            index = counter[0]
+            if index >= total:
+                break
+            counter[0] += 1
+            body = bodies[index % len(bodies)]
+            request = (
+                f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n"
+            ).encode("latin-1") + body
+            started = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n")[1:]:
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+            if not head.startswith(b"HTTP/1.1 200"):
+                errors[0] += 1
+    finally:
+        writer.close()
+
+
+async def _run_load(host, port, args):
+    bodies = [json.dumps(_payload(args.mode, args.batch, i)).encode("utf-8") for i in range(256)]
+    counter, errors, latencies = [0], [0], []
+
+    # Warm-up so connection setup and first-call costs are not measured.
+    await _client(host, port, "/quote", bodies, [0], [], [0], min(200, args.requests))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, "/quote", bodies, counter, latencies, errors, args.requests)
+        for _ in range(args.concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+    return latencies, errors[0], elapsed
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _wait_for_port(host, port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"server did not start on {host}:{port}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the FabriCost quote server.")
+    parser.add_argument("--url", help="Target an already running server instead of spawning one")
+    parser.add_argument("--requests", type=int, default=20000, help="Total requests (default: 20000)")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent connections (default: 64)")
+    parser.add_argument("--batch", type=int, default=1, help="Pieces per request (default: 1)")
+    parser.add_argument("--mode", choices=("3d", "laser"), default="3d")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    process = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname or "127.0.0.1", parts.port or 80
+    else:
+        host, port = "127.0.0.1", _free_port()
+        process = subprocess.Popen(
+            [sys.executable, str(ROOT / "quote_server.py"), "--host", host, "--port", str(port)],
+            cwd=str(ROOT),
+            env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        )
+        _wait_for_port(host, port)
+
+    try:
+        latencies, errors, elapsed = asyncio.run(_run_load(host, port, args))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+    latencies.sort()
+    report = {
+        "requests": len(latencies),
+        "errors": errors,
+        "concurrency": args.concurrency,
+        "batch": args.batch,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "pieces_per_second": round(len(latencies) * args.batch / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p90_ms": round(_percentile(latencies, 0.90) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round((latencies[-1] if latencies else 0.0) * 1000, 3),
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for key, value in report.items():
+            print(f"{key:>20}: {value}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
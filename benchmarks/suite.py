@@ -0,0 +1,275 @@
+"""
+Benchmark suite for the pricing, persistence and export paths.
+
+Runs headlessly (no Tk window) and compares each case against a stored
+baseline; the exit status is 1 when a case got slower than the baseline by
+more than the threshold:
+
+    python benchmarks/suite.py                    # compare with benchmarks/baseline.json
+    python benchmarks/suite.py --quick            # skip the 1M-piece and 10k-piece cases
+    python benchmarks/suite.py --only pdf receipt # cases whose name contains one of the words
+    python benchmarks/suite.py --save             # record a new baseline on this machine
+
+Timings are machine-specific: record the baseline on the machine (or CI
+runner) that runs the comparison; without a baseline the suite fails. Each
+case reports the best of several rounds, which is the least noisy figure for
+regression checks; the heavy cases (1M pieces, 10k-piece PDFs) run a single
+timed round after building their input. Slowdowns under 50 µs per call are
+ignored, since they are within timer noise for the smallest cases.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+# A case is a regression when best-of-rounds > baseline * (1 + threshold) and it
+# is slower by more than MIN_DELTA seconds: microsecond cases move by more than
+# 25% with timer and cache noise alone.
+DEFAULT_THRESHOLD = 0.25
+MIN_DELTA = 50e-6
+
+# Rounds per case: at least MIN_ROUNDS, more until ROUND_BUDGET seconds are spent (up to MAX_ROUNDS).
+MIN_ROUNDS = 5
+MAX_ROUNDS = 20
+ROUND_BUDGET = 1.0
+
+# Fast cases are called in a loop so that one round lasts at least this long.
+MIN_ROUND_SECONDS = 0.01
+
+
+def _order(rules, count):
+    """Synthetic priced order of `count` pieces."""
+    from pricing import iter_results, price_batch
+
+    grams = [10 + i % 300 for i in range(count)]
+    hours = [i % 12 for i in range(count)]
+    minutes = [i % 60 for i in range(count)]
+    results = iter_results(price_batch(rules, grams, hours, minutes))
+    return [
+        {'id': i + 1, 'grams': g, 'hours': h, 'minutes': m, 'result': r}
+        for i, (g, h, m, r) in enumerate(zip(grams, hours, minutes, results))
+    ]
+
+
+def _pricing_cases(quick):
+    from pricing import PricingRules, price_batch, price_piece
+
+    cases = []
+    for mode in ("3d", "laser"):
+        rules = PricingRules.from_dict(mode, {})
+
+        def single(rules=rules):
+            price_piece(rules, 120, 4, 30)
+
+        def loop_1k(rules=rules):
+            for i in range(1000):
+                price_piece(rules, 10 + i % 300, i % 12, i % 60)
+
+        cases.append((f"price_{mode}_1", single, False))
+        cases.append((f"price_{mode}_1k_loop", loop_1k, False))
+        for count, label in ((1000, "1k"), (1_000_000, "1M")):
+            if quick and count > 1000:
+                continue
+            columns = ([10 + i % 300 for i in range(count)], [i % 12 for i in range(count)], [i % 60 for i in range(count)])
+
+            def batch(rules=rules, columns=columns):
+                price_batch(rules, *columns)
+
+            cases.append((f"price_{mode}_{label}_batch", batch, count > 1000))
+    return cases
+
+
+def _settings_cases(quick):
+    import settings_store
+    from settings_store import SettingsStore, load_settings, save_settings
+
+    data = {f"key_{i}": {"value": i, "label": f"setting {i}"} for i in range(50)}
+    data.update({"language": "fr", "3d_gram_price": 0.1, "laser_material": "plywood_3mm"})
+
+    def round_trip():
+        save_settings(data)
+        assert load_settings()["language"] == "fr"
+
+    store = SettingsStore(settings_store.SETTINGS_DB_PATH)
+    counter = [0]
+
+    def store_flush():
+        # One changed key per flush, as when the GUI saves after an edit.
+        counter[0] += 1
+        store["3d_gram_price"] = counter[0]
+        store.flush()
+
+    return [
+        ("settings_round_trip", round_trip, False),
+        ("settings_store_flush", store_flush, False),
+    ]
+
+
+def _pdf_cases(quick, out_dir):
+    from pdf_export import build_detailed_pdf, build_simple_pdf
+    from pricing import PricingRules
+
+    rules = PricingRules.from_dict("3d", {})
+    cases = []
+    for count, label in ((10, "10"), (1000, "1k"), (10000, "10k")):
+        if quick and count > 1000:
+            continue
+        pieces = _order(rules, count)
+        for name, builder in (("detailed", build_detailed_pdf), ("simple", build_simple_pdf)):
+            path = out_dir / f"{name}_{label}.pdf"
+
+            def build(builder=builder, path=path, pieces=pieces):
+                builder(path, "3d", "en", rules, pieces)
+
+            cases.append((f"pdf_{name}_{label}", build, count > 1000))
+    return cases
+
+
+def _receipt_cases(quick):
+    from pricing import PricingRules
+    from receipts import render_receipt, render_receipt_batch
+
+    rules = PricingRules.from_dict("3d", {})
+    pieces = _order(rules, 25)
+
+    def single():
+        render_receipt("3d", pieces[0], rules.markup_percent)
+
+    def batch():
+        render_receipt_batch("3d", pieces, rules.markup_percent)
+
+    return [
+        ("receipt_single", single, False),
+        ("receipt_batch_25_png", batch, False),
+    ]
+
+
+def _timed(fn, number):
+    started = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return time.perf_counter() - started
+
+
+def time_case(fn, heavy=False):
+    """
+    Best and median seconds per call over several rounds, after an untimed
+    warm-up call. Heavy cases (seconds per call) are timed once.
+    """
+    number = 1
+    elapsed = _timed(fn, 1)
+    while not heavy and elapsed < MIN_ROUND_SECONDS:
+        number *= 10
+        elapsed = _timed(fn, number)
+    if heavy:
+        return elapsed, elapsed, 1
+    rounds = []
+    spent = 0.0
+    while len(rounds) < MAX_ROUNDS:
+        elapsed = _timed(fn, number)
+        rounds.append(elapsed / number)
+        spent += elapsed
+        if len(rounds) >= MIN_ROUNDS and spent >= ROUND_BUDGET:
+            break
+    return min(rounds), statistics.median(rounds), len(rounds)
+
+
+def compare(results, baseline, threshold, min_delta=MIN_DELTA):
+    """[(name, seconds, baseline seconds or None, ratio or None, regressed)]."""
+    rows = []
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        ratio = seconds / base if base else None
+        regressed = ratio is not None and ratio > 1 + threshold and seconds - base > min_delta
+        rows.append((name, seconds, base, ratio, regressed))
+    return rows
+
+
+def machine_info():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the FabriCost benchmark suite against a baseline.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline JSON (default: benchmarks/baseline.json)")
+    parser.add_argument("--save", action="store_true", help="Write the results as the new baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown before failing, as a fraction (default: 0.25 = 25%%)")
+    parser.add_argument("--min-delta", type=float, default=MIN_DELTA * 1e6, metavar="US",
+                        help="Ignore slowdowns smaller than this many microseconds per call (default: 50)")
+    parser.add_argument("--quick", action="store_true", help="Skip the largest cases (1M pieces, 10k-piece PDFs)")
+    parser.add_argument("--only", nargs="+", metavar="WORD", help="Only cases whose name contains one of these words")
+    parser.add_argument("--json", type=Path, help="Also write this run's results to a JSON file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Keep the suite away from the user's real settings and quote history.
+        os.environ["APPDATA"] = tmp
+        out_dir = Path(tmp)
+
+        cases = (
+            _pricing_cases(args.quick) + _settings_cases(args.quick)
+            + _pdf_cases(args.quick, out_dir) + _receipt_cases(args.quick)
+        )
+        results = {}
+        for name, fn, heavy in cases:
+            if args.only and not any(word in name for word in args.only):
+                continue
+            best, median, rounds = time_case(fn, heavy)
+            results[name] = best
+            print(f"{name:>28}: {best * 1000:10.3f} ms  (median {median * 1000:.3f} ms, {rounds} rounds)", flush=True)
+
+    if args.json:
+        args.json.write_text(json.dumps({"machine": machine_info(), "results": results}, indent=2), encoding="utf-8")
+
+    if args.save:
+        args.baseline.write_text(
+            json.dumps({"machine": machine_info(), "results": results}, indent=2, sort_keys=True) + "\n",
+            encoding="utf-8",
+        )
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    try:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        print(f"No baseline at {args.baseline}; run with --save first.")
+        return 1
+
+    if baseline.get("machine", {}).get("platform") != platform.platform():
+        print(f"Note: baseline recorded on {baseline.get('machine', {}).get('platform')}, comparing anyway.")
+    regressions = 0
+    print()
+    rows = compare(results, baseline.get("results", {}), args.threshold, args.min_delta / 1e6)
+    for name, seconds, base, ratio, regressed in rows:
+        if ratio is None:
+            print(f"{name:>28}: new case (no baseline)")
+            continue
+        regressions += regressed
+        print(f"{name:>28}: {ratio:6.2f}x baseline{'  <-- REGRESSION' if regressed else ''}")
+    if regressions:
+        print(f"{regressions} case(s) regressed by more than {args.threshold:.0%} (and {args.min_delta:g} µs).")
+        return 1
+    print(f"No regression beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
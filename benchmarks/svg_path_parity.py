@@ -0,0 +1,134 @@
+"""
+Check that the array SVG path parser (`_bulk_paths`) measures the same as the
+scalar `parse_path` it speeds up.
+
+Runs a corpus of hand-written edge cases (empty and consecutive subpaths,
+marker dots, implicit line-tos, smooth curves, arcs, compact arc flags) and
+random paths mixing absolute and relative commands, each on its own and all
+in one batch with transforms. Mismatches are printed and the exit status is 1:
+
+    python benchmarks/svg_path_parity.py
+    python benchmarks/svg_path_parity.py --random 5000 --seed 7
+"""
+
+import argparse
+import math
+import random
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from vector_import import IDENTITY, PathCollector, _bulk_paths, parse_path, parse_transform  # noqa: E402
+
+
+EDGE_CASES = (
+    "",
+    "M0 0",
+    "M0 0 z",
+    "M0 0 Z M0 0 Z",
+    "m-7.679,-36.248 z m-22.162 -2.067 z",
+    "m1 1 z m2 2 z m3 3 z m4 4 z",
+    "M10 10 M20 20 M30 30",
+    "m1 1 m2 2 m3 3 l0 0 z",
+    "M0 0 L10 0 z m5 5 z",
+    "M0 0 L10 0 L10 10 Z M20 20 l5 0 l0 5 z",
+    "M0 0 10 0 10 10 0 10 z",
+    "m0.1 0.2 l0.1 0 l-0.1 0 z",
+    "M0 0 H10 V10 H0 Z",
+    "m0 0 h10 v10 h-10 z m20 0 h5 v5 z",
+    "M0 0 C10 0 10 10 0 10 S-10 20 0 20",
+    "m0 0 c10 0 10 10 0 10 s-10 10 0 10 z",
+    "M0 0 Q5 10 10 0 L20 0",
+    "M0 0 A5 5 0 0 1 10 0 A5 5 0 0 1 0 0 Z",
+    "m0 0 a5 5 0 1 0 10 0 a0 5 0 0 1 5 5 z",
+    "M1e2 1E-1 l-1e1-1e1 L.5.5",
+    # Compact arc flags (as svgo writes them), including runs whose token count is a multiple of 7.
+    "M0 0a5 5 0 0110 10",
+    "M0 0a5 5 0 0110 10" + " 5 5 0 0110 10" * 6,
+    "M0 0a1 1 0 01 1 0" * 7,
+    "M0 0A5 5 0 1 0 10 0a5 5 0 1110 0",
+)
+
+# Command letters of the random paths and their argument generators (T is left out: always scalar).
+RANDOM_COMMANDS = "MmLlHhVvCcSsQqAaZz"
+
+
+def _number(rng):
+    return round(rng.uniform(-100, 100), rng.choice((0, 1, 3, 6)))
+
+
+def random_path(rng, commands=12):
+    parts = [f"{rng.choice('Mm')}{_number(rng)} {_number(rng)}"]
+    for _ in range(commands):
+        c = rng.choice(RANDOM_COMMANDS)
+        if c in "Zz":
+            parts.append(c)
+        elif c in "Aa":
+            rx, ry = abs(_number(rng)), abs(_number(rng))
+            parts.append(f"{c}{rx} {ry} {_number(rng)} {rng.randint(0, 1)} {rng.randint(0, 1)} {_number(rng)} {_number(rng)}")
+        else:
+            argc = {"M": 2, "L": 2, "H": 1, "V": 1, "C": 6, "S": 4, "Q": 4}[c.upper()]
+            groups = rng.choice((1, 1, 2))
+            parts.append(c + " ".join(str(_number(rng)) for _ in range(argc * groups)))
+    return " ".join(parts)
+
+
+def _keys(paths):
+    # One key per element in the high bits, as `parse_svg` assigns them.
+    return [(i + 1) << 32 for i in range(len(paths))]
+
+
+def measure_scalar(paths):
+    out = PathCollector()
+    for key, (d, m) in zip(_keys(paths), paths):
+        out.set_transform(m)
+        out.key = key
+        parse_path(d, out)
+    return out.measure()
+
+
+def measure_bulk(paths):
+    out = PathCollector()
+    _bulk_paths([(d, m, key) for key, (d, m) in zip(_keys(paths), paths)], out)
+    return out.measure()
+
+
+def same(a, b):
+    # Arc centres are solved in NumPy by one parser and in `math` by the other: allow for rounding.
+    return a["primitives"] == b["primitives"] and a["pierces"] == b["pierces"] and all(
+        math.isclose(a[k], b[k], rel_tol=1e-7, abs_tol=1e-6) for k in ("cut_length", "travel_length")
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the bulk and scalar SVG path parsers.")
+    parser.add_argument("--random", type=int, default=2000, help="Random paths to check (default: 2000)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    corpus = list(EDGE_CASES) + [random_path(rng) for _ in range(args.random)]
+    failures = 0
+    for d in corpus:
+        scalar, bulk = measure_scalar([(d, IDENTITY)]), measure_bulk([(d, IDENTITY)])
+        if not same(scalar, bulk):
+            failures += 1
+            print(f"MISMATCH {d!r}\n  parse_path: {scalar}\n  bulk:       {bulk}")
+
+    # The whole corpus in one batch, with transforms, as `parse_svg` hands it over.
+    transforms = [IDENTITY, parse_transform("translate(10 5) scale(2)"), parse_transform("rotate(30) scale(1 0.5)")]
+    batch = [(d, transforms[i % len(transforms)]) for i, d in enumerate(corpus)]
+    scalar, bulk = measure_scalar(batch), measure_bulk(batch)
+    if not same(scalar, bulk):
+        failures += 1
+        print(f"MISMATCH whole corpus in one batch\n  parse_path: {scalar}\n  bulk:       {bulk}")
+
+    print(f"{len(corpus)} paths checked, {failures} mismatch(es).")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
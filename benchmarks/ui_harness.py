@@ -0,0 +1,258 @@
+"""
+UI performance regression harness: drives the real Tk window under a virtual X display.
+
+Loads synthetic sessions of 100, 1k and 10k pieces into the 3D calculator,
+then calculates, switches language, resizes the window, scrolls the results
+canvas and flips between the input and results pages. Every action is timed
+until Tk has processed the events it queued (redraws, deferred relayout), and
+the widget and canvas item counts after it are recorded so that leaks show
+up next to slowdowns:
+
+    python benchmarks/ui_harness.py            # compare with benchmarks/ui_baseline.json
+    python benchmarks/ui_harness.py --save     # record a new baseline on this machine
+    python benchmarks/ui_harness.py --sizes 100 1000 --rounds 1
+
+Without a DISPLAY (CI, servers) an `Xvfb` server is started for the run; pass
+`--xvfb` to use one even when a display exists, so the desktop does not
+affect the timings. The exit status is 1 when an action is slower than the
+baseline by more than the threshold, leaves more widgets/canvas items
+behind than it did when the baseline was recorded, or when there is no
+baseline to compare with.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from suite import DEFAULT_THRESHOLD, compare, machine_info
+
+
+BASELINE_PATH = Path(__file__).resolve().parent / "ui_baseline.json"
+
+DEFAULT_SIZES = (100, 1000, 10000)
+DEFAULT_ROUNDS = 3
+
+XVFB_SCREEN = "1600x1000x24"
+WINDOW_SIZES = ("1400x900", "900x700", "1400x900")
+
+# Scroll positions visited by one "scroll" action, top to bottom and back.
+SCROLL_STEPS = 20
+PAGE_FLIPS = 10
+
+# Give up waiting for Tk to go idle after this long (seconds).
+SETTLE_TIMEOUT = 10.0
+
+
+@contextmanager
+def virtual_display(force=False):
+    """Point DISPLAY at a fresh Xvfb server for the duration of the block (unless a display exists)."""
+    if os.environ.get("DISPLAY") and not force:
+        yield os.environ["DISPLAY"]
+        return
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        sys.exit("No DISPLAY and no Xvfb found: install Xvfb (e.g. `apt install xvfb`) or run under xvfb-run.")
+    # -displayfd: Xvfb picks a free display number and writes it to the pipe once it accepts connections.
+    read_fd, write_fd = os.pipe()
+    server = subprocess.Popen(
+        [xvfb, "-displayfd", str(write_fd), "-screen", "0", XVFB_SCREEN, "-nolisten", "tcp"],
+        pass_fds=(write_fd,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    os.close(write_fd)
+    previous = os.environ.get("DISPLAY")
+    try:
+        with os.fdopen(read_fd) as pipe:
+            number = pipe.readline().strip()
+        if not number:
+            sys.exit("Xvfb did not start.")
+        os.environ["DISPLAY"] = f":{number}"
+        yield os.environ["DISPLAY"]
+    finally:
+        server.terminate()
+        server.wait()
+        if previous is None:
+            os.environ.pop("DISPLAY", None)
+        else:
+            os.environ["DISPLAY"] = previous
+
+
+def settle(app):
+    """Process events until the app has no deferred relayout pending and Tk is idle."""
+    deadline = time.perf_counter() + SETTLE_TIMEOUT
+    app.root.update()
+    while app.layout_pending() and time.perf_counter() < deadline:
+        time.sleep(0.005)
+        app.root.update()
+    app.root.update_idletasks()
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def counts(app):
+    try:
+        items = len(app.results_canvas.find_all())
+    except Exception:
+        items = 0
+    return {"widgets": count_widgets(app.root), "canvas_items": items}
+
+
+def _synthetic_pieces(count):
+    return [(10 + i % 300, i % 12, i % 60) for i in range(count)]
+
+
+def session_actions(app, count):
+    """[(action name, callable, steps)] for one synthetic session of `count` pieces, in run order."""
+    pieces = _synthetic_pieces(count)
+
+    def load():
+        app.add_pieces(pieces)
+
+    def scroll():
+        for step in range(SCROLL_STEPS):
+            position = step / (SCROLL_STEPS - 1)
+            app.results_canvas.yview_moveto(position if step < SCROLL_STEPS // 2 else 1 - position)
+            settle(app)
+
+    def flip():
+        for _ in range(PAGE_FLIPS // 2):
+            app.show_page("input")
+            settle(app)
+            app.show_page("results")
+            settle(app)
+
+    def resize():
+        for geometry in WINDOW_SIZES:
+            app.root.geometry(geometry)
+            settle(app)
+
+    other = "en" if app.lang_var.get() == "fr" else "fr"
+    current = app.lang_var.get()
+    return [
+        (f"load_{count}", load, 1),
+        (f"relist_{count}", app.update_pieces_list, 1),
+        (f"calculate_{count}", app.calculate_and_show_results, 1),
+        (f"language_{other}_{count}", lambda: app.set_language(other), 1),
+        (f"language_{current}_{count}", lambda: app.set_language(current), 1),
+        (f"resize_{count}", resize, len(WINDOW_SIZES)),
+        (f"scroll_{count}", scroll, SCROLL_STEPS),
+        (f"page_flip_{count}", flip, PAGE_FLIPS),
+    ]
+
+
+def run_session(app, count):
+    """Time every action of one session; returns {action: (seconds per step, counts)}."""
+    app.start_3d_calculator()
+    app.root.geometry(WINDOW_SIZES[0])
+    settle(app)
+    measured = {}
+    for name, action, steps in session_actions(app, count):
+        started = time.perf_counter()
+        action()
+        settle(app)
+        measured[name] = ((time.perf_counter() - started) / steps, counts(app))
+        print(f"{name:>24}: {measured[name][0] * 1000:10.2f} ms  {measured[name][1]}", flush=True)
+    return measured
+
+
+def run_harness(sizes, rounds):
+    """Best time per action over `rounds` sessions of each size, and the counts after it."""
+    import tkinter as tk
+
+    from main import PrintCalculatorApp
+
+    root = tk.Tk()
+    try:
+        app = PrintCalculatorApp(root)
+        # Startup finishes on the first idle pass (history, mode selection).
+        settle(app)
+        times = {}
+        widgets = {}
+        for count in sizes:
+            for _ in range(rounds):
+                for name, (seconds, after) in run_session(app, count).items():
+                    times[name] = min(seconds, times.get(name, seconds))
+                    widgets[name] = after
+        app.close_history()
+        app.jobs.shutdown()
+        app.settings.close()
+        return times, widgets
+    finally:
+        root.destroy()
+
+
+def compare_counts(widgets, baseline):
+    """[(action, kind, count, baseline count)] for every count above its baseline."""
+    grown = []
+    for name, after in widgets.items():
+        for kind, value in after.items():
+            base = baseline.get(name, {}).get(kind)
+            if base is not None and value > base:
+                grown.append((name, kind, value, base))
+    return grown
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the FabriCost window under a virtual display against a baseline.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline JSON (default: benchmarks/ui_baseline.json)")
+    parser.add_argument("--save", action="store_true", help="Write the results as the new baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown before failing, as a fraction (default: 0.25 = 25%%)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, metavar="N",
+                        help="Pieces per synthetic session (default: 100 1000 10000)")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="Sessions per size; the best time counts")
+    parser.add_argument("--xvfb", action="store_true", help="Start Xvfb even when a DISPLAY is set")
+    parser.add_argument("--json", type=Path, help="Also write this run's results to a JSON file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp, virtual_display(args.xvfb):
+        # Keep the harness away from the user's real settings and quote history (read at import time).
+        os.environ["APPDATA"] = tmp
+        times, widgets = run_harness(args.sizes, max(1, args.rounds))
+
+    data = {"machine": machine_info(), "results": times, "counts": widgets}
+    if args.json:
+        args.json.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    if args.save:
+        args.baseline.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    try:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        print(f"No baseline at {args.baseline}; run with --save first.")
+        return 1
+
+    if baseline.get("machine", {}).get("platform") != platform.platform():
+        print(f"Note: baseline recorded on {baseline.get('machine', {}).get('platform')}, comparing anyway.")
+    regressions = 0
+    print()
+    for name, seconds, base, ratio, regressed in compare(times, baseline.get("results", {}), args.threshold):
+        if ratio is None:
+            print(f"{name:>24}: new action (no baseline)")
+            continue
+        regressions += regressed
+        print(f"{name:>24}: {ratio:6.2f}x baseline{'  <-- REGRESSION' if regressed else ''}")
+    for name, kind, value, base in compare_counts(widgets, baseline.get("counts", {})):
+        regressions += 1
+        print(f"{name:>24}: {kind} {base} -> {value}  <-- REGRESSION")
+    if regressions:
+        print(f"{regressions} regression(s) (slower by more than {args.threshold:.0%}, or more widgets).")
+        return 1
+    print(f"No regression beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
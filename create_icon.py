@@ -1,9 +1,17 @@
 """
 Script to convert FabriCost_Logo.png to .ico format for Windows executable.
 Run this once before building the installer.
+
+It also writes the pre-scaled logo PNGs the app loads at startup
+(FabriCost_Logo_<size>.png); FabriCost.spec regenerates them on every build.
 """
+from pathlib import Path
+
 from PIL import Image
 
+# Logo sizes (px) used by the GUI: splash/menu logo, small logo, window icon.
+SCALED_LOGO_SIZES = (160, 36, 64)
+
 def create_icon():
     """Convert PNG logo to ICO format with multiple sizes."""
     try:
@@ -31,6 +39,18 @@ def create_icon():
         print(f"[ERROR] Error creating icon: {e}")
         print("\nMake sure FabriCost_Logo.png exists in the current directory.")
 
+
+def create_scaled_logos(directory="."):
+    """Write FabriCost_Logo_<size>.png for each size, so startup needs no Pillow decode/resize."""
+    directory = Path(directory)
+    with Image.open(directory / "FabriCost_Logo.png") as img:
+        img = img.convert("RGBA")
+        for size in SCALED_LOGO_SIZES:
+            img.resize((size, size), Image.LANCZOS).save(directory / f"FabriCost_Logo_{size}.png", optimize=True)
+    print(f"[SUCCESS] Created scaled logos: {', '.join(f'{s}x{s}' for s in SCALED_LOGO_SIZES)}")
+
+
 if __name__ == "__main__":
     create_icon()
+    create_scaled_logos()
 
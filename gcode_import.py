@@ -0,0 +1,196 @@
+"""
+Read slicer estimates (filament grams and print time) from G-code files.
+
+PrusaSlicer, OrcaSlicer and Bambu Studio write their summary as comments at the
+end of the file (and Bambu/Orca also in a header block), Cura writes it at the
+start. Instead of scanning files that are often hundreds of MB, each file is
+memory-mapped and only a small window at the head and at the tail is read.
+"""
+
+import mmap
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+GCODE_EXTENSIONS = (".gcode", ".gco", ".g")
+
+# Bytes inspected at each end of the file. Prusa/Orca append a ~40-60 KB config
+# block after the summary, so the tail window is larger than the head one.
+HEAD_BYTES = 64 * 1024
+TAIL_BYTES = 512 * 1024
+
+# Used to turn filament length/volume into grams when the slicer does not
+# report grams directly (Cura). PLA, 1.75 mm.
+DEFAULT_FILAMENT_DIAMETER = 1.75
+DEFAULT_FILAMENT_DENSITY = 1.24
+
+_NUMBERS = rb"([0-9][0-9.,\s]*)"
+_GRAMS_TOTAL = re.compile(rb"^;\s*total filament (?:used|weight) \[g\]\s*[=:]\s*" + _NUMBERS, re.M | re.I)
+_GRAMS = re.compile(rb"^;\s*filament used \[g\]\s*[=:]\s*" + _NUMBERS, re.M | re.I)
+_VOLUME_CM3 = re.compile(rb"^;\s*filament used \[cm3\]\s*[=:]\s*" + _NUMBERS, re.M | re.I)
+_LENGTH_MM = re.compile(rb"^;\s*filament used \[mm\]\s*[=:]\s*" + _NUMBERS, re.M | re.I)
+_CURA_LENGTH_M = re.compile(rb"^;\s*Filament used:\s*([0-9][0-9.,m\s]*)", re.M | re.I)
+_CURA_VOLUME_MM3 = re.compile(rb"^;EXTRUDER_TRAIN\.\d+\.MATERIAL\.VOLUME_USED:\s*([0-9.]+)", re.M)
+_CURA_TIME = re.compile(rb"^;(?:PRINT\.)?TIME:\s*([0-9.]+)", re.M)
+_TIME_TEXT = re.compile(
+    rb"(?:estimated printing time \(normal mode\)\s*=|total estimated time\s*:)\s*([0-9dhms ]+)", re.I
+)
+_DENSITY = re.compile(rb"^;\s*filament_density\s*=\s*([0-9.]+)", re.M)
+_DIAMETER = re.compile(rb"^;\s*filament_diameter\s*=\s*([0-9.]+)", re.M)
+_GENERATOR = re.compile(
+    rb"^;\s*(?:generated (?:by|with)\s+)?(PrusaSlicer|SuperSlicer|OrcaSlicer|BambuStudio|Cura_SteamEngine)\b", re.M | re.I
+)
+
+
+def _numbers(raw):
+    """Parse '12.3, 4.5' (one value per extruder) into a list of floats."""
+    values = []
+    for part in raw.replace(b"m", b"").split(b","):
+        part = part.strip()
+        if part:
+            try:
+                values.append(float(part))
+            except ValueError:
+                pass
+    return values
+
+
+def _last_sum(pattern, text):
+    """Sum the per-extruder values of the last match (summaries appear at the end)."""
+    matches = pattern.findall(text)
+    if not matches:
+        return None
+    values = _numbers(matches[-1])
+    return sum(values) if values else None
+
+
+def parse_duration(text):
+    """Parse slicer durations like '1d 2h 3m 4s' or '45m 10s' into seconds."""
+    if isinstance(text, bytes):
+        text = text.decode("ascii", "ignore")
+    seconds = 0.0
+    found = False
+    for value, unit in re.findall(r"(\d+(?:\.\d+)?)\s*([dhms])", text):
+        seconds += float(value) * {"d": 86400, "h": 3600, "m": 60, "s": 1}[unit]
+        found = True
+    return seconds if found else None
+
+
+def _comments(data):
+    """Keep only comment lines; the regexes then scan a few KB instead of the whole window."""
+    return b"\n".join(line for line in data.split(b"\n") if line.startswith(b";"))
+
+
+def _read_windows(path):
+    """
+    Return the head and tail windows of a file without reading the middle.
+
+    Small files are returned whole as the head, with a None tail.
+    """
+    with open(path, "rb") as fh:
+        size = fh.seek(0, 2)
+        if size == 0:
+            raise ValueError("empty file")
+        if size <= HEAD_BYTES + TAIL_BYTES:
+            fh.seek(0)
+            return fh.read(), None
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm[:HEAD_BYTES], mm[size - TAIL_BYTES:]
+
+
+def read_gcode_metadata(path, filament_diameter=DEFAULT_FILAMENT_DIAMETER, filament_density=DEFAULT_FILAMENT_DENSITY):
+    """
+    Extract the slicer's filament and time estimates from a G-code file.
+
+    Returns a dict with `grams`, `seconds` and `slicer` (any of them may be None
+    when the file does not carry that information). Raises OSError/ValueError
+    when the file cannot be read.
+    """
+    head, tail = _read_windows(path)
+    head = _comments(head)
+    text = head if tail is None else head + b"\n" + _comments(tail)
+
+    generator = _GENERATOR.search(head)
+    slicer = generator.group(1).decode("ascii") if generator else None
+
+    density_match = _DENSITY.findall(text)
+    diameter_match = _DIAMETER.findall(text)
+    density = (_numbers(density_match[-1]) or [filament_density])[0] if density_match else filament_density
+    diameter = (_numbers(diameter_match[-1]) or [filament_diameter])[0] if diameter_match else filament_diameter
+    area_mm2 = 3.141592653589793 * (diameter / 2) ** 2
+
+    grams = _last_sum(_GRAMS_TOTAL, text)
+    if grams is None:
+        grams = _last_sum(_GRAMS, text)
+    if grams is None:
+        volume = _last_sum(_VOLUME_CM3, text)
+        if volume is not None:
+            grams = volume * density
+    if grams is None:
+        volume = _last_sum(_CURA_VOLUME_MM3, text)
+        if volume is not None:
+            grams = volume / 1000 * density
+    if grams is None:
+        length_mm = _last_sum(_LENGTH_MM, text)
+        if length_mm is None:
+            length_m = _last_sum(_CURA_LENGTH_M, text)
+            length_mm = length_m * 1000 if length_m is not None else None
+        if length_mm is not None:
+            grams = length_mm * area_mm2 / 1000 * density
+
+    seconds = None
+    time_matches = _TIME_TEXT.findall(text)
+    if time_matches:
+        seconds = parse_duration(time_matches[-1])
+    if seconds is None:
+        cura_time = _CURA_TIME.findall(head)
+        if cura_time:
+            seconds = float(cura_time[0])
+
+    return {"grams": grams, "seconds": seconds, "slicer": slicer}
+
+
+def split_duration(seconds):
+    """Split seconds into whole (hours, minutes) the way operators type them in."""
+    total_minutes = int(round(float(seconds) / 60))
+    hours, minutes = divmod(total_minutes, 60)
+    return float(hours), float(minutes)
+
+
+def piece_from_gcode(path, **kwargs):
+    """
+    Return (grams, hours, minutes) for a G-code file.
+
+    Raises ValueError when the file has no usable filament or time estimate.
+    """
+    meta = read_gcode_metadata(path, **kwargs)
+    if meta["seconds"] is None and meta["grams"] is None:
+        raise ValueError("no slicer estimate found")
+    if meta["seconds"] is None:
+        raise ValueError("no print time estimate found")
+    if meta["grams"] is None:
+        raise ValueError("no filament estimate found")
+    hours, minutes = split_duration(meta["seconds"])
+    return round(meta["grams"], 2), hours, minutes
+
+
+def import_gcode_files(paths, max_workers=8, **kwargs):
+    """
+    Read many G-code files concurrently.
+
+    Returns a list of (path, piece_or_error) in input order, where the piece is a
+    (grams, hours, minutes) tuple and the error is the exception message.
+    """
+    paths = [Path(p) for p in paths]
+
+    def _one(path):
+        try:
+            return path, piece_from_gcode(path, **kwargs)
+        except (OSError, ValueError) as exc:
+            return path, str(exc)
+
+    if len(paths) <= 1:
+        return [_one(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as pool:
+        return list(pool.map(_one, paths))
@@ -0,0 +1,464 @@
+"""
+Kinematic G-code simulator for print time and filament estimates.
+
+Slicer estimates are often 10-30% off because they ignore (or approximate)
+the firmware's motion planner. This module replays the moves of a G-code file
+with a trapezoidal planner driven by a `PrinterProfile` (axis velocity and
+acceleration limits, junction deviation or classic jerk) and integrates the
+E axis into grams.
+
+Files are read in chunks of lines, so memory stays bounded for multi-GB
+files. Each chunk is turned into NumPy arrays and planned at once: the
+forward/backward speed passes are written as cumulative-minimum scans over
+prefix sums instead of a per-segment Python loop.
+
+    python main.py simulate part.gcode other.gcode --profile printer.json
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, fields
+from pathlib import Path
+
+from gcode_import import GCODE_EXTENSIONS, split_duration
+
+
+CHUNK_LINES = 200000
+# Segments kept back at the end of each chunk so their exit speed can still be
+# lowered by the next chunk, like the block buffer of the firmware planner.
+PLANNER_LOOKAHEAD = 32
+
+
+@dataclass(frozen=True)
+class PrinterProfile:
+    """Motion limits of a printer (mm, mm/s, mm/s²) and the loaded filament."""
+
+    max_velocity_x: float = 500.0
+    max_velocity_y: float = 500.0
+    max_velocity_z: float = 12.0
+    max_velocity_e: float = 120.0
+    max_accel_x: float = 5000.0
+    max_accel_y: float = 5000.0
+    max_accel_z: float = 200.0
+    max_accel_e: float = 5000.0
+    print_accel: float = 1500.0
+    travel_accel: float = 3000.0
+    retract_accel: float = 1500.0
+    # Junction deviation (Marlin 2 / Klipper square_corner_velocity-like). Set
+    # to 0 to use the classic jerk model instead.
+    junction_deviation: float = 0.013
+    jerk: float = 8.0
+    default_feedrate: float = 50.0
+    filament_diameter: float = 1.75
+    filament_density: float = 1.24
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a profile from a (possibly partial) dict; unknown keys are ignored."""
+        known = {f.name for f in fields(cls)}
+        return cls(**{key: float(value) for key, value in (data or {}).items() if key in known})
+
+    def as_dict(self):
+        return asdict(self)
+
+
+class _ParserState:
+    """Modal state carried from one chunk of lines to the next."""
+
+    def __init__(self, profile):
+        self.position = [0.0, 0.0, 0.0, 0.0]
+        self.feedrate = profile.default_feedrate
+        self.absolute_xyz = True
+        self.absolute_e = True
+        self.dwell = 0.0
+
+
+def _parse_chunk(lines, state):
+    """
+    Parse a list of raw G-code lines into target positions.
+
+    Returns five lists (x, y, z, e, feedrate in mm/s) plus a list of arc
+    lengths (None for straight moves). Modal state is updated in `state`.
+    """
+    xs, ys, zs, es, fs, arcs = [], [], [], [], [], []
+    pos = state.position
+    for raw in lines:
+        cut = raw.find(b";")
+        if cut >= 0:
+            raw = raw[:cut]
+        words = raw.split()
+        if not words:
+            continue
+        cmd = words[0].upper()
+
+        if cmd in (b"G1", b"G0", b"G01", b"G00", b"G2", b"G3", b"G02", b"G03"):
+            target = list(pos)
+            offset_i = offset_j = 0.0
+            radius = None
+            for word in words[1:]:
+                letter = word[:1].upper()
+                try:
+                    value = float(word[1:])
+                except ValueError:
+                    continue
+                if letter == b"X":
+                    target[0] = value if state.absolute_xyz else pos[0] + value
+                elif letter == b"Y":
+                    target[1] = value if state.absolute_xyz else pos[1] + value
+                elif letter == b"Z":
+                    target[2] = value if state.absolute_xyz else pos[2] + value
+                elif letter == b"E":
+                    target[3] = value if state.absolute_e else pos[3] + value
+                elif letter == b"F":
+                    if value > 0:
+                        state.feedrate = value / 60.0
+                elif letter == b"I":
+                    offset_i = value
+                elif letter == b"J":
+                    offset_j = value
+                elif letter == b"R":
+                    radius = value
+
+            arc = None
+            if cmd in (b"G2", b"G3", b"G02", b"G03"):
+                clockwise = cmd in (b"G2", b"G02")
+                if radius is not None:
+                    offset_i, offset_j = _radius_center_offset(pos, target, radius, clockwise)
+                # Without a centre (no I/J, no R) the move is timed along its chord.
+                if offset_i or offset_j:
+                    arc = _arc_length(pos, target, offset_i, offset_j, clockwise)
+
+            xs.append(target[0])
+            ys.append(target[1])
+            zs.append(target[2])
+            es.append(target[3])
+            fs.append(state.feedrate)
+            arcs.append(arc)
+            pos = target
+        elif cmd == b"G92":
+            pos = list(pos)
+            for word in words[1:]:
+                letter = word[:1].upper()
+                try:
+                    value = float(word[1:])
+                except ValueError:
+                    continue
+                index = b"XYZE".find(letter)
+                if index >= 0:
+                    pos[index] = value
+            # A reset is not a move: start a new segment origin without travel.
+            xs.append(pos[0])
+            ys.append(pos[1])
+            zs.append(pos[2])
+            es.append(pos[3])
+            fs.append(-1.0)
+            arcs.append(None)
+        elif cmd == b"G90":
+            state.absolute_xyz = True
+            state.absolute_e = True
+        elif cmd == b"G91":
+            state.absolute_xyz = False
+            state.absolute_e = False
+        elif cmd == b"M82":
+            state.absolute_e = True
+        elif cmd == b"M83":
+            state.absolute_e = False
+        elif cmd == b"G28":
+            pos = [0.0, 0.0, 0.0, pos[3]]
+            xs.append(0.0)
+            ys.append(0.0)
+            zs.append(0.0)
+            es.append(pos[3])
+            fs.append(-1.0)
+            arcs.append(None)
+        elif cmd in (b"G4", b"G04"):
+            for word in words[1:]:
+                letter = word[:1].upper()
+                try:
+                    value = float(word[1:])
+                except ValueError:
+                    continue
+                if letter == b"P":
+                    state.dwell += value / 1000.0
+                elif letter == b"S":
+                    state.dwell += value
+
+    state.position = pos
+    return xs, ys, zs, es, fs, arcs
+
+
+def _radius_center_offset(start, end, radius, clockwise):
+    """
+    I/J offsets of the centre of a G2/G3 arc given in radius (R) form.
+
+    As in Marlin, a positive R picks the arc of at most 180° and a negative R
+    the longer one; a radius shorter than half the chord is stretched to it.
+    """
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    chord = math.hypot(dx, dy)
+    if radius == 0 or chord == 0:
+        return 0.0, 0.0
+    height = math.sqrt(max(radius * radius - chord * chord / 4, 0.0))
+    side = -1.0 if clockwise != (radius < 0) else 1.0
+    cx = (start[0] + end[0]) / 2 - side * height * dy / chord
+    cy = (start[1] + end[1]) / 2 + side * height * dx / chord
+    return cx - start[0], cy - start[1]
+
+
+def _arc_length(start, end, offset_i, offset_j, clockwise):
+    """Length of a G2/G3 arc given in center-offset (I/J) form, including any Z change."""
+    cx, cy = start[0] + offset_i, start[1] + offset_j
+    radius = math.hypot(offset_i, offset_j)
+    a0 = math.atan2(start[1] - cy, start[0] - cx)
+    a1 = math.atan2(end[1] - cy, end[0] - cx)
+    sweep = a0 - a1 if clockwise else a1 - a0
+    if sweep <= 1e-9:
+        sweep += 2 * math.pi
+    return math.hypot(radius * sweep, end[2] - start[2])
+
+
+class _Planner:
+    """Trapezoidal motion planner working on NumPy arrays of segments."""
+
+    def __init__(self, profile):
+        import numpy as np
+
+        self.np = np
+        self.profile = profile
+        self.velocity_limits = np.array(
+            [profile.max_velocity_x, profile.max_velocity_y, profile.max_velocity_z, profile.max_velocity_e]
+        )
+        self.accel_limits = np.array(
+            [profile.max_accel_x, profile.max_accel_y, profile.max_accel_z, profile.max_accel_e]
+        )
+        self.seconds = 0.0
+        self.extruded = 0.0
+        self.print_distance = 0.0
+        self.travel_distance = 0.0
+        self.moves = 0
+        # Segments carried to the next chunk (dict of arrays) and their entry speed².
+        self.pending = None
+        self.entry_v2 = 0.0
+
+    def add(self, start, xs, ys, zs, es, fs, arcs):
+        """Convert parsed targets into segments and plan all but the last few."""
+        np = self.np
+        if not xs:
+            return
+        targets = np.column_stack([np.asarray(c, dtype=np.float64) for c in (xs, ys, zs, es)])
+        feed = np.asarray(fs, dtype=np.float64)
+        origins = np.vstack([np.asarray(start, dtype=np.float64)[None, :], targets[:-1]])
+        delta = targets - origins
+
+        # G92/G28 entries only move the origin; no time, no filament.
+        real = feed > 0
+        self.extruded += float(delta[real, 3].sum())
+
+        xyz_len = np.sqrt((delta[:, :3] ** 2).sum(axis=1))
+        arc_mask = np.fromiter((a is not None for a in arcs), dtype=bool, count=len(arcs))
+        if arc_mask.any():
+            xyz_len[arc_mask] = [a for a in arcs if a is not None]
+        e_only = (xyz_len < 1e-9) & (np.abs(delta[:, 3]) > 1e-9)
+        length = np.where(e_only, np.abs(delta[:, 3]), xyz_len)
+        keep = real & (length > 1e-9)
+        if not keep.any():
+            return
+
+        delta = delta[keep]
+        length = length[keep]
+        e_only = e_only[keep]
+        feed = feed[keep]
+        extruding = delta[:, 3] > 0
+
+        unit = delta / length[:, None]
+        # Per-axis caps expressed on the path speed/acceleration.
+        with np.errstate(divide="ignore"):
+            axis_v = np.where(np.abs(unit) > 1e-12, self.velocity_limits / np.abs(unit), np.inf).min(axis=1)
+            axis_a = np.where(np.abs(unit) > 1e-12, self.accel_limits / np.abs(unit), np.inf).min(axis=1)
+        p = self.profile
+        accel = np.where(e_only, p.retract_accel, np.where(extruding, p.print_accel, p.travel_accel))
+        segments = {
+            "length": length,
+            "v_nominal": np.minimum(feed, axis_v),
+            "accel": np.minimum(accel, axis_a),
+            "unit": np.where(e_only[:, None], 0.0, unit[:, :3]),
+            "e_only": e_only,
+        }
+        self.print_distance += float(np.where(extruding & ~e_only, length, 0.0).sum())
+        self.travel_distance += float(np.where(~extruding & ~e_only, length, 0.0).sum())
+        self.moves += int(length.size)
+
+        if self.pending is not None:
+            segments = {key: np.concatenate([self.pending[key], value]) for key, value in segments.items()}
+        self.pending = segments
+        self._plan(final=False)
+
+    def finish(self):
+        if self.pending is not None:
+            self._plan(final=True)
+        return self.seconds
+
+    def _junction_v2(self, seg):
+        """Max speed² at the start of each segment given the corner with the previous one."""
+        np = self.np
+        unit, accel, e_only = seg["unit"], seg["accel"], seg["e_only"]
+        n = unit.shape[0]
+        v2 = np.empty(n)
+        v2[0] = self.entry_v2
+        if n == 1:
+            return v2
+        prev, cur = unit[:-1], unit[1:]
+        p = self.profile
+        if p.junction_deviation > 0:
+            cos_theta = np.clip(-(prev * cur).sum(axis=1), -1.0, 1.0)
+            sin_half = np.sqrt(np.maximum(0.5 * (1.0 - cos_theta), 0.0))
+            with np.errstate(divide="ignore"):
+                limit = accel[1:] * p.junction_deviation * sin_half / (1.0 - sin_half)
+            limit = np.where(cos_theta < -0.999999, np.inf, limit)
+            limit = np.where(cos_theta > 0.999999, 0.0, limit)
+        else:
+            change = np.sqrt(((prev - cur) ** 2).sum(axis=1))
+            with np.errstate(divide="ignore"):
+                limit = np.where(change > 1e-9, (p.jerk / change) ** 2, np.inf)
+        # Retract/unretract moves start and end at rest.
+        limit = np.where(e_only[1:] | e_only[:-1], 0.0, limit)
+        v2[1:] = limit
+        return v2
+
+    def _plan(self, final):
+        np = self.np
+        seg = self.pending
+        n = seg["length"].size
+        if n == 0:
+            return
+        length, accel, v_nom = seg["length"], seg["accel"], seg["v_nominal"]
+        v_nom2 = v_nom ** 2
+
+        # Entry speed² ceilings: corner limit, own cruise speed, previous cruise speed.
+        ceiling = np.minimum(self._junction_v2(seg), v_nom2)
+        ceiling[1:] = np.minimum(ceiling[1:], v_nom2[:-1])
+        end = 0.0 if final else v_nom2[-1]
+        ceiling = np.append(ceiling, end)
+
+        # Backward pass: w[i] = min(c[i], w[i+1] + d[i]) == min_{k>=i}(c[k] + S[k]) - S[i]
+        reach = 2.0 * accel * length
+        prefix = np.concatenate([[0.0], np.cumsum(reach)])
+        backward = np.minimum.accumulate((ceiling + prefix)[::-1])[::-1] - prefix
+        # Forward pass: u[i] = min(w[i], u[i-1] + d[i-1]) == min_{k<=i}(w[k] - S[k]) + S[i]
+        v2 = np.minimum.accumulate(backward - prefix) + prefix
+        v2 = np.maximum(v2, 0.0)
+
+        done = n if final else max(0, n - PLANNER_LOOKAHEAD)
+        if done:
+            v0 = np.sqrt(v2[:done])
+            v1 = np.sqrt(v2[1:done + 1])
+            self.seconds += float(_trapezoid_times(np, length[:done], v0, v1, v_nom[:done], accel[:done]).sum())
+        self.entry_v2 = float(v2[done]) if done < n else 0.0
+        self.pending = None if done == n else {key: value[done:] for key, value in seg.items()}
+
+
+def _trapezoid_times(np, length, v0, v1, vn, accel):
+    """Time to cover each segment accelerating from v0 to <= vn and decelerating to v1."""
+    vn = np.maximum(vn, np.maximum(v0, v1))
+    accel_dist = (vn ** 2 - v0 ** 2) / (2 * accel)
+    decel_dist = (vn ** 2 - v1 ** 2) / (2 * accel)
+    cruise = length - accel_dist - decel_dist
+    trapezoid = (vn - v0) / accel + (vn - v1) / accel + np.maximum(cruise, 0.0) / vn
+    peak = np.sqrt(np.maximum((2 * accel * length + v0 ** 2 + v1 ** 2) / 2, 0.0))
+    triangle = (peak - v0) / accel + (peak - v1) / accel
+    return np.where(cruise >= 0, trapezoid, triangle)
+
+
+def simulate_gcode(path, profile=None, chunk_lines=CHUNK_LINES):
+    """
+    Simulate a G-code file and return its estimated time and material use.
+
+    Returns a dict with `seconds`, `grams`, `filament_mm`, `moves`,
+    `print_distance` and `travel_distance` (mm).
+    """
+    profile = profile or PrinterProfile()
+    state = _ParserState(profile)
+    planner = _Planner(profile)
+
+    with open(path, "rb") as fh:
+        while True:
+            lines = list(itertools.islice(fh, chunk_lines))
+            if not lines:
+                break
+            start = list(state.position)
+            planner.add(start, *_parse_chunk(lines, state))
+
+    seconds = planner.finish() + state.dwell
+    area = math.pi * (profile.filament_diameter / 2) ** 2
+    filament_mm = max(planner.extruded, 0.0)
+    return {
+        "seconds": seconds,
+        "grams": filament_mm * area / 1000 * profile.filament_density,
+        "filament_mm": filament_mm,
+        "moves": planner.moves,
+        "print_distance": planner.print_distance,
+        "travel_distance": planner.travel_distance,
+    }
+
+
+def piece_from_simulation(path, profile=None):
+    """Return (grams, hours, minutes) for a G-code file using the simulator."""
+    result = simulate_gcode(path, profile)
+    if result["moves"] == 0:
+        raise ValueError("no moves found")
+    hours, minutes = split_duration(result["seconds"])
+    return round(result["grams"], 2), hours, minutes
+
+
+def _simulate_one(args):
+    path, profile = args
+    try:
+        return piece_from_simulation(path, profile)
+    except (OSError, ValueError) as exc:
+        return str(exc)
+
+
+def simulate_gcode_files(paths, profile=None, max_workers=None):
+    """
+    Simulate several files, one process per core.
+
+    Returns a list of (path, piece_or_error) in input order, the same shape as
+    `gcode_import.import_gcode_files`.
+    """
+    paths = [Path(p) for p in paths]
+    profile = profile or PrinterProfile()
+    jobs = [(p, profile) for p in paths]
+    workers = min(max_workers or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        return [(p, _simulate_one(job)) for p, job in zip(paths, jobs)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(zip(paths, pool.map(_simulate_one, jobs)))
+
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(prog="fabricost simulate", description="Simulate G-code print time and filament.")
+    parser.add_argument("files", nargs="+", help=f"G-code files ({', '.join(GCODE_EXTENSIONS)})")
+    parser.add_argument("--profile", help="JSON file with PrinterProfile fields to override")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per core)")
+    args = parser.parse_args(argv)
+
+    profile = PrinterProfile()
+    if args.profile:
+        profile = PrinterProfile.from_dict(json.loads(Path(args.profile).read_text(encoding="utf-8")))
+
+    for path, outcome in simulate_gcode_files(args.files, profile, args.workers):
+        if isinstance(outcome, tuple):
+            grams, hours, minutes = outcome
+            print(f"{path}: {grams:.2f} g, {int(hours)}h{int(minutes)}min")
+        else:
+            print(f"{path}: error: {outcome}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
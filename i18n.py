@@ -0,0 +1,195 @@
+"""
+UI strings of FabriCost in French and English.
+
+Kept out of the Tk module so exports rendered in worker processes (PDFs,
+receipts) can translate their labels without importing the GUI.
+"""
+
+I18N = {
+    "fr": {
+        "app_title": "FabriCost",
+        "language": "Langue",
+        "input_title": "Calculateur de prix - Ajouter des pièces",
+        "rules_title": "Règles de tarification",
+        "add_piece_section": "Ajouter une nouvelle pièce",
+        "grams": "Grammes :",
+        "hours": "Heures :",
+        "minutes": "Minutes :",
+        "add_piece": "Ajouter",
+        "update_piece": "Modifier la pièce {id}",
+        "added_pieces": "Pièces ajoutées",
+        "no_pieces": "Aucune pièce ajoutée",
+        "calculate_all": "Calculer toutes les pièces",
+        "results_title": "Résultats du calcul",
+        "back": "Retour",
+        "menu": "Menu",
+        "pdf_detailed": "Générer PDF détaillé",
+        "pdf_simple": "Générer PDF simple (prix seulement)",
+        "copy": "Copier",
+        "receipt_image": "Reçu (image)",
+        "summary": "TOTAL : {total:.2f} DT    TEMPS : {time}",
+        "piece": "Pièce",
+        "weight": "Poids",
+        "time": "Temps",
+        "gram_price": "Prix du filament",
+        "time_price": "Prix du temps",
+        "exceeded_suffix": " (dépassement)",
+        "subtotal": "Sous-total",
+        "markup": "Marge",
+        "final_price": "Prix final",
+        "final_price_label": "Prix final :",
+        "rule_gram_price": "Prix par gramme (DT) :",
+        "rule_normal_hour": "Prix horaire normal (DT) :",
+        "rule_exceed_hour": "Prix horaire (après seuil) (DT) :",
+        "rule_threshold": "Seuil (heures) :",
+        "rule_markup": "Marge (%) :",
+        "error": "Erreur",
+        "warning": "Avertissement",
+        "confirm": "Confirmation",
+        "invalid_numbers": "Veuillez saisir des nombres valides !",
+        "need_piece": "Veuillez ajouter au moins une pièce !",
+        "confirm_delete": "Supprimer la pièce {id} ?",
+        "copied": "Copié",
+        "copied_msg": "Les détails de la pièce {id} ont été copiés dans le presse-papiers.",
+        "success": "Succès",
+        "calc_first": "Veuillez d'abord calculer les pièces !",
+        "img_saved": "Image enregistrée dans :\n{path}",
+        "receipts_all": "Tous les reçus",
+        "receipts_saved": "{count} reçus enregistrés dans :\n{path}",
+        "img_copied": "Image copiée dans le presse-papiers.",
+        "img_copy_failed": "Impossible de copier l'image dans le presse-papiers. Elle sera enregistrée dans un fichier.",
+        "pdf_saved": "PDF enregistré dans :\n{path}",
+        "unexpected_error": "Erreur inattendue",
+        "unexpected_error_msg": "Une erreur inattendue est survenue :\n{err}\n\nConsultez la console pour le détail.",
+        "quote_title": "Devis impression 3D",
+        "quote_title_laser": "Devis découpe laser",
+        "pricing_rules": "Règles de tarification :",
+        "total": "TOTAL",
+        "restore_defaults": "Restaurer les valeurs par défaut",
+        "brand_tagline": "Calculateur 3D & Laser",
+        "about_title": "À propos de FabriCost",
+        "about_body": "FabriCost\nAuteur : Mahou\n\nCalculateur de prix pour impression 3D et découpe laser.",
+        "import_files": "Importer des fichiers…",
+        "supported_files": "Fichiers pris en charge",
+        "unsupported_file": "format non pris en charge",
+        "import_result": "{count} pièce(s) importée(s).",
+        "import_skipped": "Fichiers ignorés :\n{files}",
+        "simulate_gcode": "Simuler le G-code (profil imprimante)",
+        "laser_material": "Matériau :",
+        "history": "Historique",
+        "history_title": "Historique des devis",
+        "customer": "Client :",
+        "notes": "Notes :",
+        "search": "Rechercher :",
+        "open_quote": "Ouvrir",
+        "delete_quote": "Supprimer",
+        "date": "Date",
+        "mode": "Mode",
+        "pieces_count": "Pièces",
+        "confirm_delete_quote": "Supprimer le devis {id} ?",
+        "history_error": "Historique indisponible :\n{err}",
+        "cancel": "Annuler",
+        "working": "Traitement en cours…",
+        "export_pdfs": "Exporter les PDF…",
+        "export_report": "{exported} PDF exporté(s), {skipped} inchangé(s) ignoré(s), {failed} en échec en {seconds:.1f} s ({rate:.1f} PDF/s).",
+    },
+    "en": {
+        "app_title": "FabriCost",
+        "language": "Language",
+        "input_title": "Price Calculator - Add Pieces",
+        "rules_title": "Pricing Rules",
+        "add_piece_section": "Add New Piece",
+        "grams": "Grams:",
+        "hours": "Hours:",
+        "minutes": "Minutes:",
+        "add_piece": "Add",
+        "update_piece": "Update Piece {id}",
+        "added_pieces": "Added Pieces",
+        "no_pieces": "No pieces added yet",
+        "calculate_all": "Calculate All Pieces",
+        "results_title": "Calculation Results",
+        "back": "Back",
+        "menu": "Menu",
+        "pdf_detailed": "Generate Detailed PDF",
+        "pdf_simple": "Generate Simple PDF (Prices Only)",
+        "copy": "Copy",
+        "receipt_image": "Receipt Image",
+        "summary": "TOTAL: {total:.2f} DT    TIME: {time}",
+        "piece": "Piece",
+        "weight": "Weight",
+        "time": "Time",
+        "gram_price": "Gramage Price",
+        "time_price": "Time Price",
+        "exceeded_suffix": " (exceeded)",
+        "subtotal": "Subtotal",
+        "markup": "Markup",
+        "final_price": "Final Price",
+        "final_price_label": "Final Price:",
+        "rule_gram_price": "Gram Price (DT):",
+        "rule_normal_hour": "Normal Hour Price (DT):",
+        "rule_exceed_hour": "Exceed Hour Price (DT):",
+        "rule_threshold": "Hour Threshold:",
+        "rule_markup": "Markup (%):",
+        "error": "Error",
+        "warning": "Warning",
+        "confirm": "Confirm",
+        "invalid_numbers": "Please enter valid numbers!",
+        "need_piece": "Please add at least one piece!",
+        "confirm_delete": "Delete Piece {id}?",
+        "copied": "Copied",
+        "copied_msg": "Piece {id} details copied to clipboard!",
+        "success": "Success",
+        "calc_first": "Please calculate pieces first!",
+        "img_saved": "Image saved to:\n{path}",
+        "receipts_all": "All Receipts",
+        "receipts_saved": "{count} receipts saved to:\n{path}",
+        "img_copied": "Image copied to clipboard.",
+        "img_copy_failed": "Could not copy image to clipboard. It will be saved to a file instead.",
+        "pdf_saved": "PDF saved to:\n{path}",
+        "unexpected_error": "Unexpected error",
+        "unexpected_error_msg": "An unexpected error occurred:\n{err}\n\nCheck the console for the full traceback.",
+        "quote_title": "3D Print Price Quote",
+        "quote_title_laser": "Laser Cutting Quote",
+        "pricing_rules": "Pricing Rules:",
+        "total": "TOTAL",
+        "restore_defaults": "Restore Defaults",
+        "brand_tagline": "3D & Laser Calculator",
+        "about_title": "About FabriCost",
+        "about_body": "FabriCost\nAuthor: Mahou\n\nPrice calculator for 3D printing and laser cutting.",
+        "import_files": "Import files…",
+        "supported_files": "Supported files",
+        "unsupported_file": "unsupported format",
+        "import_result": "{count} piece(s) imported.",
+        "import_skipped": "Skipped files:\n{files}",
+        "simulate_gcode": "Simulate G-code (printer profile)",
+        "laser_material": "Material:",
+        "history": "History",
+        "history_title": "Quote History",
+        "customer": "Customer:",
+        "notes": "Notes:",
+        "search": "Search:",
+        "open_quote": "Open",
+        "delete_quote": "Delete",
+        "date": "Date",
+        "mode": "Mode",
+        "pieces_count": "Pieces",
+        "confirm_delete_quote": "Delete quote {id}?",
+        "history_error": "Quote history unavailable:\n{err}",
+        "cancel": "Cancel",
+        "working": "Working…",
+        "export_pdfs": "Export PDFs…",
+        "export_report": "{exported} PDF(s) exported, {skipped} unchanged skipped, {failed} failed in {seconds:.1f}s ({rate:.1f} PDFs/s).",
+    },
+}
+
+LANG_DISPLAY = {"fr": "Français", "en": "English"}
+LANG_CODE = {"Français": "fr", "English": "en"}
+
+
+def translate(lang, key, **kwargs):
+    """Look up `key` in `lang` (French, then English, then the key itself as fallbacks) and format it."""
+    text = I18N.get(lang, I18N["fr"]).get(key, I18N["en"].get(key, key))
+    try:
+        return text.format(**kwargs)
+    except Exception:
+        return text
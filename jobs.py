@@ -0,0 +1,163 @@
+"""
+Background jobs for the FabriCost GUI.
+
+Exports run on a thread pool (I/O, light work) or a process pool (CPU-heavy
+rendering such as PDFs) instead of the Tk main thread; writes that must not
+overlap or reorder (quote history saves) run one at a time on a serial thread. Tk is never touched
+from a worker: `JobRunner` polls its futures with the `after` function it is
+given and calls the completion, error and progress callbacks on the Tk thread.
+A callback that raises is reported (like any Tk callback error) and does not
+stop the other jobs from being delivered.
+"""
+
+import multiprocessing
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+# How often (ms) running jobs are polled from the Tk loop.
+POLL_MS = 100
+
+THREAD_WORKERS = 4
+
+
+class Job:
+    """One submitted job: one or more tasks whose results are delivered together."""
+
+    def __init__(self, label, futures, on_done=None, on_error=None, single=False, quiet=False):
+        self.label = label
+        self.futures = futures
+        self.single = single  # Deliver the one result itself rather than a list.
+        self.quiet = quiet  # Housekeeping (e.g. autosave): not shown by `on_progress`.
+        self.on_done = on_done
+        self.on_error = on_error
+        self.cancelled = False
+
+    @property
+    def total(self):
+        return len(self.futures)
+
+    @property
+    def done_count(self):
+        return sum(1 for f in self.futures if f.done())
+
+    def cancel(self):
+        """
+        Drop the job: tasks not started yet are cancelled, and results of
+        running tasks are discarded (a process cannot be interrupted mid-task).
+        """
+        self.cancelled = True
+        for future in self.futures:
+            future.cancel()
+
+
+class JobRunner:
+    """Thread/process pools plus `after`-based polling that hands results back to the Tk thread."""
+
+    def __init__(self, after, on_progress=None, poll_ms=POLL_MS, report_exception=None):
+        self._after = after
+        self.on_progress = on_progress  # Called with the list of active (non-quiet) jobs after each poll.
+        # Called with (type, value, traceback) when a callback raises; Tk's report_callback_exception fits.
+        self.report_exception = report_exception or traceback.print_exception
+        self.poll_ms = poll_ms
+        self.jobs = []
+        self._threads = None
+        self._processes = None
+        self._serial = None
+        self._polling = False
+
+    def _pool(self, kind):
+        if kind == "serial":
+            # One thread: tasks run in submission order, so it can own a connection of its own.
+            if self._serial is None:
+                self._serial = ThreadPoolExecutor(max_workers=1, thread_name_prefix="serial")
+            return self._serial
+        if kind == "process" and self._processes is None:
+            try:
+                # "spawn" everywhere: forking a process that owns a Tk connection is unsafe.
+                self._processes = ProcessPoolExecutor(
+                    max_workers=max(1, min(4, (os.cpu_count() or 2) - 1)),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            except (OSError, NotImplementedError, ValueError):
+                # No process support (restricted environment): fall back to threads.
+                pass
+        if kind == "process" and self._processes is not None:
+            return self._processes
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(max_workers=THREAD_WORKERS, thread_name_prefix="job")
+        return self._threads
+
+    def submit(self, fn, *args, kind="thread", label="", on_done=None, on_error=None, quiet=False):
+        """
+        Run `fn(*args)` in the background; `on_done(result)` or `on_error(exc)` run on the Tk thread.
+
+        `kind` is "thread", "process" or "serial" (one at a time, in submission order);
+        `quiet` jobs are left out of the progress reports.
+        """
+        future = self._pool(kind).submit(fn, *args)
+        return self._track(Job(label, [future], on_done, on_error, single=True, quiet=quiet))
+
+    def map(self, fn, arg_tuples, kind="process", label="", on_done=None, on_error=None):
+        """Run `fn(*args)` for every tuple; `on_done` receives the results in input order."""
+        pool = self._pool(kind)
+        futures = [pool.submit(fn, *args) for args in arg_tuples]
+        return self._track(Job(label, futures, on_done, on_error))
+
+    def _track(self, job):
+        self.jobs.append(job)
+        if not self._polling:
+            self._polling = True
+            self._after(self.poll_ms, self._poll)
+        if self.on_progress is not None and not job.quiet:
+            self.on_progress(self._visible())
+        return job
+
+    def _visible(self):
+        return [job for job in self.jobs if not job.quiet]
+
+    def _poll(self):
+        try:
+            for job in list(self.jobs):
+                if job.cancelled:
+                    self.jobs.remove(job)
+                elif all(f.done() for f in job.futures):
+                    self.jobs.remove(job)
+                    try:
+                        self._deliver(job)
+                    except Exception:
+                        self.report_exception(*sys.exc_info())
+            if self.on_progress is not None:
+                self.on_progress(self._visible())
+        except Exception:
+            self.report_exception(*sys.exc_info())
+        finally:
+            # Always reschedule (or stop): a raising callback must not leave the runner stuck.
+            if self.jobs:
+                self._after(self.poll_ms, self._poll)
+            else:
+                self._polling = False
+
+    def _deliver(self, job):
+        errors = [f.exception() for f in job.futures if f.exception() is not None]
+        if errors:
+            if job.on_error is not None:
+                job.on_error(errors[0])
+            return
+        results = [f.result() for f in job.futures]
+        if job.on_done is not None:
+            job.on_done(results[0] if job.single else results)
+
+    def cancel_all(self):
+        for job in self.jobs:
+            job.cancel()
+
+    def shutdown(self):
+        """Cancel everything queued and release the pools without waiting for running tasks."""
+        self.cancel_all()
+        for pool in (self._threads, self._processes, self._serial):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._threads = self._processes = self._serial = None
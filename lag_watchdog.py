@@ -0,0 +1,184 @@
+"""
+Event-loop lag watchdog for the FabriCost GUI (`python main.py --watchdog [BUDGET_MS]`).
+
+A heartbeat `after` timer measures how late the Tk loop runs it; the lag of
+every beat feeds the live percentiles of a small debug overlay (Ctrl+Shift+L
+toggles it). When no beat has run for longer than the budget, a callback is
+blocking the loop: a helper thread samples the main thread's stack while the
+stall lasts, and once the loop is back the stall is logged with the callback
+that caused it and where it was spending its time. Those are the handlers to
+move to a background job.
+
+A callback stuck inside a C call that holds the GIL can't be sampled until it
+returns; its stall is still measured and logged.
+"""
+
+import collections
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+
+
+DEFAULT_BUDGET_MS = 200
+
+# Heartbeat period; also the resolution of the lag measurements.
+HEARTBEAT_MS = 50
+
+# Lag samples kept for the percentiles (30 s of heartbeats).
+LAG_WINDOW = 600
+
+# Distinct stacks kept per stall, and how often the overlay is refreshed.
+MAX_SAMPLES = 5
+OVERLAY_MS = 500
+
+# tkinter frames that call straight into an application callback (event/command bindings, `after`).
+_DISPATCH_FRAMES = {"__call__", "callit"}
+
+
+def percentiles(values, points=(50, 95, 99)):
+    """Nearest-rank percentiles of `values` plus their max, as {"p50": ..., "max": ...}."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    stats = {f"p{p}": ordered[min(len(ordered) - 1, max(0, -(-p * len(ordered) // 100) - 1))] for p in points}
+    stats["max"] = ordered[-1]
+    return stats
+
+
+def _is_tkinter(frame):
+    return "tkinter" in Path(frame.filename).parts
+
+
+def blocking_callback(stack):
+    """The application frame that tkinter dispatched to in `stack` (outermost first), or None."""
+    for i, frame in enumerate(stack[:-1]):
+        if _is_tkinter(frame) and frame.name in _DISPATCH_FRAMES and not _is_tkinter(stack[i + 1]):
+            return stack[i + 1]
+    return None
+
+
+class LagWatchdog:
+    """Heartbeat on the Tk loop plus a sampling thread that catches callbacks over budget."""
+
+    def __init__(self, root, budget_ms=DEFAULT_BUDGET_MS, heartbeat_ms=HEARTBEAT_MS, on_stall=None):
+        self.root = root
+        self.budget = budget_ms / 1000
+        self.heartbeat_ms = heartbeat_ms
+        self.on_stall = on_stall or self.log_stall  # Called on the Tk thread with each finished stall.
+        self.lags = collections.deque(maxlen=LAG_WINDOW)  # ms per beat
+        self.stall_count = 0
+        self._stall = None
+        self._due = None
+        self._last_beat = None
+        self._beat_job = None
+        self._overlay = None
+        self._overlay_job = None
+        self._stop = threading.Event()
+        self._main_ident = threading.main_thread().ident
+
+    def start(self):
+        self._last_beat = self._due = time.perf_counter()
+        self._beat()
+        threading.Thread(target=self._sample_loop, name="watchdog", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        for job in (self._beat_job, self._overlay_job):
+            if job is not None:
+                try:
+                    self.root.after_cancel(job)
+                except Exception:
+                    pass
+        self._beat_job = self._overlay_job = None
+
+    def _beat(self):
+        now = time.perf_counter()
+        self.lags.append(max(0.0, now - self._due) * 1000)
+        previous, self._last_beat = self._last_beat, now
+        stall, self._stall = self._stall, None
+        # A stall opened by the sampler just as this beat ran belongs to no blocked callback.
+        if stall is not None and stall["beat"] == previous:
+            self.stall_count += 1
+            stall["duration_ms"] = (now - stall["started"]) * 1000
+            try:
+                self.on_stall(stall)
+            except Exception:
+                pass
+        if self._stop.is_set():
+            return
+        self._due = now + self.heartbeat_ms / 1000
+        self._beat_job = self.root.after(self.heartbeat_ms, self._beat)
+
+    def _sample_loop(self):
+        # Sample a few times per budget so the stack is caught early in the stall.
+        period = max(self.budget / 4, 0.01)
+        while not self._stop.wait(period):
+            last = self._last_beat
+            overdue = time.perf_counter() - last - self.heartbeat_ms / 1000
+            if overdue <= self.budget:
+                continue
+            frame = sys._current_frames().get(self._main_ident)
+            if frame is None or self._last_beat != last:
+                continue
+            stack = traceback.extract_stack(frame)
+            del frame
+            stall = self._stall
+            if stall is None or stall["beat"] != last:
+                stall = self._stall = {"beat": last, "started": last + self.heartbeat_ms / 1000, "samples": []}
+            key = [(f.filename, f.lineno) for f in stack]
+            if len(stall["samples"]) < MAX_SAMPLES and all(key != seen for seen, _ in stall["samples"]):
+                stall["samples"].append((key, stack))
+
+    @staticmethod
+    def describe(stall):
+        """Log text of a stall: duration, blocking callback and the distinct stacks sampled."""
+        stacks = [stack for _, stack in stall["samples"]]
+        callback = blocking_callback(stacks[0]) if stacks else None
+        where = f"{callback.name} ({Path(callback.filename).name}:{callback.lineno})" if callback else "unknown callback"
+        lines = [f"[watchdog] Tk loop blocked {stall['duration_ms']:.0f} ms in {where}"]
+        for i, stack in enumerate(stacks, 1):
+            lines.append(f"  sample {i}:")
+            lines.extend(line.rstrip("\n") for line in traceback.format_list(stack))
+        return "\n".join(lines)
+
+    def log_stall(self, stall):
+        print(self.describe(stall), file=sys.stderr, flush=True)
+
+    def summary(self):
+        stats = percentiles(self.lags)
+        if not stats:
+            return "lag: no samples"
+        parts = "  ".join(f"{name} {value:.0f}" for name, value in stats.items())
+        return f"lag ms  {parts}  |  stalls > {self.budget * 1000:.0f} ms: {self.stall_count}"
+
+    def toggle_overlay(self, event=None):
+        """Show or hide the live lag percentiles in the top-right corner of the window."""
+        import tkinter as tk
+
+        if self._overlay is not None:
+            if self._overlay_job is not None:
+                self.root.after_cancel(self._overlay_job)
+            self._overlay.destroy()
+            self._overlay = self._overlay_job = None
+            return
+        self._overlay = tk.Label(
+            self.root, bg="#111827", fg="#facc15", font=("Courier", 10), padx=8, pady=4, justify=tk.LEFT,
+        )
+        self._overlay.place(relx=1.0, y=0, anchor="ne")
+        self._refresh_overlay()
+
+    def _refresh_overlay(self):
+        self._overlay.configure(text=self.summary())
+        self._overlay.lift()
+        self._overlay_job = self.root.after(OVERLAY_MS, self._refresh_overlay)
+
+
+def enable(root, budget_ms=DEFAULT_BUDGET_MS):
+    """Start a watchdog on `root`, bound to Ctrl+Shift+L for the overlay."""
+    watchdog = LagWatchdog(root, budget_ms).start()
+    root.bind_all("<Control-L>", watchdog.toggle_overlay)
+    print(f"[watchdog] Logging Tk callbacks over {budget_ms} ms (Ctrl+Shift+L shows lag percentiles)")
+    return watchdog
@@ -1,37 +1,58 @@
+import time
+
+# Start of the module imports, reported as a startup phase by `--profile`.
+_IMPORTS_STARTED_US = time.perf_counter_ns() // 1000
+
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-from PIL import Image, ImageDraw, ImageFont, ImageTk
-import os
-import json
-import sqlite3
+from tkinter import ttk, messagebox, filedialog, font as tkfont
+import argparse
+import multiprocessing
 import sys
+import threading
+from functools import partial
 from pathlib import Path
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib.units import cm
-from reportlab.lib.enums import TA_LEFT
 import io
 
+from settings_store import SettingsStore, load_settings
+from i18n import I18N, LANG_CODE, LANG_DISPLAY, translate
+from jobs import JobRunner
+from quote_history import PAGE_SIZE, QuoteHistory
+from gcode_import import GCODE_EXTENSIONS, import_gcode_files
+from gcode_sim import PrinterProfile, simulate_gcode_files
+from mesh_import import MESH_EXTENSIONS, MeshProfile, import_mesh_files
+from vector_import import DEFAULT_LASER_MATERIAL, VECTOR_EXTENSIONS, import_vector_files, laser_materials
+from raster_import import RASTER_EXTENSIONS, EngraveProfile, import_raster_files
+from pricing import (
+    FACTORY_3D_RULES,
+    FACTORY_LASER_RULES,
+    VECTOR_MIN_ROWS,
+    PricingRules,
+    iter_results,
+    price_batch,
+    price_piece,
+    rules_affect_piece,
+    rules_from_settings,
+)
+
+_IMPORTS_DONE_US = time.perf_counter_ns() // 1000
 
-def get_settings_path():
-    """Return a writable settings path (works for PyInstaller onefile too)."""
-    # Prefer Windows roaming AppData; fallback to user home.
-    appdata = os.environ.get("APPDATA")
-    base_dir = Path(appdata) if appdata else Path.home()
-    settings_dir = base_dir / "3dPrix"
-    try:
-        settings_dir.mkdir(parents=True, exist_ok=True)
-    except Exception:
-        pass
-    return settings_dir / "settings.json"
 
+APP_BRAND_NAME = "FabriCost"
+
+# Pause in rule typing (ms) before the live price preview re-prices the session.
+PREVIEW_DELAY_MS = 250
 
-SETTINGS_PATH = get_settings_path()
-SETTINGS_DB_PATH = SETTINGS_PATH.with_suffix(".db")
+# Logo sizes pre-scaled at build time by create_icon.py (FabriCost_Logo_<size>.png).
+LOGO_LARGE_SIZE = 160
+LOGO_SMALL_SIZE = 36
+ICON_SIZE = 64
 
-APP_BRAND_NAME = "FabriCost"
+# Export modules (reportlab, Pillow) are imported on first use rather than at
+# startup; once the window is up they are preloaded on a background thread.
+EXPORT_MODULES = ("pdf_export", "receipts", "batch_export")
+
+# Pieces rows re-labelled per Tk loop iteration after a language switch (the rows in view go first).
+ROW_REFRESH_CHUNK = 1000
 
 
 def get_asset_path(name: str) -> Path:
@@ -45,7 +66,38 @@ def get_asset_path(name: str) -> Path:
     return Path(__file__).resolve().parent / name
 
 
-def _copy_image_to_clipboard(img: Image.Image) -> bool:
+def _preload_export_modules():
+    """Import the export modules in the background so the first export does not pay for it."""
+    import importlib
+
+    for name in EXPORT_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+
+
+def _run_importers(groups):
+    """Run each importer on its files (on a job thread); returns [(path, (grams, hours, minutes) or error)]."""
+    return [outcome for importer, paths in groups.items() for outcome in importer(paths)]
+
+
+def _set_text(widget, text):
+    widget.configure(text=text)
+
+
+def _set_title(window, text):
+    window.title(text)
+
+
+def _heading_setter(column):
+    """Setter for a Treeview column heading (labels lose their trailing " :")."""
+    def set_heading(tree, text):
+        tree.heading(column, text=text.rstrip(" :"))
+    return set_heading
+
+
+def _copy_image_to_clipboard(img) -> bool:
     """
     Try to copy a PIL image to the Windows clipboard so it can be pasted
     directly into chat applications (WhatsApp, etc.).
@@ -73,232 +125,27 @@ def _copy_image_to_clipboard(img: Image.Image) -> bool:
         # pywin32 not installed or clipboard operation failed.
         return False
 
-I18N = {
-    "fr": {
-        "app_title": "FabriCost",
-        "language": "Langue",
-        "input_title": "Calculateur de prix - Ajouter des pièces",
-        "rules_title": "Règles de tarification",
-        "add_piece_section": "Ajouter une nouvelle pièce",
-        "grams": "Grammes :",
-        "hours": "Heures :",
-        "minutes": "Minutes :",
-        "add_piece": "Ajouter",
-        "update_piece": "Modifier la pièce {id}",
-        "added_pieces": "Pièces ajoutées",
-        "no_pieces": "Aucune pièce ajoutée",
-        "calculate_all": "Calculer toutes les pièces",
-        "results_title": "Résultats du calcul",
-        "back": "Retour",
-        "menu": "Menu",
-        "pdf_detailed": "Générer PDF détaillé",
-        "pdf_simple": "Générer PDF simple (prix seulement)",
-        "copy": "Copier",
-        "receipt_image": "Reçu (image)",
-        "summary": "TOTAL : {total:.2f} DT    TEMPS : {time}",
-        "piece": "Pièce",
-        "weight": "Poids",
-        "time": "Temps",
-        "gram_price": "Prix du filament",
-        "time_price": "Prix du temps",
-        "exceeded_suffix": " (dépassement)",
-        "subtotal": "Sous-total",
-        "markup": "Marge",
-        "final_price": "Prix final",
-        "final_price_label": "Prix final :",
-        "rule_gram_price": "Prix par gramme (DT) :",
-        "rule_normal_hour": "Prix horaire normal (DT) :",
-        "rule_exceed_hour": "Prix horaire (après seuil) (DT) :",
-        "rule_threshold": "Seuil (heures) :",
-        "rule_markup": "Marge (%) :",
-        "error": "Erreur",
-        "warning": "Avertissement",
-        "confirm": "Confirmation",
-        "invalid_numbers": "Veuillez saisir des nombres valides !",
-        "need_piece": "Veuillez ajouter au moins une pièce !",
-        "confirm_delete": "Supprimer la pièce {id} ?",
-        "copied": "Copié",
-        "copied_msg": "Les détails de la pièce {id} ont été copiés dans le presse-papiers.",
-        "success": "Succès",
-        "calc_first": "Veuillez d'abord calculer les pièces !",
-        "img_saved": "Image enregistrée dans :\n{path}",
-        "img_copied": "Image copiée dans le presse-papiers.",
-        "img_copy_failed": "Impossible de copier l'image dans le presse-papiers. Elle sera enregistrée dans un fichier.",
-        "pdf_saved": "PDF enregistré dans :\n{path}",
-        "unexpected_error": "Erreur inattendue",
-        "unexpected_error_msg": "Une erreur inattendue est survenue :\n{err}\n\nConsultez la console pour le détail.",
-        "quote_title": "Devis impression 3D",
-        "quote_title_laser": "Devis découpe laser",
-        "pricing_rules": "Règles de tarification :",
-        "total": "TOTAL",
-        "restore_defaults": "Restaurer les valeurs par défaut",
-        "brand_tagline": "Calculateur 3D & Laser",
-        "about_title": "À propos de FabriCost",
-        "about_body": "FabriCost\nAuteur : Mahou\n\nCalculateur de prix pour impression 3D et découpe laser.",
-    },
-    "en": {
-        "app_title": "FabriCost",
-        "language": "Language",
-        "input_title": "Price Calculator - Add Pieces",
-        "rules_title": "Pricing Rules",
-        "add_piece_section": "Add New Piece",
-        "grams": "Grams:",
-        "hours": "Hours:",
-        "minutes": "Minutes:",
-        "add_piece": "Add",
-        "update_piece": "Update Piece {id}",
-        "added_pieces": "Added Pieces",
-        "no_pieces": "No pieces added yet",
-        "calculate_all": "Calculate All Pieces",
-        "results_title": "Calculation Results",
-        "back": "Back",
-        "menu": "Menu",
-        "pdf_detailed": "Generate Detailed PDF",
-        "pdf_simple": "Generate Simple PDF (Prices Only)",
-        "copy": "Copy",
-        "receipt_image": "Receipt Image",
-        "summary": "TOTAL: {total:.2f} DT    TIME: {time}",
-        "piece": "Piece",
-        "weight": "Weight",
-        "time": "Time",
-        "gram_price": "Gramage Price",
-        "time_price": "Time Price",
-        "exceeded_suffix": " (exceeded)",
-        "subtotal": "Subtotal",
-        "markup": "Markup",
-        "final_price": "Final Price",
-        "final_price_label": "Final Price:",
-        "rule_gram_price": "Gram Price (DT):",
-        "rule_normal_hour": "Normal Hour Price (DT):",
-        "rule_exceed_hour": "Exceed Hour Price (DT):",
-        "rule_threshold": "Hour Threshold:",
-        "rule_markup": "Markup (%):",
-        "error": "Error",
-        "warning": "Warning",
-        "confirm": "Confirm",
-        "invalid_numbers": "Please enter valid numbers!",
-        "need_piece": "Please add at least one piece!",
-        "confirm_delete": "Delete Piece {id}?",
-        "copied": "Copied",
-        "copied_msg": "Piece {id} details copied to clipboard!",
-        "success": "Success",
-        "calc_first": "Please calculate pieces first!",
-        "img_saved": "Image saved to:\n{path}",
-        "img_copied": "Image copied to clipboard.",
-        "img_copy_failed": "Could not copy image to clipboard. It will be saved to a file instead.",
-        "pdf_saved": "PDF saved to:\n{path}",
-        "unexpected_error": "Unexpected error",
-        "unexpected_error_msg": "An unexpected error occurred:\n{err}\n\nCheck the console for the full traceback.",
-        "quote_title": "3D Print Price Quote",
-        "quote_title_laser": "Laser Cutting Quote",
-        "pricing_rules": "Pricing Rules:",
-        "total": "TOTAL",
-        "restore_defaults": "Restore Defaults",
-        "brand_tagline": "3D & Laser Calculator",
-        "about_title": "About FabriCost",
-        "about_body": "FabriCost\nAuthor: Mahou\n\nPrice calculator for 3D printing and laser cutting.",
-    },
-}
-
-LANG_DISPLAY = {"fr": "Français", "en": "English"}
-LANG_CODE = {"Français": "fr", "English": "en"}
-
-
-def load_settings():
-    """Load settings from a local SQLite database (with JSON fallback for legacy data)."""
-    data = {}
-    try:
-        conn = sqlite3.connect(SETTINGS_DB_PATH)
-        cur = conn.cursor()
-        cur.execute(
-            "CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
-        )
-        conn.commit()
-
-        # If the DB is empty but a legacy JSON file exists, migrate it once.
-        cur.execute("SELECT COUNT(*) FROM settings")
-        count = cur.fetchone()[0]
-        if count == 0 and SETTINGS_PATH.exists():
-            try:
-                legacy = json.loads(SETTINGS_PATH.read_text(encoding="utf-8"))
-                for k, v in legacy.items():
-                    cur.execute(
-                        "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
-                        (k, json.dumps(v, ensure_ascii=False)),
-                    )
-                conn.commit()
-            except Exception:
-                # Ignore migration errors and continue with an empty DB.
-                pass
-
-        cur.execute("SELECT key, value FROM settings")
-        rows = cur.fetchall()
-        for key, raw in rows:
-            try:
-                data[key] = json.loads(raw)
-            except Exception:
-                data[key] = raw
-    except Exception:
-        # Non-fatal: fall back to empty settings.
-        data = {}
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
-    return data
-
-
-def save_settings(data):
-    """Persist the full settings dict into the local SQLite DB."""
-    try:
-        conn = sqlite3.connect(SETTINGS_DB_PATH)
-        cur = conn.cursor()
-        cur.execute(
-            "CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
-        )
-        for key, value in data.items():
-            cur.execute(
-                "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
-                (key, json.dumps(value, ensure_ascii=False)),
-            )
-        conn.commit()
-    except Exception:
-        # Non-fatal: app can still run without persistence.
-        pass
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
-
-
-# Factory defaults for calculators (used on first run and for 'restore defaults').
-FACTORY_3D_RULES = {
-    "gram_price": 0.1,
-    "normal_hour_price": 3.0,
-    "exceed_hour_price": 2.0,
-    "exceed_threshold": 10.0,
-    "markup_percent": 20.0,
-}
-
-FACTORY_LASER_RULES = {
-    "normal_hour_price": 30.0,
-    "markup_percent": 5.0,
-}
-
 
 class PrintCalculatorApp:
     def __init__(self, root):
         self.root = root
 
-        self.settings = load_settings()
+        # Cached settings over one open DB connection; changes are written in the background.
+        self.settings = SettingsStore()
+        self._settings_flush_job = None
         default_lang = self.settings.get("language", "fr")
         if default_lang not in I18N:
             default_lang = "fr"
         self.lang_var = tk.StringVar(value=default_lang)
+        # Shown by the language pickers of both calculator pages.
+        self.lang_display_var = tk.StringVar(value=LANG_DISPLAY[default_lang])
 
-        self.root.title(self.t("app_title"))
+        # Translated widget texts: (widget path, slot) -> (widget, I18N key, format kwargs, setter).
+        # A language switch re-applies them in place instead of rebuilding the UI.
+        self._translated = {}
+        self._row_refresh_job = None
+
+        self.tr(self.root, "app_title", slot="title", setter=_set_title)
         self.root.geometry("1400x900")
         self.root.configure(bg="#f0f4f8")
 
@@ -306,28 +153,8 @@ class PrintCalculatorApp:
         self.mode = None
 
         # Default rules for calculators, loaded from settings with factory fallbacks.
-        self.default_3d_rules = {
-            "gram_price": float(self.settings.get("3d_gram_price", FACTORY_3D_RULES["gram_price"])),
-            "normal_hour_price": float(
-                self.settings.get("3d_normal_hour_price", FACTORY_3D_RULES["normal_hour_price"])
-            ),
-            "exceed_hour_price": float(
-                self.settings.get("3d_exceed_hour_price", FACTORY_3D_RULES["exceed_hour_price"])
-            ),
-            "exceed_threshold": float(
-                self.settings.get("3d_exceed_threshold", FACTORY_3D_RULES["exceed_threshold"])
-            ),
-            "markup_percent": float(self.settings.get("3d_markup_percent", FACTORY_3D_RULES["markup_percent"])),
-        }
-
-        self.default_laser_rules = {
-            "normal_hour_price": float(
-                self.settings.get("laser_normal_hour_price", FACTORY_LASER_RULES["normal_hour_price"])
-            ),
-            "markup_percent": float(
-                self.settings.get("laser_markup_percent", FACTORY_LASER_RULES["markup_percent"])
-            ),
-        }
+        self.default_3d_rules = rules_from_settings(self.settings, "3d").as_dict()
+        self.default_laser_rules = rules_from_settings(self.settings, "laser").as_dict()
 
         # Rule variables (configured per mode)
         self.gram_price = tk.DoubleVar(value=self.default_3d_rules["gram_price"])
@@ -335,15 +162,40 @@ class PrintCalculatorApp:
         self.exceed_hour_price = tk.DoubleVar(value=self.default_3d_rules["exceed_hour_price"])
         self.exceed_threshold = tk.DoubleVar(value=self.default_3d_rules["exceed_threshold"])
         self.markup_percent = tk.DoubleVar(value=self.default_3d_rules["markup_percent"])
+
+        # Live preview: rule edits re-price the shown results once typing pauses.
+        self._preview_job = None
+        for var in (self.gram_price, self.normal_hour_price, self.exceed_hour_price,
+                    self.exceed_threshold, self.markup_percent):
+            var.trace_add("write", self._schedule_preview)
+
+        # G-code import: trust the slicer summary, or re-simulate the moves with the printer profile.
+        self.simulate_gcode = tk.BooleanVar(value=bool(self.settings.get("simulate_gcode", False)))
+        # SVG/DXF import: cutting speeds come from the selected material profile.
+        self.laser_material = tk.StringVar(value=self.settings.get("laser_material", DEFAULT_LASER_MATERIAL))
         
         # Pieces list
         self.pieces = []
 
+        # Quote history: customer/notes of the current quote and its id once saved.
+        # Saves run as serial jobs on their own connection; `_quote_ref` holds the id
+        # of the current quote, filled in by the save that creates it.
+        self.history = None
+        self._history_writer = None
+        self.customer_var = tk.StringVar(value="")
+        self.notes_var = tk.StringVar(value="")
+        self._quote_ref = {"id": None}
+        self._history_window = None
+
         # Editing state (input page)
         self.editing_piece = None
 
-        # Results UI state
-        self.result_cards = []
+        # Results UI state (rules the shown results were priced with, recycled card slots)
+        self.results_rules = None
+        self.result_slots = []
+        # Incremental pricing: pieces waiting to be (re)priced and running totals of the priced ones.
+        self.dirty_pieces = {}
+        self.totals = {'final_price': 0.0, 'total_hours': 0.0}
         self.summary_var = tk.StringVar(value="")
         self._layout_job = None
         
@@ -360,8 +212,28 @@ class PrintCalculatorApp:
         self._icon_image = None
         self._load_branding_assets()
 
-        # Start with splash screen
+        # Exports run in the background; a status bar shows their progress.
+        # Callback errors go to the root's current report_callback_exception (main() replaces it later).
+        self.jobs = JobRunner(
+            self.root.after,
+            on_progress=self._on_jobs_progress,
+            report_exception=lambda *exc: self.root.report_callback_exception(*exc),
+        )
+        self._create_job_bar()
+
+        # The splash stays up only while the remaining startup work runs.
         self.show_splash_screen()
+        self.root.after_idle(self._finish_startup)
+
+    def _finish_startup(self):
+        """Startup work done after the splash is drawn; then go straight to the menu."""
+        try:
+            self._quote_history()
+        except Exception:
+            # History is opened again on first use; a failure here must not block startup.
+            pass
+        self.show_mode_selection()
+        threading.Thread(target=_preload_export_modules, name="preload", daemon=True).start()
 
     def _load_branding_assets(self):
         """Load logo image in different sizes and set the window icon if possible."""
@@ -376,16 +248,13 @@ class PrintCalculatorApp:
 
         # --- Logo images for splash / menu ---
         try:
-            logo_path = get_asset_path("FabriCost_Logo.png")
-            img = Image.open(logo_path).convert("RGBA")
-
             # Large logo for splash / menu
-            self.logo_large = ImageTk.PhotoImage(img.resize((160, 160), Image.LANCZOS))
+            self.logo_large = self._scaled_logo(LOGO_LARGE_SIZE)
             # Small logo (kept for possible future use)
-            self.logo_small = ImageTk.PhotoImage(img.resize((36, 36), Image.LANCZOS))
+            self.logo_small = self._scaled_logo(LOGO_SMALL_SIZE)
 
             # Fallback icon via iconphoto (in case .ico was not available)
-            self._icon_image = tk.PhotoImage(file=str(logo_path))
+            self._icon_image = self._scaled_logo(ICON_SIZE)
             try:
                 self.root.iconphoto(True, self._icon_image)
             except Exception:
@@ -396,13 +265,44 @@ class PrintCalculatorApp:
             self.logo_small = None
             self._icon_image = None
 
+    def _scaled_logo(self, size):
+        """
+        The logo as a `size` px PhotoImage: the PNG pre-scaled at build time
+        (Tk reads it directly), or a Pillow resize of the full-size logo when
+        running from a tree where create_icon.py has not been run.
+        """
+        scaled_path = get_asset_path(f"FabriCost_Logo_{size}.png")
+        if scaled_path.exists():
+            return tk.PhotoImage(file=str(scaled_path))
+        from PIL import Image, ImageTk
+
+        with Image.open(get_asset_path("FabriCost_Logo.png")) as img:
+            return ImageTk.PhotoImage(img.convert("RGBA").resize((size, size), Image.LANCZOS))
+
     def t(self, key, **kwargs):
         lang = self.lang_var.get() if hasattr(self, "lang_var") else "fr"
-        text = I18N.get(lang, I18N["fr"]).get(key, I18N["en"].get(key, key))
-        try:
-            return text.format(**kwargs)
-        except Exception:
-            return text
+        return translate(lang, key, **kwargs)
+
+    def tr(self, widget, key, slot="text", setter=_set_text, **kwargs):
+        """
+        Show the translation of `key` on `widget` and keep it translated:
+        `apply_language` re-applies it on every language switch. Registering
+        the same widget and slot again (e.g. another key) replaces the entry.
+        """
+        setter(widget, self.t(key, **kwargs))
+        self._translated[(str(widget), slot)] = (widget, key, kwargs, setter)
+        return widget
+
+    def _clear_main_container(self):
+        """Destroy the current screen and forget the translations of its widgets."""
+        for child in self.main_container.winfo_children():
+            child.destroy()
+        self._prune_translated()
+
+    def _prune_translated(self):
+        self._translated = {
+            entry: value for entry, value in self._translated.items() if value[0].winfo_exists()
+        }
 
     def set_language(self, lang_code):
         if lang_code not in I18N:
@@ -414,30 +314,43 @@ class PrintCalculatorApp:
         self.apply_language()
 
     def apply_language(self):
-        """Rebuild UI using the currently selected language."""
-        self.root.title(self.t("app_title"))
-
-        # If we are not in a calculator yet (splash / menu), nothing to rebuild.
+        """
+        Re-translate the UI in place: registered widget texts, the pieces
+        rows and the result cards in view. Nothing is rebuilt, so entries,
+        selection, scroll positions and the shown page are kept.
+        """
+        self.lang_display_var.set(LANG_DISPLAY.get(self.lang_var.get(), "Français"))
+        stale = []
+        for entry, (widget, key, kwargs, setter) in self._translated.items():
+            try:
+                setter(widget, self.t(key, **kwargs))
+            except tk.TclError:
+                # Destroyed with its window (history, previous screen).
+                stale.append(entry)
+        for entry in stale:
+            del self._translated[entry]
+
+        # Splash / menu have no pieces or results.
         if self.mode not in ("3d", "laser"):
             return
 
-        previous_page = self.current_page
-        had_results = any(p.get("result") for p in self.pieces)
-
-        # Rebuild calculator widgets so we don't have to update every label manually.
-        self.create_ui()
-        self.update_pieces_list()
-
-        if previous_page == "results" and had_results:
-            self.calculate_and_show_results()
-        else:
-            self.show_page("input")
+        self._retranslate_piece_rows()
+        if self.results_rules is not None:
+            self._update_summary()
+            # Cards off screen are drawn in the new language when they scroll into view.
+            self._invalidate_result_cards()
+            self._render_visible_cards()
 
     def reset_calculator_state(self):
         """Reset state when switching between 3D and Laser calculators."""
         self.pieces = []
         self.editing_piece = None
-        self.result_cards = []
+        self.results_rules = None
+        self.dirty_pieces = {}
+        self.totals = {'final_price': 0.0, 'total_hours': 0.0}
+        self.customer_var.set("")
+        self.notes_var.set("")
+        self._quote_ref = {"id": None}
         self.summary_var.set("")
         self.current_page = "input"
 
@@ -445,6 +358,8 @@ class PrintCalculatorApp:
         """Persist language and current calculator rules into the settings DB."""
         # Always store current language
         self.settings["language"] = self.lang_var.get()
+        self.settings["simulate_gcode"] = bool(self.simulate_gcode.get())
+        self.settings["laser_material"] = self.laser_material.get()
 
         # Update defaults from the currently active calculator UI
         if self.mode == "3d":
@@ -467,7 +382,13 @@ class PrintCalculatorApp:
         self.settings["laser_normal_hour_price"] = self.default_laser_rules["normal_hour_price"]
         self.settings["laser_markup_percent"] = self.default_laser_rules["markup_percent"]
 
-        save_settings(self.settings)
+        # Only the changed keys are written, off the UI thread, once Tk is idle.
+        if self._settings_flush_job is None:
+            self._settings_flush_job = self.root.after_idle(self._flush_settings)
+
+    def _flush_settings(self):
+        self._settings_flush_job = None
+        self.settings.flush_async()
 
     def restore_defaults(self):
         """Reset pricing rules to factory defaults for the current calculator mode."""
@@ -496,8 +417,7 @@ class PrintCalculatorApp:
 
     def show_splash_screen(self):
         """Initial splash screen with branding."""
-        for child in self.main_container.winfo_children():
-            child.destroy()
+        self._clear_main_container()
 
         self.mode = None
         self.current_page = None
@@ -513,31 +433,25 @@ class PrintCalculatorApp:
         else:
             title_y = 0.5
 
-        title = tk.Label(
+        title = self.tr(tk.Label(
             splash,
-            text=self.t("app_title"),
             font=("Helvetica", 32, "bold"),
             bg="#111827",
             fg="white",
-        )
+        ), "app_title")
         title.place(relx=0.5, rely=title_y, anchor="center")
 
-        subtitle = tk.Label(
+        subtitle = self.tr(tk.Label(
             splash,
-            text=self.t("brand_tagline"),
             font=("Helvetica", 16),
             bg="#111827",
             fg="#e5e7eb",
-        )
+        ), "brand_tagline")
         subtitle.place(relx=0.5, rely=title_y + 0.08, anchor="center")
 
-        # After a short delay, move to the mode selection screen.
-        self.root.after(1500, self.show_mode_selection)
-
     def show_mode_selection(self):
         """Second screen with buttons to choose 3D or Laser calculator."""
-        for child in self.main_container.winfo_children():
-            child.destroy()
+        self._clear_main_container()
 
         self.current_page = None
 
@@ -555,22 +469,20 @@ class PrintCalculatorApp:
             logo_label = tk.Label(brand_frame, image=self.logo_large, bg="white")
             logo_label.pack()
 
-        title = tk.Label(
+        title = self.tr(tk.Label(
             brand_frame,
-            text=self.t("app_title"),
             font=("Helvetica", 24, "bold"),
             bg="white",
             fg="#111827",
-        )
+        ), "app_title")
         title.pack(pady=(10, 0))
 
-        tagline = tk.Label(
+        tagline = self.tr(tk.Label(
             brand_frame,
-            text=self.t("brand_tagline"),
             font=("Helvetica", 11),
             bg="white",
             fg="#6b7280",
-        )
+        ), "brand_tagline")
         tagline.pack()
 
         subtitle = tk.Label(
@@ -614,9 +526,8 @@ class PrintCalculatorApp:
         btn_laser.pack(fill=tk.X)
 
         # About button (shows author / app info)
-        about_btn = tk.Button(
+        about_btn = self.tr(tk.Button(
             card,
-            text=self.t("about_title"),
             command=self.show_about,
             bg="#e5e7eb",
             fg="#111827",
@@ -625,7 +536,7 @@ class PrintCalculatorApp:
             padx=16,
             pady=6,
             cursor="hand2",
-        )
+        ), "about_title")
         about_btn.pack(pady=(0, 20))
 
     def show_about(self):
@@ -660,8 +571,7 @@ class PrintCalculatorApp:
 
     def create_ui(self):
         # Clear anything currently shown (e.g., splash/menu or previous calculator)
-        for child in self.main_container.winfo_children():
-            child.destroy()
+        self._clear_main_container()
 
         # Create both pages
         self.create_input_page()
@@ -679,9 +589,8 @@ class PrintCalculatorApp:
         header_frame.pack_propagate(False)
 
         # Button to go back to main menu (mode selection)
-        menu_btn = tk.Button(
+        menu_btn = self.tr(tk.Button(
             header_frame,
-            text=self.t("menu"),
             command=self.back_to_menu,
             bg="#6366f1",
             fg="white",
@@ -690,25 +599,38 @@ class PrintCalculatorApp:
             padx=20,
             pady=8,
             cursor="hand2",
-        )
-        menu_btn.pack(side=tk.LEFT, padx=20, pady=20)
+        ), "menu")
+        menu_btn.pack(side=tk.LEFT, padx=(20, 5), pady=20)
+
+        history_btn = self.tr(tk.Button(
+            header_frame,
+            command=self.show_history,
+            bg="#6366f1",
+            fg="white",
+            font=("Helvetica", 11, "bold"),
+            relief=tk.FLAT,
+            padx=20,
+            pady=8,
+            cursor="hand2",
+        ), "history")
+        history_btn.pack(side=tk.LEFT, padx=5, pady=20)
 
-        title = tk.Label(
+        title = self.tr(tk.Label(
             header_frame,
-            text=self.t("input_title"),
             font=("Helvetica", 24, "bold"),
             bg="#4f46e5",
             fg="white",
-        )
+        ), "input_title")
         title.place(relx=0.5, rely=0.5, anchor="center")
 
         lang_frame = tk.Frame(header_frame, bg="#4f46e5")
         lang_frame.pack(side=tk.RIGHT, padx=20, pady=20)
-        tk.Label(lang_frame, text=self.t("language"), bg="#4f46e5", fg="white", font=("Helvetica", 11, "bold")).pack(
+        self.tr(tk.Label(lang_frame, bg="#4f46e5", fg="white", font=("Helvetica", 11, "bold")), "language").pack(
             side=tk.LEFT, padx=(0, 8)
         )
-        lang_combo = ttk.Combobox(lang_frame, state="readonly", width=10, values=list(LANG_CODE.keys()))
-        lang_combo.set(LANG_DISPLAY.get(self.lang_var.get(), "Français"))
+        lang_combo = ttk.Combobox(
+            lang_frame, state="readonly", width=10, values=list(LANG_CODE.keys()), textvariable=self.lang_display_var
+        )
         lang_combo.bind("<<ComboboxSelected>>", lambda e: self.set_language(LANG_CODE.get(lang_combo.get(), "fr")))
         lang_combo.pack(side=tk.LEFT)
         
@@ -720,8 +642,7 @@ class PrintCalculatorApp:
         left_frame = tk.Frame(content_frame, bg="white", relief=tk.RAISED, bd=1)
         left_frame.pack(side=tk.LEFT, fill=tk.BOTH, padx=(0, 20), expand=True)
         
-        rules_label = tk.Label(left_frame, text=self.t("rules_title"), 
-                              font=("Helvetica", 18, "bold"), bg="white", fg="#1f2937")
+        rules_label = self.tr(tk.Label(left_frame, font=("Helvetica", 18, "bold"), bg="white", fg="#1f2937"), "rules_title")
         rules_label.pack(pady=(30, 20), padx=30, anchor=tk.W)
         
         rules_frame = tk.Frame(left_frame, bg="white")
@@ -729,12 +650,11 @@ class PrintCalculatorApp:
 
         if self.mode == "laser":
             # Laser mode: only hourly price and margin, both editable (defaults set when mode starts).
-            tk.Label(
+            self.tr(tk.Label(
                 rules_frame,
-                text=self.t("rule_normal_hour"),
                 font=("Helvetica", 12),
                 bg="white",
-            ).grid(row=0, column=0, sticky=tk.W, pady=10)
+            ), "rule_normal_hour").grid(row=0, column=0, sticky=tk.W, pady=10)
             hour_entry = tk.Entry(
                 rules_frame,
                 textvariable=self.normal_hour_price,
@@ -743,12 +663,11 @@ class PrintCalculatorApp:
             )
             hour_entry.grid(row=0, column=1, pady=10, padx=(15, 0))
 
-            tk.Label(
+            self.tr(tk.Label(
                 rules_frame,
-                text=self.t("rule_markup"),
                 font=("Helvetica", 12),
                 bg="white",
-            ).grid(row=1, column=0, sticky=tk.W, pady=10)
+            ), "rule_markup").grid(row=1, column=0, sticky=tk.W, pady=10)
             markup_entry = tk.Entry(
                 rules_frame,
                 textvariable=self.markup_percent,
@@ -758,19 +677,18 @@ class PrintCalculatorApp:
             markup_entry.grid(row=1, column=1, pady=10, padx=(15, 0))
         else:
             # 3D mode: full pricing rules.
-            self.create_rule_input(rules_frame, self.t("rule_gram_price"), self.gram_price, 0)
-            self.create_rule_input(rules_frame, self.t("rule_normal_hour"), self.normal_hour_price, 1)
-            self.create_rule_input(rules_frame, self.t("rule_exceed_hour"), self.exceed_hour_price, 2)
-            self.create_rule_input(rules_frame, self.t("rule_threshold"), self.exceed_threshold, 3)
-            self.create_rule_input(rules_frame, self.t("rule_markup"), self.markup_percent, 4)
+            self.create_rule_input(rules_frame, "rule_gram_price", self.gram_price, 0)
+            self.create_rule_input(rules_frame, "rule_normal_hour", self.normal_hour_price, 1)
+            self.create_rule_input(rules_frame, "rule_exceed_hour", self.exceed_hour_price, 2)
+            self.create_rule_input(rules_frame, "rule_threshold", self.exceed_threshold, 3)
+            self.create_rule_input(rules_frame, "rule_markup", self.markup_percent, 4)
 
         # Rules actions (e.g. restore defaults)
         actions_frame = tk.Frame(left_frame, bg="white")
         actions_frame.pack(fill=tk.X, padx=30, pady=(0, 10))
 
-        restore_btn = tk.Button(
+        restore_btn = self.tr(tk.Button(
             actions_frame,
-            text=self.t("restore_defaults"),
             command=self.restore_defaults,
             bg="#e5e7eb",
             fg="#111827",
@@ -779,15 +697,14 @@ class PrintCalculatorApp:
             padx=10,
             pady=6,
             cursor="hand2",
-        )
+        ), "restore_defaults")
         restore_btn.pack(anchor=tk.W)
 
         # Add Piece Section
         separator = tk.Frame(left_frame, height=2, bg="#e5e7eb")
         separator.pack(fill=tk.X, padx=30, pady=30)
         
-        add_label = tk.Label(left_frame, text=self.t("add_piece_section"), 
-                            font=("Helvetica", 18, "bold"), bg="white", fg="#1f2937")
+        add_label = self.tr(tk.Label(left_frame, font=("Helvetica", 18, "bold"), bg="white", fg="#1f2937"), "add_piece_section")
         add_label.pack(pady=(10, 20), padx=30, anchor=tk.W)
         
         add_frame = tk.Frame(left_frame, bg="white")
@@ -796,7 +713,7 @@ class PrintCalculatorApp:
         # Build piece inputs; in laser mode we hide grams entirely.
         row_idx = 0
         if self.mode != "laser":
-            tk.Label(add_frame, text=self.t("grams"), font=("Helvetica", 12), bg="white").grid(
+            self.tr(tk.Label(add_frame, font=("Helvetica", 12), bg="white"), "grams").grid(
                 row=row_idx, column=0, sticky=tk.W, pady=8
             )
             self.gram_entry = tk.Entry(add_frame, font=("Helvetica", 12), width=25)
@@ -805,23 +722,22 @@ class PrintCalculatorApp:
         else:
             self.gram_entry = None
 
-        tk.Label(add_frame, text=self.t("hours"), font=("Helvetica", 12), bg="white").grid(
+        self.tr(tk.Label(add_frame, font=("Helvetica", 12), bg="white"), "hours").grid(
             row=row_idx, column=0, sticky=tk.W, pady=8
         )
         self.hours_entry = tk.Entry(add_frame, font=("Helvetica", 12), width=25)
         self.hours_entry.grid(row=row_idx, column=1, pady=8, padx=(15, 0))
         row_idx += 1
 
-        tk.Label(add_frame, text=self.t("minutes"), font=("Helvetica", 12), bg="white").grid(
+        self.tr(tk.Label(add_frame, font=("Helvetica", 12), bg="white"), "minutes").grid(
             row=row_idx, column=0, sticky=tk.W, pady=8
         )
         self.minutes_entry = tk.Entry(add_frame, font=("Helvetica", 12), width=25)
         self.minutes_entry.grid(row=row_idx, column=1, pady=8, padx=(15, 0))
         row_idx += 1
 
-        self.add_piece_btn = tk.Button(
+        self.add_piece_btn = self.tr(tk.Button(
             add_frame,
-            text=self.t("add_piece"),
             command=self.add_or_update_piece,
             bg="#10b981",
             fg="white",
@@ -832,43 +748,147 @@ class PrintCalculatorApp:
             padx=30,
             pady=12,
             cursor="hand2",
-        )
+        ), "add_piece")
         self.add_piece_btn.grid(row=row_idx, column=0, columnspan=2, pady=20)
+        row_idx += 1
+
+        # Import pieces from files (G-code, ...) when the mode supports it.
+        if self._file_importers():
+            import_btn = self.tr(tk.Button(
+                add_frame,
+                command=self.import_files,
+                bg="#e5e7eb",
+                fg="#111827",
+                font=("Helvetica", 10, "bold"),
+                relief=tk.FLAT,
+                padx=10,
+                pady=6,
+                cursor="hand2",
+            ), "import_files")
+            import_btn.grid(row=row_idx, column=0, columnspan=2, pady=(0, 10))
+            row_idx += 1
+
+            if self.mode != "laser":
+                self.tr(tk.Checkbutton(
+                    add_frame,
+                    variable=self.simulate_gcode,
+                    font=("Helvetica", 10),
+                    bg="white",
+                    activebackground="white",
+                ), "simulate_gcode").grid(row=row_idx, column=0, columnspan=2, pady=(0, 10))
+            else:
+                self.tr(tk.Label(add_frame, font=("Helvetica", 10), bg="white"), "laser_material").grid(
+                    row=row_idx, column=0, sticky=tk.W, pady=(0, 10)
+                )
+                material_combo = ttk.Combobox(
+                    add_frame,
+                    state="readonly",
+                    width=22,
+                    textvariable=self.laser_material,
+                    values=list(laser_materials(self.settings)),
+                )
+                material_combo.grid(row=row_idx, column=1, sticky=tk.W, pady=(0, 10), padx=(15, 0))
         
         # Right side - Pieces list
         right_frame = tk.Frame(content_frame, bg="white", relief=tk.RAISED, bd=1)
         right_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
         
-        pieces_label = tk.Label(right_frame, text=self.t("added_pieces"), 
-                               font=("Helvetica", 18, "bold"), bg="white", fg="#1f2937")
+        pieces_label = self.tr(tk.Label(right_frame, font=("Helvetica", 18, "bold"), bg="white", fg="#1f2937"), "added_pieces")
         pieces_label.pack(pady=(30, 20), padx=30, anchor=tk.W)
         
-        # Scrollable list
+        # Edit / delete act on the selected row (double-click edits, Delete key deletes).
+        list_actions = tk.Frame(right_frame, bg="white")
+
+        # Scrollable list: a Treeview only draws the rows in view, so thousands of pieces stay cheap.
         list_container = tk.Frame(right_frame, bg="white")
-        list_container.pack(fill=tk.BOTH, expand=True, padx=30, pady=(0, 20))
-        
-        self.pieces_canvas = tk.Canvas(list_container, bg="white", highlightthickness=0)
-        pieces_scrollbar = tk.Scrollbar(list_container, orient="vertical", command=self.pieces_canvas.yview)
-        self.pieces_list_frame = tk.Frame(self.pieces_canvas, bg="white")
-        
-        self.pieces_list_frame.bind(
-            "<Configure>",
-            lambda e: self.pieces_canvas.configure(scrollregion=self.pieces_canvas.bbox("all"))
+        list_container.pack(fill=tk.BOTH, expand=True, padx=30, pady=(0, 10))
+        list_actions.pack(fill=tk.X, padx=30, pady=(0, 10))
+
+        style = ttk.Style(self.root)
+        style.configure("Pieces.Treeview", font=("Helvetica", 11), rowheight=30, background="#f9fafb",
+                        fieldbackground="white", foreground="#1f2937")
+        style.configure("Pieces.Treeview.Heading", font=("Helvetica", 10, "bold"))
+
+        columns = ("piece", "weight", "time")
+        self.pieces_tree = ttk.Treeview(
+            list_container,
+            columns=columns,
+            displaycolumns=("piece", "time") if self.mode == "laser" else columns,
+            show="headings",
+            selectmode="browse",
+            style="Pieces.Treeview",
         )
-        
-        self.pieces_canvas.create_window((0, 0), window=self.pieces_list_frame, anchor="nw")
-        self.pieces_canvas.configure(yscrollcommand=pieces_scrollbar.set)
-        
-        self.pieces_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        for column in columns:
+            self.pieces_tree.heading(column, anchor=tk.W)
+            self.tr(self.pieces_tree, column, slot=column, setter=_heading_setter(column))
+            self.pieces_tree.column(column, anchor=tk.W, width=120, stretch=True)
+        pieces_scrollbar = ttk.Scrollbar(list_container, orient="vertical", command=self.pieces_tree.yview)
+        self.pieces_tree.configure(yscrollcommand=pieces_scrollbar.set)
+
+        self.pieces_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         pieces_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
+        self.pieces_tree.bind("<Double-1>", self.edit_selected_piece)
+        self.pieces_tree.bind("<Return>", self.edit_selected_piece)
+        self.pieces_tree.bind("<Delete>", self.delete_selected_piece)
+
+        self.no_pieces_label = self.tr(tk.Label(list_container, font=("Helvetica", 12), bg="white", fg="#9ca3af"), "no_pieces")
+
+        delete_btn = tk.Button(
+            list_actions,
+            text="Delete",
+            command=self.delete_selected_piece,
+            bg="#ef4444",
+            activebackground="#dc2626",
+            fg="white",
+            activeforeground="white",
+            font=("Helvetica", 10, "bold"),
+            relief=tk.FLAT,
+            padx=8,
+            pady=2,
+            cursor="hand2",
+        )
+        delete_btn.pack(side=tk.RIGHT, padx=(8, 0))
+
+        edit_btn = tk.Button(
+            list_actions,
+            text="Edit",
+            command=self.edit_selected_piece,
+            bg="#3b82f6",
+            activebackground="#2563eb",
+            fg="white",
+            activeforeground="white",
+            font=("Helvetica", 10, "bold"),
+            relief=tk.FLAT,
+            padx=8,
+            pady=2,
+            cursor="hand2",
+        )
+        edit_btn.pack(side=tk.RIGHT)
+
+        # Customer and notes are stored with the quote in the history.
+        quote_frame = tk.Frame(right_frame, bg="white")
+        quote_frame.pack(fill=tk.X, padx=30, pady=(0, 10))
+        quote_frame.grid_columnconfigure(1, weight=1)
+        self.tr(tk.Label(quote_frame, font=("Helvetica", 11), bg="white"), "customer").grid(
+            row=0, column=0, sticky=tk.W, pady=4
+        )
+        tk.Entry(quote_frame, textvariable=self.customer_var, font=("Helvetica", 11)).grid(
+            row=0, column=1, sticky="ew", pady=4, padx=(15, 0)
+        )
+        self.tr(tk.Label(quote_frame, font=("Helvetica", 11), bg="white"), "notes").grid(
+            row=1, column=0, sticky=tk.W, pady=4
+        )
+        tk.Entry(quote_frame, textvariable=self.notes_var, font=("Helvetica", 11)).grid(
+            row=1, column=1, sticky="ew", pady=4, padx=(15, 0)
+        )
+
         # Calculate button at bottom
         calc_frame = tk.Frame(right_frame, bg="white")
         calc_frame.pack(fill=tk.X, padx=30, pady=(0, 30))
         
-        calc_btn = tk.Button(calc_frame, text=self.t("calculate_all"), command=self.calculate_and_show_results,
+        calc_btn = self.tr(tk.Button(calc_frame, command=self.calculate_and_show_results,
                             bg="#4f46e5", fg="white", font=("Helvetica", 14, "bold"),
-                            relief=tk.FLAT, padx=40, pady=15, cursor="hand2")
+                            relief=tk.FLAT, padx=40, pady=15, cursor="hand2"), "calculate_all")
         calc_btn.pack(fill=tk.X)
         
     def create_results_page(self):
@@ -880,9 +900,8 @@ class PrintCalculatorApp:
         header_frame.pack_propagate(False)
 
         # Button to go back to main menu (mode selection)
-        menu_btn = tk.Button(
+        menu_btn = self.tr(tk.Button(
             header_frame,
-            text=self.t("menu"),
             command=self.back_to_menu,
             bg="#6366f1",
             fg="white",
@@ -891,16 +910,15 @@ class PrintCalculatorApp:
             padx=20,
             pady=8,
             cursor="hand2",
-        )
+        ), "menu")
         menu_btn.pack(side=tk.LEFT, padx=(20, 5), pady=20)
 
-        back_btn = tk.Button(header_frame, text=self.t("back"), command=lambda: self.show_page("input"),
+        back_btn = self.tr(tk.Button(header_frame, command=lambda: self.show_page("input"),
                             bg="#6366f1", fg="white", font=("Helvetica", 11, "bold"),
-                            relief=tk.FLAT, padx=20, pady=8, cursor="hand2")
+                            relief=tk.FLAT, padx=20, pady=8, cursor="hand2"), "back")
         back_btn.pack(side=tk.LEFT, padx=5, pady=20)
         
-        title = tk.Label(header_frame, text=self.t("results_title"), 
-                        font=("Helvetica", 24, "bold"), bg="#4f46e5", fg="white")
+        title = self.tr(tk.Label(header_frame, font=("Helvetica", 24, "bold"), bg="#4f46e5", fg="white"), "results_title")
         title.pack(side=tk.LEFT, padx=20, pady=20)
 
         summary_label = tk.Label(
@@ -915,11 +933,12 @@ class PrintCalculatorApp:
 
         lang_frame = tk.Frame(header_frame, bg="#4f46e5")
         lang_frame.pack(side=tk.RIGHT, padx=15, pady=20)
-        tk.Label(lang_frame, text=self.t("language"), bg="#4f46e5", fg="white", font=("Helvetica", 11, "bold")).pack(
+        self.tr(tk.Label(lang_frame, bg="#4f46e5", fg="white", font=("Helvetica", 11, "bold")), "language").pack(
             side=tk.LEFT, padx=(0, 8)
         )
-        lang_combo = ttk.Combobox(lang_frame, state="readonly", width=10, values=list(LANG_CODE.keys()))
-        lang_combo.set(LANG_DISPLAY.get(self.lang_var.get(), "Français"))
+        lang_combo = ttk.Combobox(
+            lang_frame, state="readonly", width=10, values=list(LANG_CODE.keys()), textvariable=self.lang_display_var
+        )
         lang_combo.bind("<<ComboboxSelected>>", lambda e: self.set_language(LANG_CODE.get(lang_combo.get(), "fr")))
         lang_combo.pack(side=tk.LEFT)
         
@@ -931,34 +950,36 @@ class PrintCalculatorApp:
         action_frame = tk.Frame(content_frame, bg="#f0f4f8")
         action_frame.pack(fill=tk.X, pady=(0, 20))
         
-        pdf_detailed_btn = tk.Button(action_frame, text=self.t("pdf_detailed"), command=self.generate_detailed_pdf,
+        pdf_detailed_btn = self.tr(tk.Button(action_frame, command=self.generate_detailed_pdf,
                            bg="#8b5cf6", fg="white", font=("Helvetica", 12, "bold"),
-                           relief=tk.FLAT, padx=30, pady=12, cursor="hand2")
+                           relief=tk.FLAT, padx=30, pady=12, cursor="hand2"), "pdf_detailed")
         pdf_detailed_btn.pack(side=tk.LEFT, padx=5)
         
-        pdf_simple_btn = tk.Button(action_frame, text=self.t("pdf_simple"), command=self.generate_simple_pdf,
+        pdf_simple_btn = self.tr(tk.Button(action_frame, command=self.generate_simple_pdf,
                            bg="#06b6d4", fg="white", font=("Helvetica", 12, "bold"),
-                           relief=tk.FLAT, padx=30, pady=12, cursor="hand2")
+                           relief=tk.FLAT, padx=30, pady=12, cursor="hand2"), "pdf_simple")
         pdf_simple_btn.pack(side=tk.LEFT, padx=5)
+
+        receipts_btn = self.tr(tk.Button(action_frame, command=self.generate_all_receipts,
+                           bg="#3b82f6", fg="white", font=("Helvetica", 12, "bold"),
+                           relief=tk.FLAT, padx=30, pady=12, cursor="hand2"), "receipts_all")
+        receipts_btn.pack(side=tk.LEFT, padx=5)
         
         # Results area
         results_container = tk.Frame(content_frame, bg="#f0f4f8")
         results_container.pack(fill=tk.BOTH, expand=True)
         
+        # Cards are drawn as canvas items; only the ones in view exist and they are recycled on scroll.
         self.results_canvas = tk.Canvas(results_container, bg="#f0f4f8", highlightthickness=0)
-        results_scrollbar = tk.Scrollbar(results_container, orient="vertical", command=self.results_canvas.yview)
-        self.results_scrollable_frame = tk.Frame(self.results_canvas, bg="#f0f4f8")
-        
-        self.results_scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.results_canvas.configure(scrollregion=self.results_canvas.bbox("all"))
-        )
-        
-        self.results_canvas.create_window((0, 0), window=self.results_scrollable_frame, anchor="nw")
-        self.results_canvas.configure(yscrollcommand=results_scrollbar.set)
-        
+        self.results_scrollbar = tk.Scrollbar(results_container, orient="vertical", command=self.results_canvas.yview)
+        self.results_canvas.configure(yscrollcommand=self._on_results_scroll)
+        self.card_button_font = tkfont.Font(family="Helvetica", size=10, weight="bold")
+        self.result_slots = []
+        self._result_cols = 0
+        self._result_width = 0
+
         self.results_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        results_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.results_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
         # Bind mousewheel
         self.results_canvas.bind_all("<MouseWheel>", self._on_mousewheel)
@@ -979,8 +1000,8 @@ class PrintCalculatorApp:
             self.results_page.pack(fill=tk.BOTH, expand=True)
             self.current_page = "results"
             
-    def create_rule_input(self, parent, label, variable, row):
-        tk.Label(parent, text=label, font=("Helvetica", 12), bg="white").grid(row=row, column=0, sticky=tk.W, pady=10)
+    def create_rule_input(self, parent, label_key, variable, row):
+        self.tr(tk.Label(parent, font=("Helvetica", 12), bg="white"), label_key).grid(row=row, column=0, sticky=tk.W, pady=10)
         entry = tk.Entry(parent, textvariable=variable, font=("Helvetica", 12), width=20)
         entry.grid(row=row, column=1, pady=10, padx=(15, 0))
         
@@ -1003,23 +1024,20 @@ class PrintCalculatorApp:
             minutes = float(minutes_text) if minutes_text else 0.0
 
             if self.editing_piece is None:
-                piece = {
-                    'id': len(self.pieces) + 1,
-                    'grams': grams,
-                    'hours': hours,
-                    'minutes': minutes,
-                    'result': None,
-                }
-                self.pieces.append(piece)
+                piece = self._add_piece(grams, hours, minutes)
+                self._insert_piece_rows([piece])
+                self.pieces_tree.see(self._piece_iid(piece))
             else:
                 # Update existing piece
-                self.editing_piece['grams'] = grams
-                self.editing_piece['hours'] = hours
-                self.editing_piece['minutes'] = minutes
-                self.editing_piece['result'] = None
+                piece = self.editing_piece
+                piece['grams'] = grams
+                piece['hours'] = hours
+                piece['minutes'] = minutes
+                self._mark_dirty(piece)
+                self._refresh_piece_row(piece)
 
                 self.editing_piece = None
-                self.add_piece_btn.configure(text=self.t("add_piece"), bg="#10b981", activebackground="#059669")
+                self.tr(self.add_piece_btn, "add_piece").configure(bg="#10b981", activebackground="#059669")
 
             # Clear entries
             if self.mode != "laser" and self.gram_entry is not None:
@@ -1027,11 +1045,100 @@ class PrintCalculatorApp:
             self.hours_entry.delete(0, tk.END)
             self.minutes_entry.delete(0, tk.END)
 
-            self.update_pieces_list()
-
         except ValueError:
             messagebox.showerror(self.t("error"), self.t("invalid_numbers"))
 
+    def _add_piece(self, grams, hours, minutes):
+        """Append a new piece; shared by manual entry and file imports."""
+        piece = {
+            'id': len(self.pieces) + 1,
+            'grams': grams,
+            'hours': hours,
+            'minutes': minutes,
+            'result': None,
+        }
+        self.pieces.append(piece)
+        self.dirty_pieces[id(piece)] = piece
+        return piece
+
+    def add_pieces(self, values):
+        """Append pieces from (grams, hours, minutes) tuples and list them; returns the new pieces."""
+        pieces = [self._add_piece(*piece) for piece in values]
+        if pieces:
+            self._insert_piece_rows(pieces)
+        return pieces
+
+    def _file_importers(self):
+        """Importers available in the current mode: file extension -> batch import function."""
+        importers = {}
+        if self.mode != "laser":
+            if self.simulate_gcode.get():
+                profile = PrinterProfile.from_dict(self.settings.get("printer_profile"))
+                gcode_importer = partial(simulate_gcode_files, profile=profile)
+            else:
+                gcode_importer = import_gcode_files
+            importers.update(dict.fromkeys(GCODE_EXTENSIONS, gcode_importer))
+            # Unsliced meshes: grams from volume, infill and density (quick quotes).
+            mesh_profile = MeshProfile.from_dict(self.settings.get("mesh_profile"))
+            importers.update(dict.fromkeys(MESH_EXTENSIONS, partial(import_mesh_files, profile=mesh_profile)))
+        else:
+            materials = laser_materials(self.settings)
+            material = materials.get(self.laser_material.get(), materials[DEFAULT_LASER_MATERIAL])
+            importers.update(dict.fromkeys(VECTOR_EXTENSIONS, partial(import_vector_files, profile=material)))
+            # Bitmaps are raster engravings: time from DPI, scan speed and the lines with dark pixels.
+            engrave_profile = EngraveProfile.from_dict(self.settings.get("engrave_profile"))
+            importers.update(dict.fromkeys(RASTER_EXTENSIONS, partial(import_raster_files, profile=engrave_profile)))
+        return importers
+
+    def import_files(self):
+        """Create pieces from slicer/CAD files instead of typing their values in."""
+        importers = self._file_importers()
+        patterns = " ".join(f"*{ext}" for ext in importers)
+        paths = filedialog.askopenfilenames(
+            filetypes=[(self.t("supported_files"), patterns), ("All files", "*.*")]
+        )
+        if not paths:
+            return
+
+        groups = {}
+        skipped = []
+        for path in paths:
+            importer = importers.get(Path(path).suffix.lower())
+            if importer is None:
+                skipped.append(f"{Path(path).name}: {self.t('unsupported_file')}")
+            else:
+                groups.setdefault(importer, []).append(path)
+
+        if not groups:
+            self._finish_import([], skipped, self.mode, self.pieces)
+            return
+        # Parsing (and G-code simulation on its own process pool) can take a while: keep it off the Tk thread.
+        self.jobs.submit(
+            _run_importers, groups, label=self.t("import_files"),
+            on_done=partial(self._finish_import, skipped=skipped, mode=self.mode, pieces=self.pieces),
+            on_error=self._show_job_error,
+        )
+
+    def _finish_import(self, outcomes, skipped, mode, pieces):
+        """Add the imported pieces (Tk thread) unless the user left this calculator meanwhile."""
+        if self.mode != mode or self.pieces is not pieces:
+            return
+        imported = []
+        for path, outcome in outcomes:
+            if isinstance(outcome, tuple):
+                imported.append(outcome)
+            else:
+                skipped.append(f"{Path(path).name}: {outcome}")
+
+        added = len(self.add_pieces(imported))
+        if skipped:
+            messagebox.showwarning(
+                self.t("warning"),
+                self.t("import_result", count=added) + "\n\n" + self.t("import_skipped", files="\n".join(skipped)),
+            )
+        else:
+            messagebox.showinfo(self.t("success"), self.t("import_result", count=added))
+
     def start_edit_piece(self, piece):
         """Load an existing piece into the inputs for editing."""
         self.editing_piece = piece
@@ -1043,7 +1150,7 @@ class PrintCalculatorApp:
             self.gram_entry.insert(0, str(piece['grams']))
         self.hours_entry.insert(0, str(piece['hours']))
         self.minutes_entry.insert(0, str(piece['minutes']))
-        self.add_piece_btn.configure(text=self.t("update_piece", id=piece['id']), bg="#f59e0b", activebackground="#d97706")
+        self.tr(self.add_piece_btn, "update_piece", id=piece['id']).configure(bg="#f59e0b", activebackground="#d97706")
 
     def _format_time_h_min(self, total_hours):
         """Format decimal hours as `50h8min`."""
@@ -1051,81 +1158,347 @@ class PrintCalculatorApp:
         h, m = divmod(total_minutes, 60)
         return f"{h}h{m}min"
             
-    def update_pieces_list(self):
-        # Clear existing list
-        for widget in self.pieces_list_frame.winfo_children():
-            widget.destroy()
-            
+    def _piece_iid(self, piece):
+        """Treeview item id of a piece (stable while the piece exists, unlike its number)."""
+        return f"p{id(piece)}"
+
+    def _piece_row_values(self, piece):
+        return (
+            f"{self.t('piece')} {piece['id']}",
+            f"{piece['grams']}g",
+            f"{piece['hours']}h {piece['minutes']}min",
+        )
+
+    def _update_empty_hint(self):
+        if self.pieces:
+            self.no_pieces_label.place_forget()
+        else:
+            self.no_pieces_label.place(relx=0.5, y=60, anchor="n")
+
+    def _insert_piece_rows(self, pieces):
+        """Append rows for newly added pieces without touching the existing ones."""
+        tree = self.pieces_tree
+        for piece in pieces:
+            tree.insert("", tk.END, iid=self._piece_iid(piece), values=self._piece_row_values(piece))
+        self._update_empty_hint()
+
+    def _refresh_piece_row(self, piece):
+        self.pieces_tree.item(self._piece_iid(piece), values=self._piece_row_values(piece))
+
+    def _retranslate_piece_rows(self):
+        """Re-label the rows in view now and the others in chunks from the Tk loop."""
+        if self._row_refresh_job is not None:
+            self.root.after_cancel(self._row_refresh_job)
+            self._row_refresh_job = None
         if not self.pieces:
-            no_pieces_label = tk.Label(self.pieces_list_frame, text=self.t("no_pieces"), 
-                                       font=("Helvetica", 12), bg="white", fg="#9ca3af")
-            no_pieces_label.pack(pady=20)
             return
-            
-        for piece in self.pieces:
-            piece_frame = tk.Frame(self.pieces_list_frame, bg="#f9fafb", relief=tk.FLAT, bd=1)
-            piece_frame.pack(fill=tk.X, pady=5, padx=5)
-            
-            info_frame = tk.Frame(piece_frame, bg="#f9fafb")
-            info_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=15, pady=10)
-            
-            tk.Label(info_frame, text=f"{self.t('piece')} {piece['id']}", font=("Helvetica", 11, "bold"),
-                    bg="#f9fafb", fg="#1f2937").pack(anchor=tk.W)
-            if self.mode == "laser":
-                summary_text = f"{piece['hours']}h {piece['minutes']}min"
-            else:
-                summary_text = f"{piece['grams']}g | {piece['hours']}h {piece['minutes']}min"
-            tk.Label(
-                info_frame,
-                text=summary_text,
-                font=("Helvetica", 10),
-                bg="#f9fafb",
-                fg="#6b7280",
-            ).pack(anchor=tk.W)
-
-            edit_btn = tk.Button(
-                piece_frame,
-                text="Edit",
-                command=lambda p=piece: self.start_edit_piece(p),
-                bg="#3b82f6",
-                activebackground="#2563eb",
-                fg="white",
-                activeforeground="white",
-                font=("Helvetica", 10, "bold"),
-                relief=tk.FLAT,
-                padx=8,
-                pady=2,
-                cursor="hand2",
-            )
-            edit_btn.pack(side=tk.RIGHT, padx=(0, 8))
-            
-            delete_btn = tk.Button(
-                piece_frame,
-                text="Delete",
-                command=lambda p=piece: self.delete_piece(p),
-                bg="#ef4444",
-                activebackground="#dc2626",
-                fg="white",
-                activeforeground="white",
-                font=("Helvetica", 10, "bold"),
-                relief=tk.FLAT,
-                padx=8,
-                pady=2,
-                cursor="hand2",
-            )
-            delete_btn.pack(side=tk.RIGHT, padx=10)
-            
+        first, last = self.pieces_tree.yview()
+        count = len(self.pieces)
+        start = int(first * count)
+        for piece in self.pieces[start:min(count, int(last * count) + 1)]:
+            self._refresh_piece_row(piece)
+        self._row_refresh_job = self.root.after(1, self._refresh_piece_rows, 0)
+
+    def _refresh_piece_rows(self, start):
+        self._row_refresh_job = None
+        pieces = self.pieces[start:start + ROW_REFRESH_CHUNK]
+        for piece in pieces:
+            self._refresh_piece_row(piece)
+        if start + ROW_REFRESH_CHUNK < len(self.pieces):
+            self._row_refresh_job = self.root.after(1, self._refresh_piece_rows, start + ROW_REFRESH_CHUNK)
+
+    def update_pieces_list(self):
+        """Rebuild every row (new page); single changes use the row helpers above."""
+        self.pieces_tree.delete(*self.pieces_tree.get_children())
+        self._insert_piece_rows(self.pieces)
+
+    def _selected_piece(self):
+        selection = self.pieces_tree.selection()
+        if not selection:
+            return None
+        # Rows are kept in the same order as self.pieces.
+        return self.pieces[self.pieces_tree.index(selection[0])]
+
+    def edit_selected_piece(self, event=None):
+        piece = self._selected_piece()
+        if piece is not None:
+            self.start_edit_piece(piece)
+
+    def delete_selected_piece(self, event=None):
+        piece = self._selected_piece()
+        if piece is not None:
+            self.delete_piece(piece)
+
     def delete_piece(self, piece):
         if messagebox.askyesno(self.t("confirm"), self.t("confirm_delete", id=piece['id'])):
             if self.editing_piece is piece:
                 self.editing_piece = None
-                self.add_piece_btn.configure(text=self.t("add_piece"), bg="#10b981", activebackground="#059669")
-            self.pieces.remove(piece)
-            # Renumber pieces
-            for i, p in enumerate(self.pieces):
-                p['id'] = i + 1
-            self.update_pieces_list()
+                self.tr(self.add_piece_btn, "add_piece").configure(bg="#10b981", activebackground="#059669")
+            index = self.pieces.index(piece)
+            del self.pieces[index]
+            self._mark_dirty(piece)
+            del self.dirty_pieces[id(piece)]
+            self.pieces_tree.delete(self._piece_iid(piece))
+            # Renumber the pieces that followed it
+            for i in range(index, len(self.pieces)):
+                self.pieces[i]['id'] = i + 1
+                self._refresh_piece_row(self.pieces[i])
+            self._update_empty_hint()
             
+    def _quote_history(self):
+        """Open the quote history DB on first use."""
+        if self.history is None:
+            self.history = QuoteHistory()
+        return self.history
+
+    def _save_quote(self):
+        """Record the calculated quote (re-calculating a saved or reopened quote updates it in place)."""
+        # Snapshot on the Tk thread; the write happens on the serial job thread.
+        self.jobs.submit(
+            self._write_quote, self._quote_ref, self.mode, self.results_rules, self._export_pieces(),
+            self.customer_var.get(), self.notes_var.get(),
+            kind="serial", label=self.t("history"), quiet=True,
+            # Non-fatal: the results are still shown, the quote just isn't kept.
+            on_error=lambda exc: print(f"[history] Quote not saved: {exc}"),
+        )
+
+    def _write_quote(self, ref, mode, rules, pieces, customer, notes):
+        """Save one quote snapshot (serial job thread, which owns the writer connection)."""
+        if ref.get("deleted"):
+            return None
+        if self._history_writer is None:
+            self._history_writer = QuoteHistory()
+        ref["id"] = self._history_writer.save_quote(mode, rules, pieces, customer, notes, quote_id=ref["id"])
+        return ref["id"]
+
+    def _close_history_writer(self):
+        if self._history_writer is not None:
+            self._history_writer.close()
+            self._history_writer = None
+
+    def close_history(self, timeout=30.0):
+        """Let queued quote saves finish, then close both history connections (window close)."""
+        job = self.jobs.submit(self._close_history_writer, kind="serial")
+        try:
+            job.futures[0].result(timeout=timeout)
+        except Exception:
+            pass
+        if self.history is not None:
+            self.history.close()
+            self.history = None
+
+    def show_history(self):
+        """Browse saved quotes, newest first, one page at a time."""
+        if self._history_window is not None and self._history_window.winfo_exists():
+            self._history_window.lift()
+            return
+        try:
+            self._quote_history()
+        except Exception as exc:
+            messagebox.showerror(self.t("error"), self.t("history_error", err=exc))
+            return
+
+        window = tk.Toplevel(self.root, bg="white")
+        self.tr(window, "history_title", slot="title", setter=_set_title)
+        window.geometry("900x560")
+        self._history_window = window
+
+        search_frame = tk.Frame(window, bg="white")
+        search_frame.pack(fill=tk.X, padx=20, pady=(20, 10))
+        self.tr(tk.Label(search_frame, font=("Helvetica", 11), bg="white"), "search").pack(side=tk.LEFT)
+        self._history_search = tk.StringVar(value="")
+        search_entry = tk.Entry(search_frame, textvariable=self._history_search, font=("Helvetica", 11))
+        search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(10, 0))
+        search_entry.focus_set()
+
+        actions = tk.Frame(window, bg="white")
+        actions.pack(side=tk.BOTTOM, fill=tk.X, padx=20, pady=(10, 20))
+        self.tr(tk.Button(
+            actions, command=self.open_selected_quote,
+            bg="#4f46e5", fg="white", font=("Helvetica", 10, "bold"), relief=tk.FLAT, padx=15, pady=6, cursor="hand2",
+        ), "open_quote").pack(side=tk.RIGHT)
+        self.tr(tk.Button(
+            actions, command=self.delete_selected_quote,
+            bg="#ef4444", fg="white", font=("Helvetica", 10, "bold"), relief=tk.FLAT, padx=15, pady=6, cursor="hand2",
+        ), "delete_quote").pack(side=tk.RIGHT, padx=(0, 10))
+
+        # Batch export: the selected quotes, or every quote matching the search when none is selected.
+        self.tr(tk.Button(
+            actions, command=self.export_history_pdfs,
+            bg="#8b5cf6", fg="white", font=("Helvetica", 10, "bold"), relief=tk.FLAT, padx=15, pady=6, cursor="hand2",
+        ), "export_pdfs").pack(side=tk.LEFT)
+        self._export_style_combo = ttk.Combobox(actions, state="readonly", width=34)
+        self.tr(self._export_style_combo, "pdf_detailed", slot="values", setter=self._set_export_styles)
+        self._export_style_combo.current(0)
+        self._export_style_combo.pack(side=tk.LEFT, padx=10)
+
+        list_frame = tk.Frame(window, bg="white")
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=20)
+        columns = ("date", "customer", "mode", "pieces_count", "total")
+        self._history_tree = ttk.Treeview(list_frame, columns=columns, show="headings", selectmode="extended")
+        for column, width in zip(columns, (150, 300, 70, 70, 120)):
+            self._history_tree.heading(column, anchor=tk.W)
+            self.tr(self._history_tree, column, slot=column, setter=_heading_setter(column))
+            self._history_tree.column(column, width=width, anchor=tk.W, stretch=column == "customer")
+        self._history_scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self._history_tree.yview)
+        self._history_tree.configure(yscrollcommand=self._on_history_scroll)
+        self._history_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self._history_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self._history_tree.bind("<Double-1>", lambda e: self.open_selected_quote())
+
+        self._history_job = None
+        self._history_search.trace_add("write", self._schedule_history_search)
+        self._reload_history()
+
+    def _set_export_styles(self, combo, detailed_text):
+        """Export style choices in the current language; the selected style stays selected."""
+        index = combo.current()
+        combo.configure(values=[detailed_text, self.t("pdf_simple")])
+        if index >= 0:
+            combo.current(index)
+
+    def _schedule_history_search(self, *args):
+        # Search as the user types, once typing pauses.
+        if self._history_job is not None:
+            try:
+                self.root.after_cancel(self._history_job)
+            except Exception:
+                pass
+        self._history_job = self.root.after(PREVIEW_DELAY_MS, self._reload_history)
+
+    def _reload_history(self):
+        self._history_job = None
+        self._history_tree.delete(*self._history_tree.get_children())
+        self._history_last_id = None
+        self._history_more = True
+        self._load_history_page()
+
+    def _load_history_page(self):
+        """Append the next page of quotes after the last one shown."""
+        rows = self.history.page(before_id=self._history_last_id, search=self._history_search.get())
+        self._history_more = len(rows) == PAGE_SIZE
+        for row in rows:
+            self._history_tree.insert("", tk.END, iid=str(row['id']), values=(
+                row['created_at'].replace("T", " "),
+                row['customer'] or "—",
+                "Laser" if row['mode'] == "laser" else "3D",
+                row['piece_count'],
+                f"{row['total_price']:.2f} DT",
+            ))
+        if rows:
+            self._history_last_id = rows[-1]['id']
+
+    def _on_history_scroll(self, first, last):
+        self._history_scrollbar.set(first, last)
+        # Fetch the next page when the view nears the end of what is loaded.
+        if self._history_more and float(last) > 0.9:
+            self._load_history_page()
+
+    def _selected_quote_id(self):
+        selection = self._history_tree.selection()
+        return int(selection[0]) if selection else None
+
+    def open_selected_quote(self):
+        """Load the selected quote into its calculator and show its results."""
+        quote_id = self._selected_quote_id()
+        quote = self.history.load_quote(quote_id) if quote_id is not None else None
+        if quote is None:
+            return
+        if self.mode is not None:
+            self.save_current_settings()
+        if quote['mode'] == "laser":
+            self.start_laser_calculator()
+        else:
+            self.start_3d_calculator()
+
+        rules = quote['rules']
+        self.gram_price.set(rules.gram_price)
+        self.normal_hour_price.set(rules.normal_hour_price)
+        self.exceed_hour_price.set(rules.exceed_hour_price)
+        self.exceed_threshold.set(rules.exceed_threshold)
+        self.markup_percent.set(rules.markup_percent)
+        self.customer_var.set(quote['customer'])
+        self.notes_var.set(quote['notes'])
+        for piece in quote['pieces']:
+            self._add_piece(piece['grams'], piece['hours'], piece['minutes'])
+        self.update_pieces_list()
+        self._quote_ref = {"id": quote['id']}
+
+        self._history_window.destroy()
+        self._history_window = None
+        self.calculate_and_show_results()
+
+    def delete_selected_quote(self):
+        quote_id = self._selected_quote_id()
+        if quote_id is None:
+            return
+        if messagebox.askyesno(self.t("confirm"), self.t("confirm_delete_quote", id=quote_id), parent=self._history_window):
+            self.history.delete_quote(quote_id)
+            self._history_tree.delete(str(quote_id))
+            if self._quote_ref["id"] == quote_id:
+                # Saves still queued for the deleted quote must not bring it back.
+                self._quote_ref["deleted"] = True
+                self._quote_ref = {"id": None}
+
+    def export_history_pdfs(self):
+        """Render PDFs of many saved quotes into a folder across the process pool."""
+        from batch_export import plan_history_export
+
+        out_dir = filedialog.askdirectory(parent=self._history_window, title=self.t("export_pdfs"))
+        if not out_dir:
+            return
+        quote_ids = [int(iid) for iid in self._history_tree.selection()]
+        style = "simple" if self._export_style_combo.current() == 1 else "detailed"
+        started = time.perf_counter()
+        # Reading the quotes happens on a thread, rendering in worker processes.
+        self.jobs.submit(
+            plan_history_export,
+            quote_ids,
+            self._history_search.get(),
+            out_dir,
+            style,
+            self.lang_var.get(),
+            label=self.t("export_pdfs"),
+            on_done=lambda plan: self._render_history_export(plan, out_dir, started),
+            on_error=self._show_job_error,
+        )
+
+    def _render_history_export(self, plan, out_dir, started):
+        from batch_export import render_quote
+
+        tasks, skipped = plan
+        if not tasks:
+            self._finish_history_export([], skipped, out_dir, started)
+            return
+        self.jobs.map(
+            render_quote,
+            tasks,
+            kind="process",
+            label=self.t("export_pdfs"),
+            on_done=lambda results: self._finish_history_export(results, skipped, out_dir, started),
+            on_error=self._show_job_error,
+        )
+
+    def _finish_history_export(self, results, skipped, out_dir, started):
+        from batch_export import record_exports, summarize
+
+        if results:
+            record_exports(out_dir, results)
+        report = summarize(results, skipped, time.perf_counter() - started)
+        message = self.t(
+            "export_report",
+            exported=report['exported'],
+            skipped=report['skipped'],
+            failed=len(report['failed']),
+            seconds=report['seconds'],
+            rate=report['rate'],
+        )
+        if report['failed']:
+            details = "\n".join(f"{name}: {error}" for name, error in report['failed'][:10])
+            messagebox.showwarning(self.t("warning"), f"{message}\n\n{details}")
+        else:
+            messagebox.showinfo(self.t("success"), message)
+
     def calculate_and_show_results(self):
         if not self.pieces:
             messagebox.showwarning(self.t("warning"), self.t("need_piece"))
@@ -1134,31 +1507,107 @@ class PrintCalculatorApp:
         # Persist current settings (language + rules) when user runs a calculation.
         self.save_current_settings()
 
-        # Calculate all pieces
-        for piece in self.pieces:
-            result = self.calculate_price(piece['grams'], piece['hours'], piece['minutes'])
-            piece['result'] = result
-
-        # Header summary (total price + total time)
-        total_price = sum(p['result']['final_price'] for p in self.pieces if p.get('result'))
-        total_hours = sum(p['result']['total_hours'] for p in self.pieces if p.get('result'))
-        self.summary_var.set(self.t("summary", total=total_price, time=self._format_time_h_min(total_hours)))
-             
-        # Clear previous results
-        for widget in self.results_scrollable_frame.winfo_children():
-            widget.destroy()
-
-        self.result_cards.clear()
-             
-        # Display results
-        for piece in self.pieces:
-            card = self.create_piece_card(piece, piece['result'])
-            self.result_cards.append(card)
+        # Only re-price what changed since the last calculation (rules are read from Tk once).
+        self.recalculate(self.current_rules())
+        self._save_quote()
 
-        self._layout_result_cards()
-             
-        # Show results page
+        self._update_summary()
+
+        # Show results page, then redraw the cards in view (the piece count may have changed).
         self.show_page("results")
+        self._result_cols = 0
+        self._invalidate_result_cards()
+        self._layout_result_cards()
+
+    def _update_summary(self):
+        """Header summary (total price + total time), from the running totals."""
+        self.summary_var.set(self.t(
+            "summary",
+            total=self.totals['final_price'],
+            time=self._format_time_h_min(self.totals['total_hours']),
+        ))
+
+    def _read_rules(self):
+        """Current rules, or None while a rule entry holds a partial number ("", "-", "1e", ...)."""
+        try:
+            return self.current_rules()
+        except (tk.TclError, ValueError):
+            return None
+
+    def _schedule_preview(self, *args):
+        """Variable trace: coalesce rule keystrokes into one preview after a short pause."""
+        if self._preview_job is not None:
+            try:
+                self.root.after_cancel(self._preview_job)
+            except Exception:
+                pass
+        self._preview_job = self.root.after(PREVIEW_DELAY_MS, self._run_preview)
+
+    def _run_preview(self):
+        """Re-price the session with the rules being typed and refresh the summary and cards in view."""
+        self._preview_job = None
+        if self.results_rules is None:
+            return
+        rules = self._read_rules()
+        if rules is None or (rules == self.results_rules and not self.dirty_pieces):
+            return
+        # Only the pieces the edited rule affects are re-priced, so this stays short even with many pieces.
+        self.recalculate(rules)
+        self._update_summary()
+        self._invalidate_result_cards()
+        self._render_visible_cards()
+
+    def _set_piece_result(self, piece, result):
+        """Store a piece's result and keep the running totals in step."""
+        old = piece['result']
+        if old is not None:
+            self.totals['final_price'] -= old['final_price']
+            self.totals['total_hours'] -= old['total_hours']
+        if result is not None:
+            self.totals['final_price'] += result['final_price']
+            self.totals['total_hours'] += result['total_hours']
+        piece['result'] = result
+
+    def _mark_dirty(self, piece):
+        """Drop a piece's result after its inputs changed; it is re-priced on the next calculation."""
+        self._set_piece_result(piece, None)
+        self.dirty_pieces[id(piece)] = piece
+
+    def recalculate(self, rules):
+        """
+        Bring every piece's result up to date with `rules`, re-pricing only the
+        dirty pieces and those whose price depends on a rule that changed.
+        Returns the number of pieces priced.
+        """
+        old_rules = self.results_rules
+        stale = list(self.dirty_pieces.values())
+        if old_rules is not None and old_rules != rules:
+            stale.extend(
+                p for p in self.pieces
+                if p['result'] is not None
+                and rules_affect_piece(old_rules, rules, p['grams'], p['result']['total_hours'])
+            )
+        self.dirty_pieces = {}
+        self.results_rules = rules
+
+        if len(stale) == len(self.pieces):
+            # Everything changes: start the totals from zero so rounding errors don't accumulate.
+            for piece in stale:
+                piece['result'] = None
+            self.totals = {'final_price': 0.0, 'total_hours': 0.0}
+        if len(stale) >= VECTOR_MIN_ROWS:
+            columns = price_batch(
+                rules,
+                [p['grams'] for p in stale],
+                [p['hours'] for p in stale],
+                [p['minutes'] for p in stale],
+            )
+            for piece, result in zip(stale, iter_results(columns)):
+                self._set_piece_result(piece, result)
+        else:
+            for piece in stale:
+                self._set_piece_result(piece, self.calculate_price(piece['grams'], piece['hours'], piece['minutes'], rules))
+        return len(stale)
 
     def _schedule_layout_results(self, event=None):
         # Throttle relayout while resizing.
@@ -1171,10 +1620,17 @@ class PrintCalculatorApp:
                 pass
         self._layout_job = self.root.after(60, self._layout_result_cards)
 
+    def layout_pending(self):
+        """True while a throttled relayout of the result cards is still scheduled."""
+        return self._layout_job is not None
+
+    def _card_height(self):
+        """Height of a result card; cards have a fixed height so rows can be computed, not measured."""
+        detail_rows = 3 if self.mode == "laser" else 4
+        return 237 + 26 * detail_rows
+
     def _layout_result_cards(self):
         self._layout_job = None
-        if not self.result_cards:
-            return
 
         # Available width inside the canvas viewport.
         width = self.results_canvas.winfo_width()
@@ -1186,69 +1642,151 @@ class PrintCalculatorApp:
         padding = 20
         cols = max(1, min(3, max(1, (width - padding) // (card_min_width + padding))))
 
-        # Configure grid columns.
-        for i in range(3):
-            self.results_scrollable_frame.grid_columnconfigure(i, weight=1 if i < cols else 0, uniform="cards")
-
-        # Place cards.
-        for idx, card in enumerate(self.result_cards):
-            card.grid_forget()
-            r, c = divmod(idx, cols)
-            card.grid(row=r, column=c, sticky="nsew", padx=10, pady=10)
-        
-    def calculate_price(self, grams, hours, minutes):
-        total_hours = hours + (minutes / 60)
-
-        if self.mode == "laser":
-            # Laser: ignore grams, single hourly rate.
-            gram_price = 0.0
-            time_price = total_hours * self.normal_hour_price.get()
-            exceeded = False
-            subtotal = time_price
-        else:
-            gram_price = grams * self.gram_price.get()
-
-            if total_hours > self.exceed_threshold.get():
-                time_price = total_hours * self.exceed_hour_price.get()
-                exceeded = True
+        if cols != self._result_cols:
+            # Reflow: the number of rows (and so the scroll height) only changes with the column count.
+            self._result_cols = cols
+            rows = -(-len(self.pieces) // cols)
+            self.results_canvas.configure(scrollregion=(0, 0, width, rows * (self._card_height() + padding)))
+        self._result_width = width
+        self._render_visible_cards()
+
+    def _on_results_scroll(self, first, last):
+        self.results_scrollbar.set(first, last)
+        self._render_visible_cards()
+
+    def _invalidate_result_cards(self):
+        """Force the cards in view to be redrawn (new results or rules)."""
+        for slot in self.result_slots:
+            slot['drawn'] = None
+
+    def _render_visible_cards(self):
+        """Draw the cards intersecting the viewport, reusing slots that scrolled out of view."""
+        cols = self._result_cols
+        if not cols or self.results_rules is None:
+            return
+        canvas = self.results_canvas
+        row_height = self._card_height() + 20
+        top = canvas.canvasy(0)
+        bottom = top + max(canvas.winfo_height(), row_height)
+        first = max(int(top // row_height), 0) * cols
+        last = min((int(bottom // row_height) + 1) * cols, len(self.pieces))
+
+        # Slots already showing a visible piece keep it; every other slot is free for reuse.
+        shown = {}
+        free = []
+        for slot in self.result_slots:
+            index = slot['index']
+            if index is not None and first <= index < last and index not in shown:
+                shown[index] = slot
             else:
-                time_price = total_hours * self.normal_hour_price.get()
-                exceeded = False
+                free.append(slot)
+
+        cell_width = self._result_width / cols
+        for index in range(first, last):
+            slot = shown.get(index) or (free.pop() if free else self._new_result_slot())
+            r, c = divmod(index, cols)
+            self._draw_result_card(slot, index, c * cell_width + 10, r * row_height + 10, cell_width - 20)
+
+        for slot in free:
+            if slot['index'] is not None:
+                canvas.itemconfigure(slot['tag'], state="hidden")
+                slot['index'] = None
+                slot['drawn'] = None
+
+    def current_rules(self):
+        """Snapshot the rule variables of the active calculator into a PricingRules."""
+        return PricingRules(
+            mode="laser" if self.mode == "laser" else "3d",
+            gram_price=self.gram_price.get(),
+            normal_hour_price=self.normal_hour_price.get(),
+            exceed_hour_price=self.exceed_hour_price.get(),
+            exceed_threshold=self.exceed_threshold.get(),
+            markup_percent=self.markup_percent.get(),
+        )
 
-            subtotal = gram_price + time_price
+    def calculate_price(self, grams, hours, minutes, rules=None):
+        if rules is None:
+            rules = self.current_rules()
+        return price_piece(rules, grams, hours, minutes)
+        
+    def _new_result_slot(self):
+        """Create the canvas items of one (reusable) result card."""
+        canvas = self.results_canvas
+        tag = f"card{len(self.result_slots)}"
+        slot = {'tag': tag, 'index': None, 'drawn': None, 'details': []}
+
+        def rect(fill, *tags):
+            return canvas.create_rectangle(0, 0, 0, 0, fill=fill, outline="", tags=(tag,) + tags)
+
+        def text(font, fill, anchor, *tags):
+            return canvas.create_text(0, 0, font=font, fill=fill, anchor=anchor, tags=(tag,) + tags)
+
+        slot['card'] = canvas.create_rectangle(0, 0, 0, 0, fill="white", outline="#d1d5db", tags=(tag,))
+        slot['header'] = rect("#4f46e5")
+        slot['title'] = text(("Helvetica", 14, "bold"), "white", "w")
+        slot['info_box'] = rect("#f9fafb")
+        slot['info'] = text(("Helvetica", 11), "#6b7280", "center")
+        for _ in range(4):
+            slot['details'].append((
+                text(("Helvetica", 10), "#374151", "w"),
+                text(("Helvetica", 10, "bold"), "#1f2937", "e"),
+            ))
+        slot['final_box'] = rect("#ecfdf5")
+        slot['final_label'] = text(("Helvetica", 12, "bold"), "#065f46", "w")
+        slot['final_value'] = text(("Helvetica", 16, "bold"), "#10b981", "e")
+
+        # Buttons act on whichever piece the slot currently shows.
+        for name, color, action in (("copy", "#3b82f6", self.copy_text), ("receipt", "#8b5cf6", self.generate_image)):
+            button_tag = f"{tag}-{name}"
+            slot[name + '_box'] = rect(color, button_tag)
+            slot[name] = text(self.card_button_font, "white", "center", button_tag)
+            canvas.tag_bind(button_tag, "<Button-1>", lambda e, s=slot, a=action: a(self.pieces[s['index']]))
+            canvas.tag_bind(button_tag, "<Enter>", lambda e: canvas.configure(cursor="hand2"))
+            canvas.tag_bind(button_tag, "<Leave>", lambda e: canvas.configure(cursor=""))
+
+        self.result_slots.append(slot)
+        return slot
+
+    def _card_details(self, piece, result, rules):
+        """(label, value) rows of the price breakdown shown on a card."""
+        if self.mode == "laser":
+            return [
+                (
+                    f"{self.t('time_price')}:",
+                    f"{self._format_time_h_min(result['total_hours'])} × {rules.normal_hour_price} DT = {result['time_price']:.2f} DT",
+                ),
+                (f"{self.t('subtotal')}:", f"{result['subtotal']:.2f} DT"),
+                (f"{self.t('markup')} (+{rules.markup_percent:.0f}%):", f"+{result['markup_amount']:.2f} DT"),
+            ]
+        return [
+            (
+                f"{self.t('gram_price')} :",
+                f"{piece['grams']}g × {rules.gram_price} DT = {result['gram_price']:.2f} DT",
+            ),
+            (
+                self.t('time_price') + (self.t('exceeded_suffix') if result['exceeded'] else ":"),
+                f"{self._format_time_h_min(result['total_hours'])} × "
+                f"{rules.exceed_hour_price if result['exceeded'] else rules.normal_hour_price} DT = "
+                f"{result['time_price']:.2f} DT",
+            ),
+            (f"{self.t('subtotal')}:", f"{result['subtotal']:.2f} DT"),
+            (f"{self.t('markup')} (+{rules.markup_percent:.0f}%):", f"+{result['markup_amount']:.2f} DT"),
+        ]
+
+    def _draw_result_card(self, slot, index, x, y, w):
+        """Fill and position a card slot for piece `index`; skipped when nothing changed."""
+        key = (index, x, y, w)
+        if slot['drawn'] == key:
+            return
+        piece = self.pieces[index]
+        result = piece['result']
+        canvas = self.results_canvas
+        slot['index'] = index
+        slot['drawn'] = key
+        canvas.itemconfigure(slot['tag'], state="hidden" if result is None else "normal")
+        if result is None:
+            return
 
-        markup_amount = subtotal * (self.markup_percent.get() / 100)
-        final_price = subtotal + markup_amount
-        
-        return {
-            'total_hours': total_hours,
-            'gram_price': gram_price,
-            'time_price': time_price,
-            'exceeded': exceeded,
-            'subtotal': subtotal,
-            'markup_amount': markup_amount,
-            'final_price': final_price
-        }
-        
-    def create_piece_card(self, piece, result):
-        card = tk.Frame(self.results_scrollable_frame, bg="white", relief=tk.RAISED, bd=1)
-        
-        # Header
-        header = tk.Frame(card, bg="#4f46e5", height=50)
-        header.pack(fill=tk.X)
-        header.pack_propagate(False)
-        
-        tk.Label(header, text=f"{self.t('piece')} {piece['id']}", font=("Helvetica", 14, "bold"),
-                bg="#4f46e5", fg="white").pack(side=tk.LEFT, padx=20, pady=10)
-        
-        # Content
-        content = tk.Frame(card, bg="white")
-        content.pack(fill=tk.BOTH, expand=True, padx=20, pady=15)
-        
-        # Input info
-        input_frame = tk.Frame(content, bg="#f9fafb", relief=tk.FLAT, bd=1)
-        input_frame.pack(fill=tk.X, pady=(0, 10))
-        
         if self.mode == "laser":
             info_text = (
                 f"{self.t('time')}: {piece['hours']}h {piece['minutes']}min "
@@ -1259,74 +1797,56 @@ class PrintCalculatorApp:
                 f"{self.t('weight')}: {piece['grams']}g  |  {self.t('time')}: {piece['hours']}h {piece['minutes']}min "
                 f"({self._format_time_h_min(result['total_hours'])})"
             )
-        tk.Label(input_frame, text=info_text, font=("Helvetica", 11), bg="#f9fafb", fg="#6b7280").pack(pady=10)
-        
-        # Calculation details
-        if self.mode == "laser":
-            details = [
-                (
-                    f"{self.t('time_price')}:",
-                    f"{self._format_time_h_min(result['total_hours'])} × {self.normal_hour_price.get()} DT = {result['time_price']:.2f} DT",
-                ),
-                (f"{self.t('subtotal')}:", f"{result['subtotal']:.2f} DT"),
-                (f"{self.t('markup')} (+{self.markup_percent.get():.0f}%):", f"+{result['markup_amount']:.2f} DT"),
-            ]
-        else:
-            details = [
-                (
-                    f"{self.t('gram_price')} :",
-                    f"{piece['grams']}g × {self.gram_price.get()} DT = {result['gram_price']:.2f} DT",
-                ),
-                (
-                    self.t('time_price') + (self.t('exceeded_suffix') if result['exceeded'] else ":"),
-                    f"{self._format_time_h_min(result['total_hours'])} × "
-                    f"{self.exceed_hour_price.get() if result['exceeded'] else self.normal_hour_price.get()} DT = "
-                    f"{result['time_price']:.2f} DT",
-                ),
-                (f"{self.t('subtotal')}:", f"{result['subtotal']:.2f} DT"),
-                (f"{self.t('markup')} (+{self.markup_percent.get():.0f}%):", f"+{result['markup_amount']:.2f} DT"),
-            ]
-        
-        for label, value in details:
-            row = tk.Frame(content, bg="white")
-            row.pack(fill=tk.X, pady=3)
-            tk.Label(row, text=label, font=("Helvetica", 10), bg="white", fg="#374151").pack(side=tk.LEFT)
-            tk.Label(row, text=value, font=("Helvetica", 10, "bold"), bg="white", fg="#1f2937").pack(side=tk.RIGHT)
-        
-        # Final price
-        final_frame = tk.Frame(content, bg="#ecfdf5", relief=tk.FLAT, bd=1)
-        final_frame.pack(fill=tk.X, pady=(10, 0))
-        
-        tk.Label(final_frame, text=self.t("final_price_label"), font=("Helvetica", 12, "bold"),
-                bg="#ecfdf5", fg="#065f46").pack(side=tk.LEFT, padx=10, pady=12)
-        tk.Label(final_frame, text=f"{result['final_price']:.2f} DT", font=("Helvetica", 16, "bold"),
-                bg="#ecfdf5", fg="#10b981").pack(side=tk.RIGHT, padx=10, pady=12)
-        
-        # Buttons
-        btn_frame = tk.Frame(card, bg="white")
-        btn_frame.pack(fill=tk.X, padx=20, pady=(0, 15))
-        
-        copy_btn = tk.Button(btn_frame, text=self.t("copy"), command=lambda p=piece: self.copy_text(p),
-                            bg="#3b82f6", fg="white", font=("Helvetica", 10, "bold"),
-                            relief=tk.FLAT, padx=15, pady=8, cursor="hand2")
-        copy_btn.pack(side=tk.LEFT, padx=5)
-        
-        recu_btn = tk.Button(btn_frame, text=self.t("receipt_image"), command=lambda p=piece: self.generate_image(p),
-                            bg="#8b5cf6", fg="white", font=("Helvetica", 10, "bold"),
-                            relief=tk.FLAT, padx=15, pady=8, cursor="hand2")
-        recu_btn.pack(side=tk.LEFT, padx=5)
+        details = self._card_details(piece, result, self.results_rules)
+        height = self._card_height()
+        right = x + w
+
+        canvas.coords(slot['card'], x, y, right, y + height)
+        canvas.coords(slot['header'], x, y, right, y + 50)
+        canvas.coords(slot['title'], x + 20, y + 25)
+        canvas.itemconfigure(slot['title'], text=f"{self.t('piece')} {piece['id']}")
+        canvas.coords(slot['info_box'], x + 20, y + 65, right - 20, y + 105)
+        canvas.coords(slot['info'], x + w / 2, y + 85)
+        canvas.itemconfigure(slot['info'], text=info_text)
+
+        for i, (label_item, value_item) in enumerate(slot['details']):
+            if i < len(details):
+                row_y = y + 128 + 26 * i
+                canvas.coords(label_item, x + 20, row_y)
+                canvas.coords(value_item, right - 20, row_y)
+                canvas.itemconfigure(label_item, text=details[i][0])
+                canvas.itemconfigure(value_item, text=details[i][1])
+            else:
+                canvas.itemconfigure(label_item, state="hidden")
+                canvas.itemconfigure(value_item, state="hidden")
+
+        final_y = y + 125 + 26 * len(details)
+        canvas.coords(slot['final_box'], x + 20, final_y, right - 20, final_y + 48)
+        canvas.coords(slot['final_label'], x + 30, final_y + 24)
+        canvas.itemconfigure(slot['final_label'], text=self.t("final_price_label"))
+        canvas.coords(slot['final_value'], right - 30, final_y + 24)
+        canvas.itemconfigure(slot['final_value'], text=f"{result['final_price']:.2f} DT")
+
+        button_x = x + 25
+        button_y = final_y + 63
+        for name, label in (("copy", self.t("copy")), ("receipt", self.t("receipt_image"))):
+            button_width = self.card_button_font.measure(label) + 30
+            canvas.coords(slot[name + '_box'], button_x, button_y, button_x + button_width, button_y + 34)
+            canvas.coords(slot[name], button_x + button_width / 2, button_y + 17)
+            canvas.itemconfigure(slot[name], text=label)
+            button_x += button_width + 10
 
-        return card
-        
     def copy_text(self, piece):
         result = piece['result']
+        # The markup the results were priced with, not the (possibly edited) rule input.
+        markup = self.results_rules.markup_percent
         if self.mode == "laser":
             text = f"""Piece {piece['id']}
 Time: {piece['hours']}h {piece['minutes']}min
 
 Time Price: {result['time_price']:.2f} DT
 Subtotal: {result['subtotal']:.2f} DT
-Markup (+{self.markup_percent.get():.0f}%): {result['markup_amount']:.2f} DT
+Markup (+{markup:.0f}%): {result['markup_amount']:.2f} DT
 
 Final Price: {result['final_price']:.2f} DT"""
         else:
@@ -1337,7 +1857,7 @@ Time: {piece['hours']}h {piece['minutes']}min
 Gramage Price: {result['gram_price']:.2f} DT
 Time Price: {result['time_price']:.2f} DT
 Subtotal: {result['subtotal']:.2f} DT
-Markup (+{self.markup_percent.get():.0f}%): {result['markup_amount']:.2f} DT
+Markup (+{markup:.0f}%): {result['markup_amount']:.2f} DT
 
 Final Price: {result['final_price']:.2f} DT"""
         
@@ -1345,58 +1865,28 @@ Final Price: {result['final_price']:.2f} DT"""
         self.root.clipboard_append(text)
         messagebox.showinfo(self.t("copied"), self.t("copied_msg", id=piece['id']))
         
+    def _export_pieces(self):
+        """Plain copies of the pieces for worker threads/processes (no Tk state shared)."""
+        return [dict(piece) for piece in self.pieces]
+
+    def _show_job_error(self, exc):
+        messagebox.showerror(self.t("error"), self.t("unexpected_error_msg", err=exc))
+
     def generate_image(self, piece):
-        result = piece['result']
-        
-        # Create image with larger size
-        img_width, img_height = 700, 550
-        img = Image.new('RGB', (img_width, img_height), color='white')
-        draw = ImageDraw.Draw(img)
-        
-        try:
-            title_font = ImageFont.truetype("arial.ttf", 36)
-            header_font = ImageFont.truetype("arialbd.ttf", 22)
-            normal_font = ImageFont.truetype("arialbd.ttf", 20)
-            bold_font = ImageFont.truetype("arialbd.ttf", 28)
-        except:
-            title_font = ImageFont.load_default()
-            header_font = ImageFont.load_default()
-            normal_font = ImageFont.load_default()
-            bold_font = ImageFont.load_default()
-        
-        # Header background
-        draw.rectangle([0, 0, img_width, 90], fill='#4f46e5')
-        draw.text((350, 45), f"Piece {piece['id']}", font=title_font, fill='white', anchor='mm')
-        
-        y = 140
-        
-        # Content with bold fonts
-        if self.mode == "laser":
-            lines = [
-                (f"Time: {piece['hours']}h {piece['minutes']}min", normal_font, '#6b7280'),
-                ("", normal_font, 'black'),
-                (f"Time Price: {result['time_price']:.2f} DT", normal_font, 'black'),
-                (f"Subtotal: {result['subtotal']:.2f} DT", normal_font, 'black'),
-                (f"Markup (+{self.markup_percent.get():.0f}%): +{result['markup_amount']:.2f} DT", normal_font, 'black'),
-                ("", normal_font, 'black'),
-                (f"Final Price: {result['final_price']:.2f} DT", bold_font, '#10b981'),
-            ]
-        else:
-            lines = [
-                (f"Weight: {piece['grams']}g  |  Time: {piece['hours']}h {piece['minutes']}min", normal_font, '#6b7280'),
-                ("", normal_font, 'black'),
-                (f"Gramage Price: {result['gram_price']:.2f} DT", normal_font, 'black'),
-                (f"Time Price: {result['time_price']:.2f} DT", normal_font, 'black'),
-                (f"Subtotal: {result['subtotal']:.2f} DT", normal_font, 'black'),
-                (f"Markup (+{self.markup_percent.get():.0f}%): +{result['markup_amount']:.2f} DT", normal_font, 'black'),
-                ("", normal_font, 'black'),
-                (f"Final Price: {result['final_price']:.2f} DT", bold_font, '#10b981'),
-            ]
-        
-        for text, font, color in lines:
-            draw.text((60, y), text, font=font, fill=color)
-            y += 50
-        
+        from receipts import render_receipt
+
+        # Render off the Tk thread; clipboard and dialogs happen back on it.
+        self.jobs.submit(
+            render_receipt,
+            self.mode,
+            dict(piece),
+            self.results_rules.markup_percent,
+            label=self.t("receipt_image"),
+            on_done=lambda img, piece_id=piece['id']: self._deliver_receipt(img, piece_id),
+            on_error=self._show_job_error,
+        )
+
+    def _deliver_receipt(self, img, piece_id):
         # First, try to put the image directly into the system clipboard
         if _copy_image_to_clipboard(img):
             messagebox.showinfo(self.t("success"), self.t("img_copied"))
@@ -1407,201 +1897,162 @@ Final Price: {result['final_price']:.2f} DT"""
         file_path = filedialog.asksaveasfilename(
             defaultextension=".png",
             filetypes=[("PNG files", "*.png"), ("All files", "*.*")],
-            initialfile=f"piece_{piece['id']}_recu.png"
+            initialfile=f"piece_{piece_id}_recu.png"
         )
 
         if file_path:
-            img.save(file_path)
-            messagebox.showinfo(self.t("success"), self.t("img_saved", path=file_path))
-            
-    def generate_detailed_pdf(self):
-        if not self.pieces or not any(p['result'] for p in self.pieces):
+            self.jobs.submit(
+                img.save,
+                file_path,
+                label=self.t("receipt_image"),
+                on_done=lambda _: messagebox.showinfo(self.t("success"), self.t("img_saved", path=file_path)),
+                on_error=self._show_job_error,
+            )
+
+    def generate_all_receipts(self):
+        """Render every receipt across the process pool into a ZIP of PNGs or a PDF contact sheet."""
+        from receipts import BATCH_SIZE, render_receipt_batch, write_contact_sheet, write_receipts_zip
+
+        priced = [piece for piece in self._export_pieces() if piece['result']]
+        if not priced:
             messagebox.showwarning(self.t("warning"), self.t("calc_first"))
             return
-            
+
         file_path = filedialog.asksaveasfilename(
-            defaultextension=".pdf",
-            filetypes=[("PDF files", "*.pdf"), ("All files", "*.*")],
-            initialfile="detailed_quote.pdf"
+            defaultextension=".zip",
+            filetypes=[("ZIP (PNG)", "*.zip"), ("PDF contact sheet", "*.pdf")],
+            initialfile="receipts.zip"
         )
-        
         if not file_path:
             return
-            
-        doc = SimpleDocTemplate(file_path, pagesize=A4, topMargin=2*cm, bottomMargin=2*cm)
-        story = []
-        styles = getSampleStyleSheet()
-        
-        # Title (3D vs Laser)
-        quote_key = "quote_title_laser" if self.mode == "laser" else "quote_title"
-        title = Paragraph(f"<b>{self.t(quote_key)}</b>", styles['Title'])
-        story.append(title)
-        story.append(Spacer(1, 0.5*cm))
-        
-        # Rules summary
-        if self.mode == "laser":
-            rules_text = f"""
-            <b>{self.t('pricing_rules')}</b><br/>
-            {self.t('rule_normal_hour')} {self.normal_hour_price.get()} DT/h<br/>
-            {self.t('rule_markup')} {self.markup_percent.get()}%
-            """
-        else:
-            rules_text = f"""
-            <b>{self.t('pricing_rules')}</b><br/>
-            {self.t('rule_gram_price')} {self.gram_price.get()} DT/g<br/>
-            {self.t('rule_normal_hour')} {self.normal_hour_price.get()} DT/h<br/>
-            {self.t('rule_exceed_hour')} {self.exceed_hour_price.get()} DT/h ({self.t('rule_threshold')} {self.exceed_threshold.get()}h)<br/>
-            {self.t('rule_markup')} {self.markup_percent.get()}%
-            """
-        story.append(Paragraph(rules_text, styles['Normal']))
-        story.append(Spacer(1, 0.8*cm))
-        
-        # Each piece
-        total = 0
-        for piece in self.pieces:
-            if piece['result']:
-                result = piece['result']
-                
-                if self.mode == "laser":
-                    data = [
-                        ['Item', 'Value'],
-                        [f"Piece {piece['id']}", ''],
-                        ['Time', f"{piece['hours']}h {piece['minutes']}min"],
-                        ['Time Price', f"{result['time_price']:.2f} DT"],
-                        ['Subtotal', f"{result['subtotal']:.2f} DT"],
-                        ['Markup', f"{result['markup_amount']:.2f} DT"],
-                        ['Final Price', f"{result['final_price']:.2f} DT"],
-                    ]
-                else:
-                    data = [
-                        ['Item', 'Value'],
-                        [f"Piece {piece['id']}", ''],
-                        ['Weight', f"{piece['grams']}g"],
-                        ['Time', f"{piece['hours']}h {piece['minutes']}min"],
-                        ['Gramage Price', f"{result['gram_price']:.2f} DT"],
-                        ['Time Price', f"{result['time_price']:.2f} DT"],
-                        ['Subtotal', f"{result['subtotal']:.2f} DT"],
-                        ['Markup', f"{result['markup_amount']:.2f} DT"],
-                        ['Final Price', f"{result['final_price']:.2f} DT"],
-                    ]
-                
-                table = Table(data, colWidths=[10*cm, 6*cm])
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4f46e5')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 12),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('TOPPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, 1), colors.HexColor('#e0e7ff')),
-                    ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#ecfdf5')),
-                    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                    ('TOPPADDING', (0, -1), (-1, -1), 12),
-                    ('BOTTOMPADDING', (0, -1), (-1, -1), 12),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ]))
-                
-                story.append(table)
-                story.append(Spacer(1, 0.8*cm))
-                
-                total += result['final_price']
-        
-        # Total with proper padding
-        total_data = [['TOTAL', f"{total:.2f} DT"]]
-        total_table = Table(total_data, colWidths=[10*cm, 6*cm])
-        total_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#10b981')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 16),
-            ('TOPPADDING', (0, 0), (-1, -1), 15),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 15),
-        ]))
-        story.append(total_table)
-        
-        doc.build(story)
-        messagebox.showinfo(self.t("success"), self.t("pdf_saved", path=file_path))
-        
-    def generate_simple_pdf(self):
+
+        sheet = file_path.lower().endswith(".pdf")
+        writer = write_contact_sheet if sheet else write_receipts_zip
+        chunks = [
+            (self.mode, priced[start:start + BATCH_SIZE], self.results_rules.markup_percent, sheet)
+            for start in range(0, len(priced), BATCH_SIZE)
+        ]
+
+        def write(rendered):
+            # Assembling the file is I/O; keep it off the Tk thread too.
+            receipts = [item for chunk in rendered for item in chunk]
+            self.jobs.submit(
+                writer,
+                file_path,
+                receipts,
+                label=self.t("receipts_all"),
+                on_done=lambda path: messagebox.showinfo(
+                    self.t("success"), self.t("receipts_saved", count=len(receipts), path=path)
+                ),
+                on_error=self._show_job_error,
+            )
+
+        self.jobs.map(
+            render_receipt_batch,
+            chunks,
+            kind="process",
+            label=self.t("receipts_all"),
+            on_done=write,
+            on_error=self._show_job_error,
+        )
+
+    def _export_pdf(self, builder, initialfile, label):
+        """Ask for a path, then build the PDF in a worker process."""
         if not self.pieces or not any(p['result'] for p in self.pieces):
             messagebox.showwarning(self.t("warning"), self.t("calc_first"))
             return
-            
+
         file_path = filedialog.asksaveasfilename(
             defaultextension=".pdf",
             filetypes=[("PDF files", "*.pdf"), ("All files", "*.*")],
-            initialfile="simple_quote.pdf"
+            initialfile=initialfile
         )
-        
+
         if not file_path:
             return
-            
-        doc = SimpleDocTemplate(file_path, pagesize=A4, topMargin=2*cm, bottomMargin=2*cm)
-        story = []
-        styles = getSampleStyleSheet()
-        
-        # Title (3D vs Laser)
-        quote_key = "quote_title_laser" if self.mode == "laser" else "quote_title"
-        title = Paragraph(f"<b>{self.t(quote_key)}</b>", styles['Title'])
-        story.append(title)
-        story.append(Spacer(1, 1*cm))
-        
-        # Simple table with only prices
-        data = [['Piece', 'Final Price']]
-        
-        total = 0
-        for piece in self.pieces:
-            if piece['result']:
-                result = piece['result']
-                data.append([f"Piece {piece['id']}", f"{result['final_price']:.2f} DT"])
-                total += result['final_price']
-        
-        table = Table(data, colWidths=[10*cm, 6*cm])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4f46e5')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 14),
-            ('FONTSIZE', (0, 1), (-1, -1), 12),
-            ('TOPPADDING', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('TOPPADDING', (0, 1), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 10),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
-        ]))
-        
-        story.append(table)
-        story.append(Spacer(1, 1*cm))
-        
-        # Total with proper padding
-        total_data = [['TOTAL', f"{total:.2f} DT"]]
-        total_table = Table(total_data, colWidths=[10*cm, 6*cm])
-        total_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#10b981')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 16),
-            ('TOPPADDING', (0, 0), (-1, -1), 15),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 15),
-        ]))
-        story.append(total_table)
-        
-        doc.build(story)
-        messagebox.showinfo(self.t("success"), self.t("pdf_saved", path=file_path))
 
+        self.jobs.submit(
+            builder,
+            file_path,
+            self.mode,
+            self.lang_var.get(),
+            self.results_rules,
+            self._export_pieces(),
+            kind="process",
+            label=label,
+            on_done=lambda path: messagebox.showinfo(self.t("success"), self.t("pdf_saved", path=path)),
+            on_error=self._show_job_error,
+        )
+
+    def generate_detailed_pdf(self):
+        from pdf_export import COMPACT_MIN_PIECES, STREAM_MIN_PIECES, build_detailed_pdf, build_streamed_pdf
+
+        # Orders of `pdf_compact_min_pieces` pieces or more get the single-table layout,
+        # and huge ones are drawn straight onto a canvas, skipping Platypus layout.
+        # The pieces are already in memory here; only the history export streams them.
+        if len(self.pieces) >= self.settings.get("pdf_stream_min_pieces", STREAM_MIN_PIECES):
+            builder = build_streamed_pdf
+        else:
+            builder = partial(build_detailed_pdf, compact_min=self.settings.get("pdf_compact_min_pieces", COMPACT_MIN_PIECES))
+        self._export_pdf(builder, "detailed_quote.pdf", self.t("pdf_detailed"))
+
+    def generate_simple_pdf(self):
+        from pdf_export import build_simple_pdf
+
+        self._export_pdf(build_simple_pdf, "simple_quote.pdf", self.t("pdf_simple"))
+
+    def _create_job_bar(self):
+        """Status bar with progress and cancel, shown while background jobs run."""
+        self.job_bar = tk.Frame(self.root, bg="#e5e7eb")
+        self.job_label = tk.Label(self.job_bar, text="", font=("Helvetica", 10), bg="#e5e7eb", fg="#111827")
+        self.job_label.pack(side=tk.LEFT, padx=(20, 10), pady=6)
+        self.job_progress = ttk.Progressbar(self.job_bar, length=240, mode="determinate", maximum=100)
+        self.job_progress.pack(side=tk.LEFT, pady=6)
+        self.tr(tk.Button(
+            self.job_bar,
+            command=self.jobs.cancel_all,
+            bg="#ef4444",
+            fg="white",
+            font=("Helvetica", 9, "bold"),
+            relief=tk.FLAT,
+            padx=10,
+            pady=2,
+            cursor="hand2",
+        ), "cancel").pack(side=tk.LEFT, padx=10, pady=6)
 
-def _tk_report_callback_exception(exc, val, tb):
+    def _on_jobs_progress(self, jobs):
+        if not jobs:
+            self.job_progress.stop()
+            self.job_bar.pack_forget()
+            return
+        if not self.job_bar.winfo_ismapped():
+            self.job_bar.pack(side=tk.BOTTOM, fill=tk.X, before=self.main_container)
+
+        label = jobs[0].label or self.t("working")
+        if len(jobs) > 1:
+            label += f" (+{len(jobs) - 1})"
+        self.job_label.configure(text=label)
+
+        total = sum(job.total for job in jobs)
+        if total == len(jobs):
+            # Single-task jobs have no intermediate progress: show activity instead.
+            if str(self.job_progress.cget("mode")) != "indeterminate":
+                self.job_progress.configure(mode="indeterminate")
+                self.job_progress.start(15)
+        else:
+            if str(self.job_progress.cget("mode")) != "determinate":
+                self.job_progress.stop()
+                self.job_progress.configure(mode="determinate")
+            self.job_progress["value"] = 100 * sum(job.done_count for job in jobs) / total
+
+def _tk_report_callback_exception(exc, val, tb, settings=None):
     """Surface Tkinter callback exceptions instead of failing silently."""
     import traceback
 
     traceback.print_exception(exc, val, tb)
     try:
-        lang = load_settings().get("language", "fr")
+        # Use the running app's settings cache; only read the DB if the app isn't up yet.
+        lang = (settings if settings is not None else load_settings()).get("language", "fr")
         strings = I18N.get(lang, I18N["fr"])
         messagebox.showerror(
             strings.get("unexpected_error", "Unexpected error"),
@@ -1612,10 +2063,78 @@ def _tk_report_callback_exception(exc, val, tb):
         pass
 
 
+# Sub-commands that run without the GUI (see `_run_headless`).
+HEADLESS_COMMANDS = ("quote", "serve", "simulate", "export")
+
+# Methods traced by `--profile` (startup phases, then hot paths). They are only
+# wrapped when profiling is on; a normal run calls them directly.
+PROFILED_STARTUP = (
+    "__init__", "_load_branding_assets", "show_splash_screen", "_finish_startup", "show_mode_selection", "create_ui",
+)
+PROFILED_HOT_PATHS = (
+    "calculate_and_show_results", "recalculate", "update_pieces_list", "apply_language", "import_files", "_run_preview",
+    "_layout_result_cards", "_render_visible_cards", "_load_history_page", "generate_detailed_pdf",
+    "generate_simple_pdf", "generate_image", "generate_all_receipts", "export_history_pdfs",
+)
+
+
+def _parse_gui_args(argv):
+    parser = argparse.ArgumentParser(prog="fabricost", description="FabriCost 3D printing and laser cutting calculator.")
+    parser.add_argument(
+        "--profile", nargs="?", const="fabricost_trace.json", metavar="TRACE.json",
+        help="Record startup phases, hot paths and background jobs as a Chrome trace (Ctrl+Shift+P toggles cProfile)",
+    )
+    parser.add_argument(
+        "--watchdog", nargs="?", type=int, const=200, metavar="BUDGET_MS",
+        help="Log Tk callbacks that block the event loop longer than BUDGET_MS (default 200; Ctrl+Shift+L shows lag)",
+    )
+    return parser.parse_known_args(argv)[0]
+
+
+def _enable_profiling(path):
+    """Instrument the app classes for `--profile`; returns the tracer."""
+    import profiling
+
+    tracer = profiling.enable(path)
+    tracer.complete("imports", _IMPORTS_STARTED_US, _IMPORTS_DONE_US, cat="startup")
+    profiling.instrument(tracer, SettingsStore, ["__init__"], cat="startup")
+    profiling.instrument(tracer, PrintCalculatorApp, PROFILED_STARTUP, cat="startup")
+    profiling.instrument(tracer, PrintCalculatorApp, PROFILED_HOT_PATHS, cat="hot")
+    profiling.instrument_jobs(tracer, JobRunner)
+    print(f"[profile] Tracing to {tracer.path} (Ctrl+Shift+P toggles a cProfile capture)")
+    return tracer
+
+
+def _run_headless(command, argv):
+    """Run a headless sub-command. Plain imports, so PyInstaller bundles every command module."""
+    if command == "quote":
+        from quote_cli import run
+    elif command == "serve":
+        from quote_server import run
+    elif command == "simulate":
+        from gcode_sim import run
+    else:
+        from batch_export import run
+    return run(argv)
+
+
 def main():
+    # Required for the export process pool in frozen (PyInstaller) builds.
+    multiprocessing.freeze_support()
+
+    # Headless sub-commands (e.g. `main.py quote pieces.csv`) never create a Tk root.
+    if len(sys.argv) > 1 and sys.argv[1] in HEADLESS_COMMANDS:
+        sys.exit(_run_headless(sys.argv[1], sys.argv[2:]))
+
+    args = _parse_gui_args(sys.argv[1:])
+    tracer = _enable_profiling(args.profile) if args.profile else None
+
     # NOTE: Without creating a Tk root and starting the mainloop, the script exits immediately.
     print("[startup] Launching 3D & Laser Calculator...")
+    tk_started = time.perf_counter_ns() // 1000
     root = tk.Tk()
+    if tracer is not None:
+        tracer.complete("tk.Tk", tk_started, cat="startup")
     # Start maximized (Windows). Fallback to fullscreen on other platforms.
     try:
         root.state("zoomed")
@@ -1626,6 +2145,16 @@ def main():
             pass
     root.report_callback_exception = _tk_report_callback_exception
     app = PrintCalculatorApp(root)
+    root.report_callback_exception = partial(_tk_report_callback_exception, settings=app.settings)
+    if tracer is not None:
+        # Idle callbacks run in order: this one fires once the startup work has finished.
+        root.after_idle(lambda: tracer.instant("interactive", cat="startup"))
+        root.bind_all("<Control-P>", tracer.toggle_cprofile)
+    watchdog = None
+    if args.watchdog:
+        import lag_watchdog
+
+        watchdog = lag_watchdog.enable(root, args.watchdog)
 
     # Ensure settings are flushed to disk when the window is closed.
     def _on_close():
@@ -1633,6 +2162,15 @@ def main():
             app.save_current_settings()
         except Exception:
             pass
+        if watchdog is not None:
+            watchdog.stop()
+            print(f"[watchdog] {watchdog.summary()}")
+        try:
+            app.close_history()
+            app.jobs.shutdown()
+            app.settings.close()
+        except Exception:
+            pass
         root.destroy()
 
     root.protocol("WM_DELETE_WINDOW", _on_close)
@@ -0,0 +1,388 @@
+"""
+PDF quotes for FabriCost.
+
+Plain functions of (output path, mode, language, rules, pieces) with no Tk
+state, so the GUI can render them in a worker process and headless tools can
+call them directly. `pieces` are the GUI piece dicts (id, grams, hours,
+minutes and the priced `result`).
+
+Large orders switch the detailed quote to a compact layout: a single
+`LongTable` with one row per piece and a repeating header instead of one
+table per piece, which keeps Platypus layout time roughly linear. Huge
+orders skip Platypus altogether: `build_streamed_pdf` draws the same rows
+straight onto a canvas page by page from an iterator of pieces, so neither
+the pieces nor a story are held in memory. The canvas still keeps every
+page's content until it is saved, so memory grows with the page count
+(about 0.7 KB per piece).
+"""
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas
+from reportlab.platypus import LongTable, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from i18n import translate
+
+
+# Detailed quotes with at least this many priced pieces use the compact layout.
+COMPACT_MIN_PIECES = 200
+
+# Styles and column widths are built once and shared by every table.
+COL_WIDTHS = [10*cm, 6*cm]
+
+PIECE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4f46e5')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('TOPPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, 1), colors.HexColor('#e0e7ff')),
+    ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#ecfdf5')),
+    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+    ('TOPPADDING', (0, -1), (-1, -1), 12),
+    ('BOTTOMPADDING', (0, -1), (-1, -1), 12),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+])
+
+SIMPLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4f46e5')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 14),
+    ('FONTSIZE', (0, 1), (-1, -1), 12),
+    ('TOPPADDING', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('TOPPADDING', (0, 1), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 10),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
+])
+
+TOTAL_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#10b981')),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 16),
+    ('TOPPADDING', (0, 0), (-1, -1), 15),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 15),
+])
+
+# Compact layout: range commands only (no per-row entries), so the style cost
+# does not depend on the number of pieces.
+COMPACT_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4f46e5')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 8),
+    ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+    ('FONTNAME', (-1, 1), (-1, -1), 'Helvetica-Bold'),
+    ('TOPPADDING', (0, 0), (-1, -1), 2),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+    ('GRID', (0, 0), (-1, -1), 0.25, colors.HexColor('#9ca3af')),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f3f4f6')]),
+])
+
+# Detailed quotes with at least this many pieces are drawn by the streaming writer.
+STREAM_MIN_PIECES = 20000
+
+COMPACT_COLUMNS = {
+    "3d": (['Piece', 'Weight', 'Time', 'Gramage', 'Time Price', 'Subtotal', 'Markup', 'Final Price'],
+           [1.6*cm, 1.8*cm, 2.2*cm, 2.0*cm, 2.0*cm, 2.0*cm, 2.0*cm, 2.4*cm]),
+    "laser": (['Piece', 'Time', 'Time Price', 'Subtotal', 'Markup', 'Final Price'],
+              [2.2*cm, 2.8*cm, 2.6*cm, 2.6*cm, 2.6*cm, 3.2*cm]),
+}
+
+
+def _quote_title(mode, lang, styles):
+    # Title (3D vs Laser)
+    quote_key = "quote_title_laser" if mode == "laser" else "quote_title"
+    return Paragraph(f"<b>{translate(lang, quote_key)}</b>", styles['Title'])
+
+
+def _total_table(total):
+    # Total with proper padding
+    return Table([['TOTAL', f"{total:.2f} DT"]], colWidths=COL_WIDTHS, style=TOTAL_STYLE)
+
+
+def _compact_row(mode, piece):
+    result = piece['result']
+    time_text = f"{piece['hours']}h {piece['minutes']}min"
+    if mode == "laser":
+        return [
+            str(piece['id']), time_text, f"{result['time_price']:.2f}", f"{result['subtotal']:.2f}",
+            f"{result['markup_amount']:.2f}", f"{result['final_price']:.2f} DT",
+        ]
+    return [
+        str(piece['id']), f"{piece['grams']}g", time_text, f"{result['gram_price']:.2f}",
+        f"{result['time_price']:.2f}", f"{result['subtotal']:.2f}",
+        f"{result['markup_amount']:.2f}", f"{result['final_price']:.2f} DT",
+    ]
+
+
+def _compact_table(mode, pieces):
+    """One row per priced piece; returns (LongTable, total)."""
+    header, widths = COMPACT_COLUMNS["laser" if mode == "laser" else "3d"]
+    rows = [header]
+    total = 0
+    for piece in pieces:
+        if piece['result']:
+            rows.append(_compact_row(mode, piece))
+            total += piece['result']['final_price']
+    # Fixed widths and row heights spare Platypus from measuring every cell.
+    heights = [16] + [13] * (len(rows) - 1)
+    return LongTable(rows, colWidths=widths, rowHeights=heights, repeatRows=1, style=COMPACT_STYLE), total
+
+
+def build_compact_pdf(path, mode, lang, rules, pieces):
+    """Write the detailed quote of a large order as a single table, one row per piece."""
+    return build_detailed_pdf(path, mode, lang, rules, pieces, compact_min=0)
+
+
+class _StreamWriter:
+    """Canvas drawing for `build_streamed_pdf`: compact-layout rows, page breaks and running totals."""
+
+    ROW_HEIGHT = 13
+    HEADER_HEIGHT = 16
+    MARGIN = 2*cm
+
+    def __init__(self, path, mode):
+        self.header, self.widths = COMPACT_COLUMNS["laser" if mode == "laser" else "3d"]
+        self.page_width, self.page_height = A4
+        self.left = (self.page_width - sum(self.widths)) / 2
+        self.right = self.left + sum(self.widths)
+        # Text anchors: the piece column is left-aligned, the others right-aligned.
+        self.anchors = [self.left + 4] + [
+            self.left + sum(self.widths[:i + 1]) - 4 for i in range(1, len(self.widths))
+        ]
+        self.canvas = canvas.Canvas(str(path), pagesize=A4, pageCompression=1)
+        self.page = 1
+        self.y = self.page_height - self.MARGIN
+        self.rows_on_page = 0
+
+    def text_line(self, text, font='Helvetica', size=10, centered=False, gap=14):
+        self.canvas.setFont(font, size)
+        self.canvas.setFillColor(colors.black)
+        if centered:
+            self.canvas.drawCentredString(self.page_width / 2, self.y - size, text)
+        else:
+            self.canvas.drawString(self.left, self.y - size, text)
+        self.y -= gap
+
+    def _band(self, height, color):
+        """Fill a full-width band below the cursor and move the cursor under it."""
+        self.y -= height
+        self.canvas.setFillColor(color)
+        self.canvas.rect(self.left, self.y, self.right - self.left, height, stroke=0, fill=1)
+
+    def _cells(self, cells, baseline):
+        c = self.canvas
+        c.drawString(self.anchors[0], baseline, cells[0])
+        for x, text in zip(self.anchors[1:], cells[1:]):
+            c.drawRightString(x, baseline, text)
+
+    def table_header(self):
+        self._band(self.HEADER_HEIGHT, colors.HexColor('#4f46e5'))
+        self.canvas.setFillColor(colors.whitesmoke)
+        self.canvas.setFont('Helvetica-Bold', 8)
+        self._cells(self.header, self.y + 5)
+
+    def has_room(self):
+        # Keep one row free at the bottom for the "carried forward" line.
+        return self.y - 2 * self.ROW_HEIGHT >= self.MARGIN
+
+    def row(self, cells):
+        if self.rows_on_page % 2:
+            self._band(self.ROW_HEIGHT, colors.HexColor('#f3f4f6'))
+        else:
+            self.y -= self.ROW_HEIGHT
+        self.canvas.setFillColor(colors.black)
+        self.canvas.setFont('Helvetica', 8)
+        self._cells(cells, self.y + 4)
+        self.rows_on_page += 1
+
+    def running_total(self, label, total):
+        self._band(self.ROW_HEIGHT, colors.HexColor('#e0e7ff'))
+        self.canvas.setFillColor(colors.black)
+        self.canvas.setFont('Helvetica-Bold', 8)
+        self.canvas.drawString(self.anchors[0], self.y + 4, label)
+        self.canvas.drawRightString(self.anchors[-1], self.y + 4, f"{total:.2f} DT")
+
+    def _end_page(self):
+        self.canvas.setFont('Helvetica', 8)
+        self.canvas.setFillColor(colors.HexColor('#6b7280'))
+        self.canvas.drawCentredString(self.page_width / 2, self.MARGIN / 2, f"Page {self.page}")
+        self.canvas.showPage()
+        self.page += 1
+        self.y = self.page_height - self.MARGIN
+        self.rows_on_page = 0
+
+    def page_break(self, total):
+        self.running_total("Carried forward", total)
+        self._end_page()
+        self.running_total("Brought forward", total)
+        self.table_header()
+
+    def total_box(self, total):
+        if self.y - 50 < self.MARGIN:
+            self._end_page()
+        self.y -= 10
+        self._band(40, colors.HexColor('#10b981'))
+        self.canvas.setFillColor(colors.whitesmoke)
+        self.canvas.setFont('Helvetica-Bold', 16)
+        self.canvas.drawString(self.left + 10, self.y + 14, 'TOTAL')
+        self.canvas.drawRightString(self.right - 10, self.y + 14, f"{total:.2f} DT")
+
+    def save(self):
+        self._end_page()
+        self.canvas.save()
+
+
+def build_streamed_pdf(path, mode, lang, rules, pieces):
+    """
+    Write the detailed quote in the compact layout straight onto a canvas.
+
+    `pieces` may be any iterable (a generator over a database cursor, say):
+    rows are drawn as they arrive and no flowable story is built. Pages are
+    compressed when the canvas is saved, so the drawn pages are held until
+    then: peak memory is about 7 MB at 10k pieces and 67 MB at 100k.
+    The running total is carried across page breaks.
+    """
+    t = lambda key: translate(lang, key)
+    writer = _StreamWriter(path, mode)
+
+    quote_key = "quote_title_laser" if mode == "laser" else "quote_title"
+    writer.text_line(t(quote_key), font='Helvetica-Bold', size=18, centered=True, gap=36)
+    writer.text_line(t('pricing_rules'), font='Helvetica-Bold')
+    if mode != "laser":
+        writer.text_line(f"{t('rule_gram_price')} {rules.gram_price} DT/g")
+    writer.text_line(f"{t('rule_normal_hour')} {rules.normal_hour_price} DT/h")
+    if mode != "laser":
+        writer.text_line(
+            f"{t('rule_exceed_hour')} {rules.exceed_hour_price} DT/h ({t('rule_threshold')} {rules.exceed_threshold}h)"
+        )
+    writer.text_line(f"{t('rule_markup')} {rules.markup_percent}%", gap=24)
+    writer.table_header()
+
+    total = 0
+    for piece in pieces:
+        if not piece['result']:
+            continue
+        if not writer.has_room():
+            writer.page_break(total)
+        writer.row(_compact_row(mode, piece))
+        total += piece['result']['final_price']
+
+    writer.total_box(total)
+    writer.save()
+    return str(path)
+
+
+def build_detailed_pdf(path, mode, lang, rules, pieces, compact_min=COMPACT_MIN_PIECES):
+    """
+    Write the detailed quote (rules summary and one breakdown table per piece)
+    to `path`. From `compact_min` priced pieces on, the pieces are laid out
+    in a single compact table instead.
+    """
+    t = lambda key: translate(lang, key)
+    doc = SimpleDocTemplate(str(path), pagesize=A4, topMargin=2*cm, bottomMargin=2*cm)
+    story = []
+    styles = getSampleStyleSheet()
+
+    story.append(_quote_title(mode, lang, styles))
+    story.append(Spacer(1, 0.5*cm))
+
+    # Rules summary
+    if mode == "laser":
+        rules_text = f"""
+        <b>{t('pricing_rules')}</b><br/>
+        {t('rule_normal_hour')} {rules.normal_hour_price} DT/h<br/>
+        {t('rule_markup')} {rules.markup_percent}%
+        """
+    else:
+        rules_text = f"""
+        <b>{t('pricing_rules')}</b><br/>
+        {t('rule_gram_price')} {rules.gram_price} DT/g<br/>
+        {t('rule_normal_hour')} {rules.normal_hour_price} DT/h<br/>
+        {t('rule_exceed_hour')} {rules.exceed_hour_price} DT/h ({t('rule_threshold')} {rules.exceed_threshold}h)<br/>
+        {t('rule_markup')} {rules.markup_percent}%
+        """
+    story.append(Paragraph(rules_text, styles['Normal']))
+    story.append(Spacer(1, 0.8*cm))
+
+    if sum(1 for piece in pieces if piece['result']) >= compact_min:
+        table, total = _compact_table(mode, pieces)
+        story.append(table)
+        story.append(Spacer(1, 0.8*cm))
+        story.append(_total_table(total))
+        doc.build(story)
+        return str(path)
+
+    # Each piece
+    total = 0
+    for piece in pieces:
+        if piece['result']:
+            result = piece['result']
+
+            if mode == "laser":
+                data = [
+                    ['Item', 'Value'],
+                    [f"Piece {piece['id']}", ''],
+                    ['Time', f"{piece['hours']}h {piece['minutes']}min"],
+                    ['Time Price', f"{result['time_price']:.2f} DT"],
+                    ['Subtotal', f"{result['subtotal']:.2f} DT"],
+                    ['Markup', f"{result['markup_amount']:.2f} DT"],
+                    ['Final Price', f"{result['final_price']:.2f} DT"],
+                ]
+            else:
+                data = [
+                    ['Item', 'Value'],
+                    [f"Piece {piece['id']}", ''],
+                    ['Weight', f"{piece['grams']}g"],
+                    ['Time', f"{piece['hours']}h {piece['minutes']}min"],
+                    ['Gramage Price', f"{result['gram_price']:.2f} DT"],
+                    ['Time Price', f"{result['time_price']:.2f} DT"],
+                    ['Subtotal', f"{result['subtotal']:.2f} DT"],
+                    ['Markup', f"{result['markup_amount']:.2f} DT"],
+                    ['Final Price', f"{result['final_price']:.2f} DT"],
+                ]
+
+            story.append(Table(data, colWidths=COL_WIDTHS, style=PIECE_STYLE))
+            story.append(Spacer(1, 0.8*cm))
+
+            total += result['final_price']
+
+    story.append(_total_table(total))
+    doc.build(story)
+    return str(path)
+
+
+def build_simple_pdf(path, mode, lang, rules, pieces):
+    """Write the simple quote (one line per piece with its final price) to `path`."""
+    doc = SimpleDocTemplate(str(path), pagesize=A4, topMargin=2*cm, bottomMargin=2*cm)
+    story = []
+    styles = getSampleStyleSheet()
+
+    story.append(_quote_title(mode, lang, styles))
+    story.append(Spacer(1, 1*cm))
+
+    # Simple table with only prices
+    data = [['Piece', 'Final Price']]
+
+    total = 0
+    for piece in pieces:
+        if piece['result']:
+            result = piece['result']
+            data.append([f"Piece {piece['id']}", f"{result['final_price']:.2f} DT"])
+            total += result['final_price']
+
+    story.append(LongTable(data, colWidths=COL_WIDTHS, repeatRows=1, style=SIMPLE_STYLE))
+    story.append(Spacer(1, 1*cm))
+    story.append(_total_table(total))
+    doc.build(story)
+    return str(path)
@@ -0,0 +1,266 @@
+"""
+Headless pricing engine for FabriCost.
+
+The GUI, the batch CLI and the quote server all price pieces through this
+module so the formula only lives in one place. Rules are captured once into an
+immutable `PricingRules` snapshot (no Tk variables involved), then either a
+single piece is priced with `price_piece` or whole columns of pieces are priced
+at once with `price_batch`.
+"""
+
+from dataclasses import dataclass, asdict
+
+
+# Factory defaults for calculators (used on first run and for 'restore defaults').
+FACTORY_3D_RULES = {
+    "gram_price": 0.1,
+    "normal_hour_price": 3.0,
+    "exceed_hour_price": 2.0,
+    "exceed_threshold": 10.0,
+    "markup_percent": 20.0,
+}
+
+FACTORY_LASER_RULES = {
+    "normal_hour_price": 30.0,
+    "markup_percent": 5.0,
+}
+
+MODES = ("3d", "laser")
+
+# Below this many pieces NumPy's per-call overhead outweighs vectorization.
+VECTOR_MIN_ROWS = 64
+
+# Keys of a single priced result, in the order they are displayed/exported.
+RESULT_KEYS = (
+    "total_hours",
+    "gram_price",
+    "time_price",
+    "exceeded",
+    "subtotal",
+    "markup_amount",
+    "final_price",
+)
+
+
+@dataclass(frozen=True)
+class PricingRules:
+    """Immutable snapshot of the pricing rules for one calculator mode."""
+
+    mode: str = "3d"
+    gram_price: float = FACTORY_3D_RULES["gram_price"]
+    normal_hour_price: float = FACTORY_3D_RULES["normal_hour_price"]
+    exceed_hour_price: float = FACTORY_3D_RULES["exceed_hour_price"]
+    exceed_threshold: float = FACTORY_3D_RULES["exceed_threshold"]
+    markup_percent: float = FACTORY_3D_RULES["markup_percent"]
+
+    @classmethod
+    def from_dict(cls, mode, rules):
+        """
+        Build a snapshot from a `FACTORY_3D_RULES`/`FACTORY_LASER_RULES` shaped dict.
+
+        Laser rules only carry an hourly price and a markup; the remaining fields
+        are filled the same way `start_laser_calculator` fills the Tk variables.
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown pricing mode: {mode!r}")
+        if mode == "laser":
+            base = {**FACTORY_LASER_RULES, **rules}
+            hour_price = float(base["normal_hour_price"])
+            return cls(
+                mode="laser",
+                gram_price=0.0,
+                normal_hour_price=hour_price,
+                exceed_hour_price=hour_price,
+                exceed_threshold=9999.0,
+                markup_percent=float(base["markup_percent"]),
+            )
+        base = {**FACTORY_3D_RULES, **rules}
+        return cls(mode="3d", **{key: float(base[key]) for key in FACTORY_3D_RULES})
+
+    def as_dict(self):
+        """Return the rules in the same shape as the factory dict for this mode."""
+        data = asdict(self)
+        keys = FACTORY_LASER_RULES if self.mode == "laser" else FACTORY_3D_RULES
+        return {key: data[key] for key in keys}
+
+
+def rules_from_settings(settings, mode):
+    """
+    Read the persisted default rules of a mode from a flat settings dict.
+
+    Settings keys are prefixed with the mode (`3d_gram_price`,
+    `laser_markup_percent`, ...) exactly as `save_current_settings` writes them;
+    missing keys fall back to the factory defaults.
+    """
+    factory = FACTORY_LASER_RULES if mode == "laser" else FACTORY_3D_RULES
+    rules = {key: float(settings.get(f"{mode}_{key}", default)) for key, default in factory.items()}
+    return PricingRules.from_dict(mode, rules)
+
+
+def price_piece(rules, grams, hours, minutes):
+    """Price a single piece and return the result dict used by the UI and exports."""
+    total_hours = hours + (minutes / 60)
+
+    if rules.mode == "laser":
+        # Laser: ignore grams, single hourly rate.
+        gram_price = 0.0
+        time_price = total_hours * rules.normal_hour_price
+        exceeded = False
+        subtotal = time_price
+    else:
+        gram_price = grams * rules.gram_price
+
+        if total_hours > rules.exceed_threshold:
+            time_price = total_hours * rules.exceed_hour_price
+            exceeded = True
+        else:
+            time_price = total_hours * rules.normal_hour_price
+            exceeded = False
+
+        subtotal = gram_price + time_price
+
+    markup_amount = subtotal * (rules.markup_percent / 100)
+    final_price = subtotal + markup_amount
+
+    return {
+        'total_hours': total_hours,
+        'gram_price': gram_price,
+        'time_price': time_price,
+        'exceeded': exceeded,
+        'subtotal': subtotal,
+        'markup_amount': markup_amount,
+        'final_price': final_price
+    }
+
+
+def rules_affect_piece(old, new, grams, total_hours):
+    """
+    Whether switching from `old` to `new` rules can change the price of a piece.
+
+    Used to re-price only the pieces a rule edit actually touches: a laser piece
+    ignores the gram price, a piece under the threshold ignores the exceed-hour
+    price (unless the new threshold moves it across), and so on.
+    """
+    if old == new:
+        return False
+    if old.mode != new.mode or old.markup_percent != new.markup_percent:
+        return True
+    if new.mode == "laser":
+        return old.normal_hour_price != new.normal_hour_price
+    if grams and old.gram_price != new.gram_price:
+        return True
+    exceeded = total_hours > old.exceed_threshold
+    if exceeded != (total_hours > new.exceed_threshold):
+        return True
+    if not total_hours:
+        return False
+    if exceeded:
+        return old.exceed_hour_price != new.exceed_hour_price
+    return old.normal_hour_price != new.normal_hour_price
+
+
+def price_batch(rules, grams, hours, minutes):
+    """
+    Price whole columns of pieces at once.
+
+    `grams`, `hours` and `minutes` are array-likes of equal length (`grams` may be
+    None in laser mode). Returns a dict of NumPy arrays keyed like the
+    `price_piece` result, computed with the same operation order so every
+    element is bit-for-bit identical to the scalar path.
+    """
+    import numpy as np
+
+    hours = np.asarray(hours, dtype=np.float64)
+    minutes = np.asarray(minutes, dtype=np.float64)
+    total_hours = hours + (minutes / 60)
+
+    if rules.mode == "laser":
+        gram_price = np.zeros_like(total_hours)
+        time_price = total_hours * rules.normal_hour_price
+        exceeded = np.zeros(total_hours.shape, dtype=bool)
+        subtotal = time_price
+    else:
+        grams = np.asarray(grams, dtype=np.float64)
+        gram_price = grams * rules.gram_price
+        exceeded = total_hours > rules.exceed_threshold
+        time_price = total_hours * np.where(exceeded, rules.exceed_hour_price, rules.normal_hour_price)
+        subtotal = gram_price + time_price
+
+    markup_amount = subtotal * (rules.markup_percent / 100)
+    final_price = subtotal + markup_amount
+
+    return {
+        'total_hours': total_hours,
+        'gram_price': gram_price,
+        'time_price': time_price,
+        'exceeded': exceeded,
+        'subtotal': subtotal,
+        'markup_amount': markup_amount,
+        'final_price': final_price
+    }
+
+
+def iter_results(columns):
+    """Yield per-piece result dicts (plain Python scalars) from `price_batch` output."""
+    lists = [columns[key].tolist() for key in RESULT_KEYS]
+    for row in zip(*lists):
+        yield dict(zip(RESULT_KEYS, row))
+
+
+def parse_number(value):
+    """Parse a numeric input field; empty values become None (like an empty Entry in the GUI)."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    text = str(value).strip()
+    return float(text) if text else None
+
+
+def parse_piece(mode, record):
+    """Return (grams, hours, minutes) for a record, or raise ValueError like the GUI does."""
+    hours = parse_number(record.get("hours"))
+    minutes = parse_number(record.get("minutes"))
+    # Only error if BOTH hours and minutes are empty.
+    if hours is None and minutes is None:
+        raise ValueError("hours/minutes missing")
+    if mode == "laser":
+        grams = 0.0
+    else:
+        grams = parse_number(record.get("grams"))
+        if grams is None:
+            raise ValueError("grams missing")
+    return grams, hours or 0.0, minutes or 0.0
+
+
+def price_records(rules, records):
+    """
+    Validate and price a list of input records (dicts with grams/hours/minutes).
+
+    Small lists are priced piece by piece, larger ones through `price_batch`;
+    both paths give identical numbers. Returns a list of (record, result)
+    pairs where `result` is the priced dict, or a string describing why the
+    record could not be priced.
+    """
+    parsed = []
+    valid = []
+    for index, record in enumerate(records):
+        if not isinstance(record, dict):
+            parsed.append("invalid record")
+            continue
+        try:
+            parsed.append(parse_piece(rules.mode, record))
+            valid.append(index)
+        except (TypeError, ValueError) as exc:
+            parsed.append(str(exc) or "invalid number")
+
+    if len(valid) >= VECTOR_MIN_ROWS:
+        grams, hours, minutes = zip(*(parsed[i] for i in valid))
+        columns = price_batch(rules, grams, hours, minutes)
+        for index, result in zip(valid, iter_results(columns)):
+            parsed[index] = result
+    else:
+        for index in valid:
+            parsed[index] = price_piece(rules, *parsed[index])
+
+    return [(record if isinstance(record, dict) else {}, result) for record, result in zip(records, parsed)]
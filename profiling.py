@@ -0,0 +1,137 @@
+"""
+Opt-in profiling for the FabriCost GUI (`python main.py --profile [TRACE.json]`).
+
+Startup phases, hot paths and background jobs are recorded as Chrome
+trace events (open the JSON in chrome://tracing or https://ui.perfetto.dev).
+Nothing is instrumented unless profiling is enabled: `instrument` swaps
+wrapped methods into a class at runtime, so the normal code paths carry no
+wrappers or flag checks at all. While profiling, Ctrl+Shift+P starts and
+stops a cProfile capture that is dumped next to the trace.
+"""
+
+import atexit
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+
+DEFAULT_TRACE_PATH = "fabricost_trace.json"
+
+
+class Tracer:
+    """Collects complete ("X") and instant ("i") trace events; timestamps in microseconds."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.events = []
+        self.pid = os.getpid()
+        self._profile = None
+        self._profile_count = 0
+
+    @staticmethod
+    def now():
+        return time.perf_counter_ns() // 1000
+
+    def complete(self, name, start, end=None, cat="app", args=None):
+        """Record a span from `start` to `end` (µs, `now()` scale)."""
+        event = {
+            "name": name, "cat": cat, "ph": "X", "ts": start, "dur": (end or self.now()) - start,
+            "pid": self.pid, "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        # list.append is atomic, so worker threads can record too.
+        self.events.append(event)
+
+    def instant(self, name, cat="app"):
+        self.events.append({
+            "name": name, "cat": cat, "ph": "i", "s": "p", "ts": self.now(),
+            "pid": self.pid, "tid": threading.get_ident(),
+        })
+
+    def write(self):
+        threads = {event["tid"] for event in self.events}
+        names = [
+            {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid,
+             "args": {"name": "main" if tid == threading.main_thread().ident else f"thread {tid}"}}
+            for tid in threads
+        ]
+        self.path.write_text(
+            json.dumps({"traceEvents": names + self.events, "displayTimeUnit": "ms"}), encoding="utf-8"
+        )
+        return self.path
+
+    def toggle_cprofile(self, event=None):
+        """Start a cProfile capture, or stop the running one and dump it; returns the dump path or None."""
+        if self._profile is None:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+            self.instant("cprofile start", cat="profile")
+            print("[profile] cProfile capture started")
+            return None
+        self._profile.disable()
+        self._profile_count += 1
+        dump = self.path.with_name(f"{self.path.stem}_{self._profile_count}.prof")
+        self._profile.dump_stats(dump)
+        self._profile = None
+        self.instant("cprofile stop", cat="profile")
+        print(f"[profile] cProfile capture written to {dump}")
+        return dump
+
+
+def _wrap(tracer, fn, name, cat):
+    @functools.wraps(fn)
+    def traced(*args, **kwargs):
+        start = tracer.now()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            tracer.complete(name, start, cat=cat)
+    return traced
+
+
+def instrument(tracer, cls, method_names, cat="app"):
+    """Replace `cls.<name>` with a traced wrapper for each name (before instances bind them)."""
+    for name in method_names:
+        fn = getattr(cls, name, None)
+        if fn is not None:
+            setattr(cls, name, _wrap(tracer, fn, f"{cls.__name__}.{name}", cat))
+
+
+def instrument_jobs(tracer, runner_cls):
+    """Trace background jobs from submission to delivery of their result on the Tk thread."""
+    track, deliver = runner_cls._track, runner_cls._deliver
+
+    def _track(self, job):
+        job.trace_start = tracer.now()
+        return track(self, job)
+
+    def _deliver(self, job):
+        start = tracer.now()
+        try:
+            return deliver(self, job)
+        finally:
+            tracer.complete(
+                job.label or "job", getattr(job, "trace_start", start), start, cat="job", args={"tasks": job.total}
+            )
+            tracer.complete("deliver", start, cat="job")
+
+    runner_cls._track = _track
+    runner_cls._deliver = _deliver
+
+
+def enable(path=DEFAULT_TRACE_PATH):
+    """Create the tracer and write the trace when the process exits."""
+    tracer = Tracer(path)
+
+    def _write():
+        if tracer._profile is not None:
+            tracer.toggle_cprofile()
+        print(f"[profile] Trace written to {tracer.write()}")
+
+    atexit.register(_write)
+    return tracer
@@ -0,0 +1,287 @@
+"""
+Headless batch quoting: `python main.py quote pieces.csv -o priced.csv`.
+
+Pieces are streamed from a CSV or JSONL file (or stdin) in fixed-size chunks,
+priced with the vectorized engine in `pricing.py` and written out chunk by
+chunk, so memory stays flat no matter how many rows come in. Rules default to
+the ones saved by the desktop app in the settings database.
+
+Input rows need `hours` and/or `minutes` columns, plus `grams` in 3D mode.
+Every other column (id, customer, ...) is passed through unchanged and the
+priced columns are appended. Rows that cannot be parsed are kept with an
+`error` column instead of aborting the run. For JSONL to CSV the input is read
+twice: once to collect the keys of every record for the CSV header, then to
+price it.
+"""
+
+import argparse
+import csv
+import io
+import json
+import shutil
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from pricing import (
+    FACTORY_3D_RULES,
+    FACTORY_LASER_RULES,
+    MODES,
+    RESULT_KEYS,
+    PricingRules,
+    price_records,
+    rules_from_settings,
+)
+from settings_store import load_settings
+
+
+FORMATS = ("csv", "jsonl")
+DEFAULT_CHUNK_SIZE = 10000
+ERROR_COLUMN = "error"
+
+
+def _guess_format(path, default="csv"):
+    if not path or path == "-":
+        return default
+    lower = str(path).lower()
+    if lower.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if lower.endswith(".csv"):
+        return "csv"
+    return default
+
+
+def _merge(record, result):
+    row = dict(record)
+    if isinstance(result, dict):
+        row.update(result)
+        row.pop(ERROR_COLUMN, None)
+    else:
+        row[ERROR_COLUMN] = result
+    return row
+
+
+def _parse_chunk(input_format, input_fields, text):
+    if input_format == "jsonl":
+        return list(_iter_jsonl(io.StringIO(text)))
+    return list(csv.DictReader(io.StringIO(text, newline=""), fieldnames=input_fields))
+
+
+def _chunk_keys(text):
+    """Keys of the JSONL records in one chunk, in first-seen order."""
+    keys = {}
+    for record in _iter_jsonl(io.StringIO(text)):
+        if isinstance(record, dict):
+            keys.update(dict.fromkeys(record))
+    return list(keys)
+
+
+def _quote_chunk(rules, input_format, input_fields, output_format, fieldnames, text):
+    """
+    Parse, price and serialize one chunk of raw input text.
+
+    Runs in a worker process when --workers > 1; only plain text crosses the
+    process boundary, so the parent process does nothing but line I/O.
+    """
+    priced = price_records(rules, _parse_chunk(input_format, input_fields, text))
+    errors = sum(1 for _, result in priced if not isinstance(result, dict))
+    out = io.StringIO()
+    if output_format == "jsonl":
+        for record, result in priced:
+            out.write(json.dumps(_merge(record, result), ensure_ascii=False))
+            out.write("\n")
+    else:
+        # `fieldnames` covers every key of the input; missing ones are left empty. Only the surplus
+        # cells of a ragged CSV row (DictReader's `None` key) are outside it, and those are dropped.
+        writer = csv.DictWriter(out, fieldnames=fieldnames, restval="", extrasaction="ignore", lineterminator="\n")
+        for record, result in priced:
+            writer.writerow(_merge(record, result))
+    return out.getvalue(), len(priced), errors
+
+
+def _output_fieldnames(input_fields):
+    fields = list(input_fields)
+    for key in RESULT_KEYS + (ERROR_COLUMN,):
+        if key not in fields:
+            fields.append(key)
+    return fields
+
+
+def _text_chunks(stream, size, quoted):
+    """
+    Group raw input lines into chunks of about `size` records.
+
+    With `quoted` (CSV), a chunk is only cut where the running count of `"` is
+    even, so a quoted field spanning several lines is never split in two.
+    """
+    lines = []
+    inside_quotes = False
+    for line in stream:
+        lines.append(line)
+        if quoted and line.count('"') % 2:
+            inside_quotes = not inside_quotes
+        if len(lines) >= size and not inside_quotes:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def _iter_jsonl(stream):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+
+def _map_chunks(func, chunks, workers):
+    """Apply `func` to each chunk in order, keeping at most 2 chunks per worker in flight."""
+    if workers <= 1:
+        for chunk in chunks:
+            yield func(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(func, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _resolve_rules(args, parser):
+    if args.factory_rules:
+        rules = PricingRules.from_dict(args.mode, {})
+    else:
+        rules = rules_from_settings(load_settings(), args.mode)
+
+    if not args.rule:
+        return rules
+
+    allowed = FACTORY_LASER_RULES if args.mode == "laser" else FACTORY_3D_RULES
+    overrides = rules.as_dict()
+    for item in args.rule:
+        key, sep, value = item.partition("=")
+        key = key.strip()
+        if not sep or key not in allowed:
+            parser.error(f"--rule expects KEY=VALUE with KEY in: {', '.join(allowed)}")
+        try:
+            overrides[key] = float(value)
+        except ValueError:
+            parser.error(f"--rule {key}: {value!r} is not a number")
+    return PricingRules.from_dict(args.mode, overrides)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="fabricost quote",
+        description="Price pieces from a CSV/JSONL file or stdin and stream priced rows out.",
+    )
+    parser.add_argument("input", nargs="?", default="-", help="Input file (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="Output file (default: stdout)")
+    parser.add_argument("--mode", choices=MODES, default="3d", help="Calculator mode (default: 3d)")
+    parser.add_argument("--input-format", choices=FORMATS, help="Input format (default: from extension, else csv)")
+    parser.add_argument("--output-format", choices=FORMATS, help="Output format (default: same as input)")
+    parser.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help=f"Rows priced per chunk (default: {DEFAULT_CHUNK_SIZE})"
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for pricing (default: 1)")
+    parser.add_argument(
+        "--rule", action="append", metavar="KEY=VALUE", help="Override a pricing rule, e.g. --rule gram_price=0.12"
+    )
+    parser.add_argument(
+        "--factory-rules", action="store_true", help="Start from factory rules instead of the saved settings"
+    )
+    return parser
+
+
+def run(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    rules = _resolve_rules(args, parser)
+    input_format = args.input_format or _guess_format(args.input)
+    output_format = args.output_format or _guess_format(args.output, default=input_format)
+
+    if args.input == "-":
+        source = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8-sig", newline="")
+    else:
+        source = open(args.input, "r", encoding="utf-8-sig", newline="")
+    if args.output == "-":
+        target = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline="", write_through=True)
+    else:
+        target = open(args.output, "w", encoding="utf-8", newline="")
+
+    started = time.perf_counter()
+    rows = errors = 0
+    spool = None
+    try:
+        if input_format == "csv":
+            input_fields = next(csv.reader(source), [])
+            chunks = _text_chunks(source, args.chunk_size, quoted=True)
+            fieldnames = _output_fieldnames(input_fields)
+        else:
+            input_fields = None
+            fieldnames = None
+            if output_format == "csv":
+                # JSONL has no header and records may have different keys: collect the keys of the
+                # whole input first, so the CSV header names all of them. A pipe is spooled to a
+                # temporary file for the second pass, which keeps memory flat.
+                stream = source
+                if not source.seekable():
+                    stream = spool = tempfile.TemporaryFile("w+", encoding="utf-8", newline="")
+                    shutil.copyfileobj(source, spool)
+                    spool.seek(0)
+                keys = {}
+                scan = _text_chunks(stream, args.chunk_size, quoted=False)
+                for chunk_keys in _map_chunks(_chunk_keys, scan, args.workers):
+                    keys.update(dict.fromkeys(chunk_keys))
+                fieldnames = _output_fieldnames(keys)
+                stream.seek(0)
+            chunks = _text_chunks(source if spool is None else spool, args.chunk_size, quoted=False)
+
+        if output_format == "csv":
+            csv.DictWriter(target, fieldnames=fieldnames, lineterminator="\n").writeheader()
+
+        work = partial(_quote_chunk, rules, input_format, input_fields, output_format, fieldnames)
+        for text, count, failed in _map_chunks(work, chunks, args.workers):
+            target.write(text)
+            rows += count
+            errors += failed
+    finally:
+        if spool is not None:
+            spool.close()
+        if args.input == "-":
+            source.detach()
+        else:
+            source.close()
+        if args.output == "-":
+            target.flush()
+            target.detach()
+        else:
+            target.close()
+
+    elapsed = time.perf_counter() - started
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    print(
+        f"[quote] {rows} rows priced ({errors} invalid) in {elapsed:.2f}s ({rate:,.0f} rows/s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
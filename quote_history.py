@@ -0,0 +1,214 @@
+"""
+Quote history for FabriCost.
+
+Every calculated quote (mode, rules snapshot, customer, notes, totals and its
+pieces) is kept in the settings SQLite database so it survives restarts and
+calculator resets. Customer and notes are full-text indexed with FTS5 (plain
+LIKE matching when the SQLite build lacks it), and history pages are fetched
+with keyset pagination on the quote id, so browsing 100k quotes only ever
+reads one page.
+"""
+
+import json
+import re
+import sqlite3
+from datetime import datetime
+
+from pricing import PricingRules
+from settings_store import SETTINGS_DB_PATH
+
+
+PAGE_SIZE = 50
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS quotes (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    customer TEXT NOT NULL DEFAULT '',
+    notes TEXT NOT NULL DEFAULT '',
+    rules TEXT NOT NULL,
+    piece_count INTEGER NOT NULL,
+    total_price REAL NOT NULL,
+    total_hours REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS quotes_mode_id ON quotes (mode, id);
+CREATE INDEX IF NOT EXISTS quotes_customer ON quotes (customer COLLATE NOCASE, id);
+CREATE TABLE IF NOT EXISTS quote_pieces (
+    quote_id INTEGER NOT NULL REFERENCES quotes (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    grams REAL NOT NULL,
+    hours REAL NOT NULL,
+    minutes REAL NOT NULL,
+    final_price REAL,
+    PRIMARY KEY (quote_id, position)
+) WITHOUT ROWID;
+"""
+
+# External-content FTS index over quotes(customer, notes), kept in sync by triggers.
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS quotes_fts USING fts5(
+    customer, notes, content='quotes', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS quotes_fts_insert AFTER INSERT ON quotes BEGIN
+    INSERT INTO quotes_fts (rowid, customer, notes) VALUES (new.id, new.customer, new.notes);
+END;
+CREATE TRIGGER IF NOT EXISTS quotes_fts_delete AFTER DELETE ON quotes BEGIN
+    INSERT INTO quotes_fts (quotes_fts, rowid, customer, notes) VALUES ('delete', old.id, old.customer, old.notes);
+END;
+CREATE TRIGGER IF NOT EXISTS quotes_fts_update AFTER UPDATE OF customer, notes ON quotes BEGIN
+    INSERT INTO quotes_fts (quotes_fts, rowid, customer, notes) VALUES ('delete', old.id, old.customer, old.notes);
+    INSERT INTO quotes_fts (rowid, customer, notes) VALUES (new.id, new.customer, new.notes);
+END;
+"""
+
+SUMMARY_COLUMNS = "q.id, q.created_at, q.mode, q.customer, q.notes, q.piece_count, q.total_price, q.total_hours"
+SUMMARY_KEYS = ("id", "created_at", "mode", "customer", "notes", "piece_count", "total_price", "total_hours")
+
+
+def _fts_query(text):
+    """Turn free text into an FTS5 query: every word must match as a prefix."""
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", text))
+
+
+class QuoteHistory:
+    """Saved quotes over one SQLite connection (the settings DB by default)."""
+
+    def __init__(self, path=None):
+        self.path = str(path or SETTINGS_DB_PATH)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        try:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        except sqlite3.DatabaseError:
+            pass
+        self.conn.executescript(SCHEMA)
+        try:
+            self.conn.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: search falls back to LIKE.
+            self.has_fts = False
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def save_quote(self, mode, rules, pieces, customer="", notes="", quote_id=None):
+        """
+        Store a priced quote and return its id.
+
+        `pieces` are the GUI piece dicts (grams/hours/minutes/result). Passing
+        the id of an existing quote replaces it (recalculating a loaded quote
+        does not create duplicates); only the piece rows that changed are
+        rewritten, so re-saving a large quote after one edit stays cheap.
+        """
+        now = datetime.now().isoformat(timespec="seconds")
+        priced = [p['result'] for p in pieces if p.get('result')]
+        values = (
+            mode,
+            customer.strip(),
+            notes.strip(),
+            json.dumps(rules.as_dict()),
+            len(pieces),
+            sum(r['final_price'] for r in priced),
+            sum(r['total_hours'] for r in priced),
+        )
+        rows = [
+            (p['grams'], p['hours'], p['minutes'], p['result']['final_price'] if p.get('result') else None)
+            for p in pieces
+        ]
+        with self.conn:
+            stored = None
+            if quote_id is not None:
+                cur = self.conn.execute(
+                    "UPDATE quotes SET updated_at = ?, mode = ?, customer = ?, notes = ?, rules = ?,"
+                    " piece_count = ?, total_price = ?, total_hours = ? WHERE id = ?",
+                    (now,) + values + (quote_id,),
+                )
+                if cur.rowcount:
+                    stored = {
+                        row[0]: row[1:]
+                        for row in self.conn.execute(
+                            "SELECT position, grams, hours, minutes, final_price FROM quote_pieces WHERE quote_id = ?",
+                            (quote_id,),
+                        )
+                    }
+                    self.conn.execute(
+                        "DELETE FROM quote_pieces WHERE quote_id = ? AND position >= ?", (quote_id, len(rows))
+                    )
+            if stored is None:
+                stored = {}
+                quote_id = self.conn.execute(
+                    "INSERT INTO quotes (created_at, updated_at, mode, customer, notes, rules,"
+                    " piece_count, total_price, total_hours) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (now, now) + values,
+                ).lastrowid
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO quote_pieces (quote_id, position, grams, hours, minutes, final_price)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [(quote_id, i) + row for i, row in enumerate(rows) if stored.get(i) != row],
+            )
+        return quote_id
+
+    def page(self, before_id=None, limit=PAGE_SIZE, search="", mode=None):
+        """
+        One page of quote summaries, newest first.
+
+        Pass the id of the last row of the previous page as `before_id` to get
+        the next one (keyset pagination: the cost does not grow with depth).
+        """
+        where = []
+        params = []
+        query = _fts_query(search) if search else ""
+        if query and self.has_fts:
+            sql = f"SELECT {SUMMARY_COLUMNS} FROM quotes_fts f JOIN quotes q ON q.id = f.rowid"
+            where.append("quotes_fts MATCH ?")
+            params.append(query)
+            key = "f.rowid"
+        else:
+            sql = f"SELECT {SUMMARY_COLUMNS} FROM quotes q"
+            key = "q.id"
+            if search:
+                where.append("(q.customer LIKE ? OR q.notes LIKE ?)")
+                params += [f"%{search.strip()}%"] * 2
+        if mode:
+            where.append("q.mode = ?")
+            params.append(mode)
+        if before_id is not None:
+            where.append(f"{key} < ?")
+            params.append(before_id)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {key} DESC LIMIT ?"
+        params.append(limit)
+        return [dict(zip(SUMMARY_KEYS, row)) for row in self.conn.execute(sql, params)]
+
+    def load_quote(self, quote_id, pieces=True):
+        """Return the quote summary with its `rules` (PricingRules) and, unless `pieces` is false, its `pieces` list; or None."""
+        row = self.conn.execute(
+            f"SELECT {SUMMARY_COLUMNS}, q.rules FROM quotes q WHERE q.id = ?", (quote_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        quote = dict(zip(SUMMARY_KEYS, row))
+        quote['rules'] = PricingRules.from_dict(quote['mode'], json.loads(row[-1]))
+        if pieces:
+            quote['pieces'] = [
+                {'grams': grams, 'hours': hours, 'minutes': minutes}
+                for grams, hours, minutes in self.iter_pieces(quote_id)
+            ]
+        return quote
+
+    def iter_pieces(self, quote_id):
+        """(grams, hours, minutes) of a quote's pieces in order, read from the cursor as they are consumed."""
+        yield from self.conn.execute(
+            "SELECT grams, hours, minutes FROM quote_pieces WHERE quote_id = ? ORDER BY position",
+            (quote_id,),
+        )
+
+    def delete_quote(self, quote_id):
+        with self.conn:
+            self.conn.execute("DELETE FROM quotes WHERE id = ?", (quote_id,))
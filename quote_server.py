@@ -0,0 +1,321 @@
+"""
+Local quoting service: `python main.py serve --port 8765`.
+
+A small asyncio HTTP/1.1 server (standard library only) that exposes the
+FabriCost pricing formula to other tools such as the order intake page, so
+they never carry their own copy of it.
+
+Endpoints (JSON in, JSON out):
+
+    GET  /health            -> {"status": "ok", "queued": n}
+    GET  /rules             -> current rules of both modes
+    POST /quote             -> price one piece or a batch
+
+A quote request is either a single piece
+    {"mode": "3d", "grams": 120, "hours": 4, "minutes": 30}
+or a batch
+    {"mode": "laser", "pieces": [{"id": "A", "hours": 1, "minutes": 15}, ...]}
+with optional `"rules": {"gram_price": 0.12}` overrides. Rules are the ones
+saved by the desktop app and are reloaded automatically when the settings
+database changes. Requests wait in a bounded queue; when it is full the server
+answers 503 immediately instead of piling up latency.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from pricing import FACTORY_3D_RULES, FACTORY_LASER_RULES, MODES, PricingRules, price_records, rules_from_settings
+from settings_store import SETTINGS_DB_PATH, load_settings
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_QUEUE_SIZE = 1024
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_HEADER_BYTES = 16 * 1024
+RELOAD_INTERVAL = 1.0
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    503: "Service Unavailable",
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _settings_signature():
+    """Cheap change marker for the settings DB (and its WAL file when present)."""
+    signature = []
+    for path in (SETTINGS_DB_PATH, SETTINGS_DB_PATH.with_name(SETTINGS_DB_PATH.name + "-wal")):
+        try:
+            stat = path.stat()
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def _load_rules():
+    settings = load_settings()
+    return {mode: rules_from_settings(settings, mode) for mode in MODES}
+
+
+class QuoteServer:
+    """Asyncio quote server with a bounded work queue and settings hot-reload."""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, queue_size=DEFAULT_QUEUE_SIZE,
+                 reload_interval=RELOAD_INTERVAL, log=True):
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.reload_interval = reload_interval
+        self.log = log
+        self.rules = _load_rules()
+        self._signature = _settings_signature()
+        self._queue = None
+        self._server = None
+        self._tasks = []
+
+    def _log(self, message):
+        if self.log:
+            print(f"[serve] {message}", file=sys.stderr, flush=True)
+
+    # ---- lifecycle -------------------------------------------------------
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port, limit=MAX_HEADER_BYTES
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._tasks = [
+            asyncio.create_task(self._worker()),
+            asyncio.create_task(self._watch_settings()),
+        ]
+        self._log(f"listening on http://{self.host}:{self.port} (queue size {self.queue_size})")
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    # ---- background tasks --------------------------------------------------
+
+    async def _watch_settings(self):
+        """Poll the settings DB and swap in fresh rules when the desktop app saves."""
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            signature = _settings_signature()
+            if signature == self._signature:
+                continue
+            self._signature = signature
+            try:
+                self.rules = await asyncio.to_thread(_load_rules)
+                self._log("settings changed, rules reloaded")
+            except Exception as exc:
+                self._log(f"could not reload settings: {exc}")
+
+    async def _worker(self):
+        """Single pricing worker: drains the queue so pricing never overlaps I/O parsing."""
+        while True:
+            payload, future = await self._queue.get()
+            try:
+                if not future.done():
+                    future.set_result(self._quote(payload))
+            except HttpError as exc:
+                if not future.done():
+                    future.set_exception(exc)
+            except Exception as exc:
+                if not future.done():
+                    future.set_exception(HttpError(400, str(exc)))
+            finally:
+                self._queue.task_done()
+
+    # ---- pricing -----------------------------------------------------------
+
+    def _rules_for(self, mode, overrides):
+        if mode not in MODES:
+            raise HttpError(400, f"mode must be one of: {', '.join(MODES)}")
+        rules = self.rules[mode]
+        if not overrides:
+            return rules
+        if not isinstance(overrides, dict):
+            raise HttpError(400, "rules must be an object")
+        allowed = FACTORY_LASER_RULES if mode == "laser" else FACTORY_3D_RULES
+        merged = rules.as_dict()
+        for key, value in overrides.items():
+            if key not in allowed:
+                raise HttpError(400, f"unknown rule: {key}")
+            try:
+                merged[key] = float(value)
+            except (TypeError, ValueError):
+                raise HttpError(400, f"rule {key} must be a number")
+        return PricingRules.from_dict(mode, merged)
+
+    def _quote(self, payload):
+        if not isinstance(payload, dict):
+            raise HttpError(400, "request body must be a JSON object")
+        mode = payload.get("mode", "3d")
+        rules = self._rules_for(mode, payload.get("rules"))
+
+        batch = "pieces" in payload
+        records = payload["pieces"] if batch else [payload]
+        if not isinstance(records, list):
+            raise HttpError(400, "pieces must be a list")
+
+        results = []
+        total = 0.0
+        for record, result in price_records(rules, records):
+            if isinstance(result, dict):
+                total += result["final_price"]
+                item = dict(result)
+            else:
+                item = {"error": result}
+            if "id" in record:
+                item["id"] = record["id"]
+            results.append(item)
+
+        if not batch:
+            if "error" in results[0]:
+                raise HttpError(400, results[0]["error"])
+            return {"mode": mode, "rules": rules.as_dict(), **results[0]}
+        return {"mode": mode, "rules": rules.as_dict(), "count": len(results), "total": total, "results": results}
+
+    async def _submit(self, payload):
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((payload, future))
+        except asyncio.QueueFull:
+            raise HttpError(503, "quote queue is full, retry later")
+        return await future
+
+    # ---- HTTP --------------------------------------------------------------
+
+    async def _route(self, method, path, body):
+        path = path.split("?", 1)[0]
+        if path == "/health":
+            return {"status": "ok", "queued": self._queue.qsize()}
+        if path == "/rules":
+            return {mode: rules.as_dict() for mode, rules in self.rules.items()}
+        if path == "/quote":
+            if method != "POST":
+                raise HttpError(405, "use POST")
+            try:
+                payload = json.loads(body or b"{}")
+            except ValueError:
+                raise HttpError(400, "invalid JSON body")
+            return await self._submit(payload)
+        raise HttpError(404, "not found")
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, 413, {"error": "headers too large"}, keep_alive=False)
+                    break
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, path, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "bad request line"}, keep_alive=False)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                try:
+                    length = int(headers.get("content-length", "0"))
+                except ValueError:
+                    length = -1
+                if length < 0 or length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status, data = 200, await self._route(method.upper(), path, body)
+                except HttpError as exc:
+                    status, data = exc.status, {"error": exc.message}
+                await self._respond(writer, status, data, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def _respond(self, writer, status, data, keep_alive):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode("latin-1")
+        writer.write(head + body)
+        await writer.drain()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="fabricost serve", description="Serve FabriCost quotes over local HTTP.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Bind address (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument(
+        "--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+        help=f"Max requests waiting for pricing before answering 503 (default: {DEFAULT_QUEUE_SIZE})",
+    )
+    parser.add_argument(
+        "--reload-interval", type=float, default=RELOAD_INTERVAL,
+        help=f"Seconds between settings DB change checks (default: {RELOAD_INTERVAL})",
+    )
+    return parser
+
+
+def run(argv=None):
+    args = build_parser().parse_args(argv)
+    server = QuoteServer(args.host, args.port, max(1, args.queue_size), args.reload_interval)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
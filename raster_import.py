@@ -0,0 +1,197 @@
+"""
+Laser engraving time from bitmaps (PNG/JPG/BMP).
+
+A raster engrave sweeps the head line by line. Each scanline that contains
+dark pixels costs its dark extent plus the overscan on both sides at the scan
+speed. Blank lines are skipped. When the machine crosses long white gaps
+quickly ("fast whitespace"), those gaps are taken out of the scan-speed time.
+Extents and white gaps are computed on NumPy arrays of the Pillow image.
+"""
+
+from dataclasses import dataclass, asdict, fields
+from pathlib import Path
+
+from vector_import import laser_piece
+
+
+RASTER_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+# Rows analysed per NumPy block, to bound temporaries on very large images.
+BAND_ROWS = 1024
+
+
+@dataclass(frozen=True)
+class EngraveProfile:
+    """Raster engraving settings (lengths in mm, speeds in mm/s)."""
+
+    dpi: float = 254.0  # Scanlines per inch (0.1 mm line interval).
+    scan_speed: float = 300.0
+    overscan: float = 2.5
+    threshold: float = 128.0  # Pixels darker than this (0-255) are engraved.
+    bidirectional: bool = True
+    whitespace_speed: float = 0.0  # Speed across long white gaps; 0 = scan speed.
+    travel_speed: float = 300.0
+    image_dpi: float = 300.0  # Used when the file carries no resolution.
+
+    @classmethod
+    def from_dict(cls, data):
+        known = {f.name: f.type for f in fields(cls)}
+        values = {}
+        for key, value in (data or {}).items():
+            if key in known:
+                values[key] = bool(value) if known[key] in (bool, "bool") else float(value)
+        return cls(**values)
+
+    def as_dict(self):
+        return asdict(self)
+
+
+def _dark_mask(image, threshold):
+    """Greyscale image -> NumPy bool array of pixels to engrave (transparent counts as white)."""
+    import numpy as np
+
+    if image.mode == "1":
+        return ~np.asarray(image, dtype=bool)
+    alpha = None
+    if "A" in image.getbands() or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA") if image.mode == "P" else image
+        alpha = np.asarray(image.getchannel("A"))
+    dark = np.asarray(image.convert("L")) < threshold
+    if alpha is not None:
+        dark &= alpha >= 128
+    return dark
+
+
+def _white_gaps(mask):
+    """(row, length) of every white run that has dark pixels on both sides, from row edges."""
+    import numpy as np
+
+    edges = np.diff(mask.view(np.int8), axis=1)
+    row, col = np.nonzero(edges)
+    rising = edges[row, col] > 0
+    # A dark->white edge followed by a white->dark edge on the same row encloses a gap.
+    inner = (~rising[:-1]) & rising[1:] & (row[:-1] == row[1:])
+    return row[:-1][inner], col[1:][inner] - col[:-1][inner]
+
+
+def _long_gaps(band, min_px):
+    """
+    (row, length) of white gaps longer than `min_px` pixels inside each row.
+
+    Dithered areas have millions of tiny gaps that never matter, so gaps are
+    first found on a mask reduced to blocks of min_px / 2 pixels (any gap long
+    enough contains a whole white block), then measured exactly at their two
+    boundary blocks.
+    """
+    import numpy as np
+
+    block = int(min_px // 2)
+    if block < 8:
+        row, gaps = _white_gaps(band)
+        keep = gaps > min_px
+        return row[keep], gaps[keep]
+
+    rows, width = band.shape
+    count = -(-width // block)
+    if count * block != width:
+        padded = np.zeros((rows, count * block), dtype=bool)
+        padded[:, :width] = band
+        band = padded
+    pixels = band.reshape(rows, count, block)
+    blocks = pixels.any(axis=2)
+
+    edges = np.diff(blocks.view(np.int8), axis=1)
+    row, col = np.nonzero(edges)
+    rising = edges[row, col] > 0
+    inner = (~rising[:-1]) & rising[1:] & (row[:-1] == row[1:])
+    row = row[:-1][inner]
+    left = col[:-1][inner]
+    right = col[1:][inner] + 1
+    last_dark = left * block + block - 1 - pixels[row, left][:, ::-1].argmax(axis=1)
+    first_dark = right * block + pixels[row, right].argmax(axis=1)
+    gaps = first_dark - last_dark - 1
+    keep = gaps > min_px
+    return row[keep], gaps[keep]
+
+
+def analyze_raster(image, profile=None):
+    """
+    Measure the engraving job of a Pillow image.
+
+    Returns a dict with `seconds`, `scanlines` (lines with dark pixels),
+    `total_lines`, `width_mm` and `height_mm`.
+    """
+    import numpy as np
+
+    profile = profile or EngraveProfile()
+    dpi_x, dpi_y = image.info.get("dpi", (0, 0)) or (0, 0)
+    dpi_x = float(dpi_x) if dpi_x and float(dpi_x) > 1 else profile.image_dpi
+    dpi_y = float(dpi_y) if dpi_y and float(dpi_y) > 1 else dpi_x
+    width_px, height_px = image.size
+    height_mm = height_px / dpi_y * 25.4
+    px_mm = 25.4 / dpi_x
+
+    # JPEG can decode straight to greyscale, which is much faster than RGB + convert.
+    image.draft("L", image.size)
+    dark = _dark_mask(image, profile.threshold)
+
+    # Image rows under each scanline (rows are skipped or repeated when the DPIs differ).
+    lines = max(int(round(height_mm * profile.dpi / 25.4)), 1)
+    rows = np.minimum(((np.arange(lines) + 0.5) * height_px / lines).astype(np.int64), height_px - 1)
+    unique_rows, line_rows = np.unique(rows, return_inverse=True)
+
+    extent = np.zeros(unique_rows.size)
+    saved = np.zeros(unique_rows.size)
+    gap_px = 2 * profile.overscan / px_mm
+    fast = 0 < profile.scan_speed < profile.whitespace_speed
+    for lo in range(0, unique_rows.size, BAND_ROWS):
+        band = dark[unique_rows[lo:lo + BAND_ROWS]]
+        has_dark = band.any(axis=1)
+        first = band.argmax(axis=1)
+        last = width_px - 1 - band[:, ::-1].argmax(axis=1)
+        extent[lo:lo + band.shape[0]] = np.where(has_dark, last - first + 1, 0) * px_mm
+        if fast and has_dark.any():
+            row, gaps = _long_gaps(band, gap_px)
+            np.add.at(saved, lo + row, (gaps - gap_px) * px_mm)
+
+    extent = extent[line_rows]
+    saved = saved[line_rows]
+    engraved = extent > 0
+    sweep = extent[engraved] + 2 * profile.overscan
+    seconds = sweep.sum() / profile.scan_speed
+    if fast:
+        seconds -= saved[engraved].sum() * (1 / profile.scan_speed - 1 / profile.whitespace_speed)
+    if not profile.bidirectional and profile.travel_speed > 0:
+        seconds += sweep.sum() / profile.travel_speed
+    return {
+        "seconds": float(seconds),
+        "scanlines": int(engraved.sum()),
+        "total_lines": lines,
+        "width_mm": width_px * px_mm,
+        "height_mm": height_mm,
+    }
+
+
+def piece_from_raster(path, profile=None):
+    """Return (grams, hours, minutes) of a laser engraving piece."""
+    from PIL import Image
+
+    with Image.open(path) as image:
+        measurements = analyze_raster(image, profile)
+    if measurements["scanlines"] == 0:
+        raise ValueError("nothing to engrave (no dark pixels)")
+    return laser_piece(measurements["seconds"])
+
+
+def import_raster_files(paths, profile=None):
+    """Analyse several bitmaps; returns (path, piece_or_error) pairs in input order."""
+    # Pillow is imported on first use, not at app startup.
+    from PIL import Image
+
+    results = []
+    for path in (Path(p) for p in paths):
+        try:
+            results.append((path, piece_from_raster(path, profile)))
+        except (OSError, ValueError, Image.DecompressionBombError) as exc:
+            results.append((path, str(exc)))
+    return results
@@ -0,0 +1,166 @@
+"""
+Receipt images for FabriCost.
+
+`render_receipt` draws the styled per-piece receipt with Pillow from plain
+data (mode, piece dict, markup), so it can run on a worker thread or process;
+copying to the clipboard or saving is left to the caller.
+
+Fonts are resolved once per process (Arial on Windows and macOS,
+DejaVu/Liberation on Linux) and the static part of the receipt (background
+and header band) is drawn once as a template that each receipt copies. For
+whole orders, `render_receipt_batch` renders a chunk of pieces in a worker
+process (PNG bytes for a ZIP, or ready-made thumbnails for a contact sheet)
+and `write_receipts_zip` / `write_contact_sheet` assemble the results.
+"""
+
+import io
+import zipfile
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+
+
+RECEIPT_SIZE = (700, 550)
+HEADER_HEIGHT = 90
+
+# Font files tried in order; Pillow searches the system font directories for bare names.
+REGULAR_FONTS = (
+    "arial.ttf", "DejaVuSans.ttf", "LiberationSans-Regular.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", "/System/Library/Fonts/Supplemental/Arial.ttf",
+)
+BOLD_FONTS = (
+    "arialbd.ttf", "DejaVuSans-Bold.ttf", "LiberationSans-Bold.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+)
+
+# Contact sheet: receipts shrunk by THUMB_FACTOR, SHEET_COLUMNS x SHEET_ROWS per page.
+THUMB_FACTOR = 2
+SHEET_COLUMNS = 3
+SHEET_ROWS = 5
+SHEET_MARGIN = 20
+
+# Pieces per worker task when rendering a whole order.
+BATCH_SIZE = 25
+
+
+@lru_cache(maxsize=None)
+def _font(candidates, size):
+    for name in candidates:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    try:
+        # Pillow >= 10.1 has a scalable default font.
+        return ImageFont.load_default(size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def _fonts():
+    """(title, normal, bold) fonts, resolved once per process."""
+    return _font(REGULAR_FONTS, 36), _font(BOLD_FONTS, 20), _font(BOLD_FONTS, 28)
+
+
+@lru_cache(maxsize=1)
+def _template():
+    """The static part of every receipt: white background and header band."""
+    img = Image.new('RGB', RECEIPT_SIZE, color='white')
+    ImageDraw.Draw(img).rectangle([0, 0, RECEIPT_SIZE[0], HEADER_HEIGHT], fill='#4f46e5')
+    return img
+
+
+def render_receipt(mode, piece, markup_percent):
+    """Return the receipt of one priced piece as a PIL image."""
+    result = piece['result']
+    title_font, normal_font, bold_font = _fonts()
+
+    img = _template().copy()
+    draw = ImageDraw.Draw(img)
+    draw.text((350, 45), f"Piece {piece['id']}", font=title_font, fill='white', anchor='mm')
+
+    y = 140
+
+    # Content with bold fonts
+    if mode == "laser":
+        lines = [
+            (f"Time: {piece['hours']}h {piece['minutes']}min", normal_font, '#6b7280'),
+            ("", normal_font, 'black'),
+            (f"Time Price: {result['time_price']:.2f} DT", normal_font, 'black'),
+            (f"Subtotal: {result['subtotal']:.2f} DT", normal_font, 'black'),
+            (f"Markup (+{markup_percent:.0f}%): +{result['markup_amount']:.2f} DT", normal_font, 'black'),
+            ("", normal_font, 'black'),
+            (f"Final Price: {result['final_price']:.2f} DT", bold_font, '#10b981'),
+        ]
+    else:
+        lines = [
+            (f"Weight: {piece['grams']}g  |  Time: {piece['hours']}h {piece['minutes']}min", normal_font, '#6b7280'),
+            ("", normal_font, 'black'),
+            (f"Gramage Price: {result['gram_price']:.2f} DT", normal_font, 'black'),
+            (f"Time Price: {result['time_price']:.2f} DT", normal_font, 'black'),
+            (f"Subtotal: {result['subtotal']:.2f} DT", normal_font, 'black'),
+            (f"Markup (+{markup_percent:.0f}%): +{result['markup_amount']:.2f} DT", normal_font, 'black'),
+            ("", normal_font, 'black'),
+            (f"Final Price: {result['final_price']:.2f} DT", bold_font, '#10b981'),
+        ]
+
+    for text, font, color in lines:
+        if text:
+            draw.text((60, y), text, font=font, fill=color)
+        y += 50
+
+    return img
+
+
+def receipt_filename(piece):
+    return f"piece_{piece['id']}_recu.png"
+
+
+def render_receipt_batch(mode, pieces, markup_percent, thumbnails=False):
+    """
+    Render a chunk of priced pieces (runs in a worker process).
+
+    Returns [(filename, PNG bytes)], or [(filename, thumbnail image)] for a
+    contact sheet when `thumbnails` is true.
+    """
+    rendered = []
+    for piece in pieces:
+        img = render_receipt(mode, piece, markup_percent)
+        if thumbnails:
+            rendered.append((receipt_filename(piece), img.reduce(THUMB_FACTOR)))
+            continue
+        buffer = io.BytesIO()
+        # Fast deflate: the flat receipt compresses almost as well at level 1, in 2/3 of the time.
+        img.save(buffer, format="PNG", compress_level=1)
+        rendered.append((receipt_filename(piece), buffer.getvalue()))
+    return rendered
+
+
+def write_receipts_zip(path, receipts):
+    """Store [(filename, PNG bytes)] in a ZIP (PNGs are already compressed)."""
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as archive:
+        for name, data in receipts:
+            archive.writestr(name, data)
+    return str(path)
+
+
+def write_contact_sheet(path, thumbnails):
+    """Lay [(filename, thumbnail image)] out in a grid on the pages of a PDF."""
+    thumb_w = RECEIPT_SIZE[0] // THUMB_FACTOR
+    thumb_h = RECEIPT_SIZE[1] // THUMB_FACTOR
+    per_page = SHEET_COLUMNS * SHEET_ROWS
+    page_size = (
+        SHEET_MARGIN + SHEET_COLUMNS * (thumb_w + SHEET_MARGIN),
+        SHEET_MARGIN + SHEET_ROWS * (thumb_h + SHEET_MARGIN),
+    )
+    pages = []
+    for start in range(0, len(thumbnails), per_page):
+        page = Image.new('RGB', page_size, color='#f0f4f8')
+        for i, (_, thumb) in enumerate(thumbnails[start:start + per_page]):
+            row, col = divmod(i, SHEET_COLUMNS)
+            page.paste(thumb, (SHEET_MARGIN + col * (thumb_w + SHEET_MARGIN), SHEET_MARGIN + row * (thumb_h + SHEET_MARGIN)))
+        pages.append(page)
+    if not pages:
+        pages.append(Image.new('RGB', page_size, color='#f0f4f8'))
+    pages[0].save(path, format="PDF", save_all=True, append_images=pages[1:], resolution=150)
+    return str(path)
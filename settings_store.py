@@ -0,0 +1,238 @@
+"""
+Settings persistence for FabriCost.
+
+Settings are a flat key/value dict stored as JSON values in a small SQLite
+database under the user's roaming profile. This module has no GUI
+dependencies so the headless tools (batch quoting, quote server) read the
+exact same defaults as the desktop app. The desktop app keeps a
+`SettingsStore` open for its whole session; one-shot tools use
+`load_settings`/`save_settings`.
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+def get_settings_path():
+    """Return a writable settings path (works for PyInstaller onefile too)."""
+    # Prefer Windows roaming AppData; fallback to user home.
+    appdata = os.environ.get("APPDATA")
+    base_dir = Path(appdata) if appdata else Path.home()
+    settings_dir = base_dir / "3dPrix"
+    try:
+        settings_dir.mkdir(parents=True, exist_ok=True)
+    except Exception:
+        pass
+    return settings_dir / "settings.json"
+
+
+SETTINGS_PATH = get_settings_path()
+SETTINGS_DB_PATH = SETTINGS_PATH.with_suffix(".db")
+
+
+def _connect(path=None, **kwargs):
+    """Open the settings DB in WAL mode (readers never wait for the writer) and ensure the table exists."""
+    conn = sqlite3.connect(path or SETTINGS_DB_PATH, **kwargs)
+    try:
+        # WAL is unavailable on some network shares; SQLite then keeps its rollback journal.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+    except sqlite3.DatabaseError:
+        pass
+    conn.execute("CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+    conn.commit()
+    return conn
+
+
+def _read_settings(conn):
+    """Return {key: raw JSON text} from an open DB, migrating the legacy JSON file once."""
+    cur = conn.cursor()
+
+    # If the DB is empty but a legacy JSON file exists, migrate it once.
+    cur.execute("SELECT COUNT(*) FROM settings")
+    count = cur.fetchone()[0]
+    if count == 0 and SETTINGS_PATH.exists():
+        try:
+            legacy = json.loads(SETTINGS_PATH.read_text(encoding="utf-8"))
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                    [(k, json.dumps(v, ensure_ascii=False)) for k, v in legacy.items()],
+                )
+        except Exception:
+            # Ignore migration errors and continue with an empty DB.
+            pass
+
+    cur.execute("SELECT key, value FROM settings")
+    return dict(cur.fetchall())
+
+
+def _decode(raw):
+    try:
+        return json.loads(raw)
+    except Exception:
+        return raw
+
+
+def load_settings():
+    """Load settings from a local SQLite database (with JSON fallback for legacy data)."""
+    conn = None
+    try:
+        conn = _connect()
+        data = {key: _decode(raw) for key, raw in _read_settings(conn).items()}
+    except Exception:
+        # Non-fatal: fall back to empty settings.
+        data = {}
+    finally:
+        if conn is not None:
+            conn.close()
+    return data
+
+
+def save_settings(data):
+    """Persist the full settings dict into the local SQLite DB (one-shot tools; the GUI uses SettingsStore)."""
+    conn = None
+    try:
+        conn = _connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value, ensure_ascii=False)) for key, value in data.items()],
+            )
+    except Exception:
+        # Non-fatal: app can still run without persistence.
+        pass
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+class SettingsStore(MutableMapping):
+    """
+    Settings dict backed by one long-lived SQLite connection.
+
+    Reads come from an in-memory cache. Assignments only mark the key dirty;
+    `flush` writes the dirty keys whose JSON actually changed in a single
+    transaction, and `flush_async` does the same on a background writer thread
+    so slow (network) profile drives never block the caller. Values mutated in
+    place (nested dicts) must be re-assigned or passed to `mark_dirty`.
+    """
+
+    def __init__(self, path=None):
+        self._lock = threading.Lock()  # Guards the cache and dirty set.
+        self._write_lock = threading.Lock()  # Serializes use of the connection.
+        self._cache = {}
+        self._stored = {}  # key -> JSON text currently in the DB
+        self._dirty = set()
+        self._flush_pending = False
+        self._executor = None
+        self._conn = None
+        try:
+            self._conn = _connect(path or SETTINGS_DB_PATH, check_same_thread=False)
+            self._stored = _read_settings(self._conn)
+        except Exception:
+            # Non-fatal: run from memory only.
+            self._stored = {}
+        self._cache = {key: _decode(raw) for key, raw in self._stored.items()}
+
+    def __getitem__(self, key):
+        return self._cache[key]
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._cache[key] = value
+            self._dirty.add(key)
+
+    def __delitem__(self, key):
+        with self._lock:
+            del self._cache[key]
+            self._dirty.add(key)
+
+    def __iter__(self):
+        return iter(list(self._cache))
+
+    def __len__(self):
+        return len(self._cache)
+
+    def mark_dirty(self, key):
+        with self._lock:
+            self._dirty.add(key)
+
+    def flush(self):
+        """Write the changed keys now; returns False if a value or the DB could not be written (keys stay dirty)."""
+        with self._write_lock:
+            return self._write_dirty()
+
+    def _write_dirty(self):
+        with self._lock:
+            self._flush_pending = False
+            changes = {}
+            failed = {}
+            for key in self._dirty:
+                try:
+                    raw = json.dumps(self._cache[key], ensure_ascii=False) if key in self._cache else None
+                except (TypeError, ValueError) as exc:
+                    failed[key] = exc
+                    continue
+                if raw != self._stored.get(key):
+                    changes[key] = raw
+            # Values that cannot be encoded stay dirty; everything else is taken out now.
+            self._dirty = set(failed)
+        for key, exc in failed.items():
+            print(f"[settings] {key!r} not saved: {exc}")
+        if not changes:
+            return not failed
+        if self._conn is None:
+            with self._lock:
+                self._dirty.update(changes)
+            return False
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                    [(key, raw) for key, raw in changes.items() if raw is not None],
+                )
+                self._conn.executemany(
+                    "DELETE FROM settings WHERE key = ?",
+                    [(key,) for key, raw in changes.items() if raw is None],
+                )
+        except Exception as exc:
+            with self._lock:
+                self._dirty.update(changes)
+            print(f"[settings] Settings not saved: {exc}")
+            return False
+        with self._lock:
+            for key, raw in changes.items():
+                if raw is None:
+                    self._stored.pop(key, None)
+                else:
+                    self._stored[key] = raw
+        return not failed
+
+    def flush_async(self):
+        """Queue a flush on the writer thread; several calls before it runs collapse into one write."""
+        with self._lock:
+            if self._flush_pending or not self._dirty:
+                return
+            self._flush_pending = True
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="settings")
+        self._executor.submit(self.flush)
+
+    def close(self):
+        """Finish pending writes, flush what is left and release the connection."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.flush()
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None